@@ -1 +1,14 @@
-from app.main import app  # Expose FastAPI app for Vercel 
\ No newline at end of file
+"""Vercel entry point (see vercel.json).
+
+Serverless instances are frozen between requests and recycled at will, so
+the periodic-job scheduler stays off here unless SCHEDULER_ENABLED is set
+explicitly; a long-running replica runs it instead. Schema changes are
+applied with `python migrate_db.py` before deploying, never on a cold
+start. Measure cold starts with benchmarks/import_bench.py.
+"""
+import os
+
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+os.environ.setdefault("LAZY_STARTUP", "true")
+
+from app.main import app  # noqa: E402  Expose FastAPI app for Vercel
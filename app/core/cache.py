@@ -0,0 +1,108 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any, Callable, FrozenSet, Iterable, Optional
+from fastapi import Request
+from starlette.responses import Response
+from app.core.config import settings
+from app.core.responses import get_adapter
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    last_modified: str
+    expires_at: float
+    tags: FrozenSet[str] = field(default_factory=frozenset)
+
+
+class ResponseCache:
+    """In-process LRU cache with TTL for public, read-mostly JSON responses.
+
+    Entries are tagged with the tables they were built from, and mutation
+    endpoints call invalidate() with those tags right after they commit.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, body: bytes, tags: Iterable[str]) -> CacheEntry:
+        entry = CacheEntry(
+            body=body,
+            etag='"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+            last_modified=formatdate(usegmt=True),
+            expires_at=time.monotonic() + self.ttl_seconds,
+            tags=frozenset(tags),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry built from any of the given tags."""
+        wanted = set(tags)
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.tags & wanted]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def respond(
+        self,
+        request: Request,
+        tags: Iterable[str],
+        cache_control: str,
+        type_: Any,
+        load: Callable[[], Any],
+    ) -> Response:
+        """Serve a cached JSON response, building it with load() on a miss.
+
+        load() may return ORM objects; they are validated against type_ once
+        when the entry is built. Honours If-None-Match with a 304.
+        """
+        key = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        entry = self.get(key)
+        if entry is None:
+            adapter = get_adapter(type_)
+            body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+            entry = self.set(key, body, tags)
+
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": entry.last_modified,
+            "Cache-Control": cache_control,
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -21,6 +21,78 @@ class Settings(BaseSettings):
     app_name: str = "HelpMate API"
     debug: bool = True
     base_url: str = "https://helpmatebackend-production.up.railway.app"
+    # Run create_all when the app starts (local development only; deployments run migrate_db.py)
+    create_tables_on_startup: bool = False
+    # Import routers and warm caches on first use instead of at startup (serverless cold starts)
+    lazy_startup: bool = False
+    
+    # Response cache for public catalog endpoints
+    response_cache_ttl_seconds: int = 60
+    response_cache_max_entries: int = 512
+    
+    # How often each process checks the category version counter for changes made elsewhere
+    category_registry_check_seconds: float = 5.0
+    
+    # Bookable hours per worker per day, the denominator of worker utilization
+    worker_available_hours_per_day: int = 8
+    
+    # Periodic jobs; one replica at a time holds the scheduler lease and runs them
+    scheduler_enabled: bool = True
+    scheduler_tick_seconds: float = 30.0
+    scheduler_lease_seconds: float = 90.0
+    # Pending orders this long past their scheduled date are expired
+    pending_order_grace_minutes: int = 60
+    order_expiry_batch_size: int = 500
+    # Used or expired reset codes and verification tokens are deleted after this
+    token_retention_days: int = 7
+    
+    # Recurring bookings
+    series_max_occurrences: int = 52
+    # Reserved occurrences become orders this many days before they start
+    series_materialize_days: int = 7
+    
+    # Profile image uploads; larger files are rejected while streaming
+    upload_max_bytes: int = 5 * 1024 * 1024
+    # Longest side, in pixels, of the thumbnails generated for every upload (needs Pillow)
+    thumbnail_sizes: List[int] = [64, 256, 512]
+    thumbnail_workers: int = 2
+    # Uploaded images no profile has pointed at for this long are deleted
+    image_orphan_grace_hours: int = 24
+    
+    # Upload storage: "local" (a directory served at /static) or "s3" (any S3-compatible service)
+    storage_backend: str = "local"
+    # Directory for the local backend; defaults to the project's static/
+    storage_local_dir: Optional[str] = None
+    # Base URL that serves stored files (CDN or public bucket); derived from the backend when unset
+    storage_public_base_url: Optional[str] = None
+    s3_bucket: Optional[str] = None
+    s3_endpoint_url: Optional[str] = None  # e.g. http://localhost:9000 for MinIO
+    s3_region: Optional[str] = None
+    s3_access_key_id: Optional[str] = None
+    s3_secret_access_key: Optional[str] = None
+    # How long a presigned direct-upload URL stays valid
+    presigned_upload_expiry_seconds: int = 900
+    
+    # Prometheus metrics at /metrics; when a token is set scrapers must send it as a Bearer token
+    metrics_enabled: bool = True
+    metrics_token: Optional[str] = None
+    # Requests running more SQL statements than this are logged as possible N+1 queries
+    n_plus_one_query_threshold: int = 20
+    # Statements slower than this are kept (last slow_query_log_size of them) for /admin/slow-queries
+    slow_query_log_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    slow_query_log_size: int = 200
+    # Share of slow SELECTs re-run with EXPLAIN (ANALYZE, BUFFERS) on Postgres (0 turns it off)
+    slow_query_explain_sample_rate: float = 0.0
+    slow_query_explain_timeout_ms: int = 5000
+    
+    # OpenTelemetry tracing: "none", "otlp" (a collector at tracing_otlp_endpoint), "file" (JSON lines) or "console"
+    tracing_exporter: str = "none"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_file_path: str = "traces.jsonl"
+    tracing_service_name: str = "helpmate-api"
+    # Share of new traces recorded; requests continuing a sampled trace are always recorded
+    tracing_sample_ratio: float = 1.0
     
     class Config:
         env_file = ".env"
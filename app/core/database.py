@@ -2,9 +2,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import count_queries
+from .slow_queries import slow_query_log
+from .tracing import trace_queries
 
 # Create database engine
 engine = create_engine(settings.database_url)
+count_queries(engine)
+slow_query_log.install(engine)
+trace_queries(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,72 @@
+import importlib
+from typing import Dict, List, Sequence, Tuple
+from fastapi import FastAPI
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Paths that describe the whole API and so need every router
+DOC_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+
+class LazyRouters:
+    """Includes the app's routers, either all at once or each on first use.
+
+    Importing a router module builds all of its routes and response models
+    and pulls in the services behind them, which dominates a serverless
+    cold start. With LazyRouterMiddleware in front of the app only the
+    routers whose prefix matches an incoming request are imported. Routes
+    are kept in the declared module order whatever order they load in, so
+    e.g. /orders/series still matches before /orders/{order_id}.
+    """
+
+    def __init__(self, app: FastAPI, prefix: str, modules: Sequence[Tuple[str, str]]):
+        self.app = app
+        self.prefix = prefix
+        self.modules = list(modules)  # (module name in app.routers, router prefix)
+        self._routes: Dict[str, List[BaseRoute]] = {}
+        # Router routes go where they would have been included: after the app's routes so far
+        self._insert_at = len(app.router.routes)
+
+    def load(self, name: str) -> None:
+        if name in self._routes:
+            return
+        module = importlib.import_module(f"app.routers.{name}")
+        routes = self.app.router.routes
+        before = len(routes)
+        self.app.include_router(module.router, prefix=self.prefix)
+        self._routes[name] = routes[before:]
+        del routes[before:]
+
+        included = {id(route) for module_routes in self._routes.values() for route in module_routes}
+        own = [route for route in routes if id(route) not in included]
+        ordered = [route for module_name, _ in self.modules for route in self._routes.get(module_name, [])]
+        routes[:] = own[:self._insert_at] + ordered + own[self._insert_at:]
+        self.app.openapi_schema = None
+
+    def load_all(self) -> None:
+        for name, _ in self.modules:
+            self.load(name)
+
+    def load_for_path(self, path: str) -> None:
+        if path in DOC_PATHS:
+            self.load_all()
+            return
+        if not path.startswith(self.prefix):
+            return
+        path = path[len(self.prefix):]
+        for name, router_prefix in self.modules:
+            if path == router_prefix or path.startswith(router_prefix + "/"):
+                self.load(name)
+
+
+class LazyRouterMiddleware:
+    """Loads the routers a request needs before it is routed"""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            self.routers.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
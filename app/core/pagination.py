@@ -0,0 +1,51 @@
+import base64
+import binascii
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last row on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_filter(model, sort_column, last_id: int, descending: bool = True):
+    """Filter for rows after last_id when ordering by (sort_column, id).
+
+    The anchor value is read back from the row itself so the comparison
+    always happens column-to-column, which keeps SQLite's string-stored
+    timestamps comparable with each other.
+    """
+    if sort_column is model.id:
+        return model.id < last_id if descending else model.id > last_id
+    anchor = select(sort_column).where(model.id == last_id).scalar_subquery()
+    if descending:
+        return or_(sort_column < anchor, and_(sort_column == anchor, model.id < last_id))
+    return or_(sort_column > anchor, and_(sort_column == anchor, model.id > last_id))
+
+
+def paginate(query, model, sort_column, cursor: Optional[str], limit: int, descending: bool = True):
+    """Apply keyset pagination to a query ordered by (sort_column, id).
+
+    Returns the rows for the page and the cursor for the next page (or None).
+    """
+    if cursor:
+        query = query.filter(keyset_filter(model, sort_column, decode_cursor(cursor), descending))
+    order = [sort_column] if sort_column is model.id else [sort_column, model.id]
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in order))
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
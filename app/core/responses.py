@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """App-wide JSON response rendered with orjson when it is available."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def get_adapter(type_: Any) -> TypeAdapter:
+    """Build (once) and return the TypeAdapter for a response type."""
+    return TypeAdapter(type_)
+
+
+class TrustedJSONResponse(Response):
+    """Dump already-validated schema instances straight to JSON bytes.
+
+    Returning a Response makes FastAPI skip its response_model validation and
+    jsonable_encoder pass, so only use this for data built from the response
+    schemas by the handler itself. Keep response_model on the route for docs.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        type_: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.adapter = get_adapter(type_)
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
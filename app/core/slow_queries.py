@@ -0,0 +1,162 @@
+import itertools
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, List, Optional, Set
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import current_query_stats, handler_name
+
+# Execution option marking the EXPLAIN runs themselves, which are as slow as the query
+SKIP_OPTION = "skip_slow_query_log"
+
+# Row-locking SELECTs, which EXPLAIN ANALYZE would run and lock rows for again
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+FUNCTION_CALL = re.compile(r"\b([a-z_][a-z0-9_$]*)\s*\(", re.IGNORECASE)
+
+
+class SlowQuery(BaseModel):
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    # Types of the bound parameters, never their values
+    parameters: Any = None
+    executemany: bool = False
+    handler: Optional[str] = None
+    method: Optional[str] = None
+    path: Optional[str] = None
+    explain: Optional[str] = None
+    explain_error: Optional[str] = None
+
+
+def parameters_shape(parameters) -> Any:
+    """The parameters with each value replaced by its type name"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the shape of the first row and how many there were
+            return {"rows": len(parameters), "row": parameters_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """Statements slower than slow_query_threshold_ms, newest last, in a bounded ring buffer.
+
+    On Postgres a sample of slow SELECTs is re-run with EXPLAIN (ANALYZE,
+    BUFFERS) on a separate connection in a background thread, at most one
+    at a time, and the plan is attached to the entry when it is ready.
+    SELECTs that lock rows or call a volatile function (nextval,
+    pg_advisory_lock, ...) are not re-run, since rolling back the EXPLAIN
+    would not undo their effects.
+    """
+
+    def __init__(self, max_entries: int):
+        self._entries: Deque[SlowQuery] = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._explaining = threading.Semaphore(1)
+        self._volatile_functions: Optional[Set[str]] = None
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._slow_query_started) * 1000
+        if not settings.slow_query_log_enabled or elapsed_ms < settings.slow_query_threshold_ms:
+            return
+        if context.execution_options.get(SKIP_OPTION):
+            return
+        entry = self.record(statement, parameters, executemany, elapsed_ms)
+        if self._should_explain(conn, statement, executemany):
+            self._explain_later(conn.engine, entry, statement, parameters)
+
+    def record(self, statement: str, parameters, executemany: bool, duration_ms: float) -> SlowQuery:
+        stats = current_query_stats.get()
+        scope = stats.scope if stats is not None else None
+        with self._lock:
+            entry = SlowQuery(
+                id=next(self._ids),
+                recorded_at=datetime.utcnow(),
+                duration_ms=round(duration_ms, 2),
+                statement=statement,
+                parameters=parameters_shape(parameters),
+                executemany=executemany,
+                handler=handler_name(scope) if scope else None,
+                method=scope.get("method") if scope else None,
+                path=scope.get("path") if scope else None,
+            )
+            self._entries.append(entry)
+        where = f" in {entry.method} {entry.path} ({entry.handler})" if scope else ""
+        print(f"Slow query {entry.id}{where}: {entry.duration_ms:.1f} ms; {' '.join(statement.split())[:200]}")
+        return entry
+
+    def _should_explain(self, conn, statement: str, executemany: bool) -> bool:
+        if conn.dialect.name != "postgresql" or executemany:
+            return False
+        # EXPLAIN ANALYZE executes the statement, so never anything that writes
+        if not statement.lstrip().upper().startswith("SELECT") or LOCKING_CLAUSE.search(statement):
+            return False
+        return random.random() < settings.slow_query_explain_sample_rate
+
+    def _explain_later(self, engine: Engine, entry: SlowQuery, statement: str, parameters) -> None:
+        if not self._explaining.acquire(blocking=False):
+            return  # One EXPLAIN at a time; skip this sample rather than queue up load
+        if self._explainer is None:
+            self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._explainer.submit(self._explain, engine, entry, statement, parameters)
+
+    def _explain(self, engine: Engine, entry: SlowQuery, statement: str, parameters) -> None:
+        try:
+            with engine.connect() as connection:
+                connection = connection.execution_options(**{SKIP_OPTION: True})
+                connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.slow_query_explain_timeout_ms)}")
+                volatile = self._volatile_calls(connection, statement)
+                if volatile:
+                    entry.explain_error = f"Not explained: calls volatile function {volatile[0]}"
+                    connection.rollback()
+                    return
+                rows = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or None)
+                entry.explain = "\n".join(row[0] for row in rows)
+                connection.rollback()
+        except Exception as e:
+            entry.explain_error = str(e).strip().splitlines()[0]
+        finally:
+            self._explaining.release()
+
+    def _volatile_calls(self, connection, statement: str) -> List[str]:
+        """Names of the volatile functions the statement appears to call"""
+        if self._volatile_functions is None:
+            # Overloads share a name; any volatile one is enough to skip the statement
+            self._volatile_functions = {
+                name for (name,) in connection.exec_driver_sql("SELECT DISTINCT proname FROM pg_proc WHERE provolatile = 'v'")
+            }
+        called = {name.lower() for name in FUNCTION_CALL.findall(statement)}
+        return sorted(called & self._volatile_functions)
+
+    def entries(self, limit: Optional[int] = None) -> List[SlowQuery]:
+        """Recorded queries, newest first"""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global slow query log, installed on the engine in app.core.database
+slow_query_log = SlowQueryLog(settings.slow_query_log_size)
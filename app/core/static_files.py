@@ -0,0 +1,40 @@
+import os
+import re
+from typing import Optional
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+
+# Content-addressed files: "<sha256>.<ext>" originals and "<sha256>_<size>.<ext>" thumbnails
+CONTENT_NAME = re.compile(r"^([0-9a-f]{64})(?:_\d+)?\.(?:jpg|png|gif|webp)$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_digest(path: Optional[str]) -> Optional[str]:
+    """The sha256 a stored image path or URL is named after, or None for other names"""
+    if not path:
+        return None
+    match = CONTENT_NAME.match(os.path.basename(path.split("?", 1)[0]))
+    return match.group(1) if match else None
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles that lets clients cache content-addressed files forever.
+
+    A file named after the hash of its bytes can never change, so it is
+    served with ``Cache-Control: immutable`` and a strong ETag derived from
+    its name instead of its mtime. Other files keep the default headers.
+    Range requests are handled by FileResponse either way.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        name = os.path.basename(full_path)
+        if not CONTENT_NAME.match(name):
+            return super().file_response(full_path, stat_result, scope, status_code)
+        headers = {"cache-control": IMMUTABLE_CACHE_CONTROL, "etag": f'"{name}"'}
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,278 @@
+import base64
+import hashlib
+import hmac
+import os
+import shutil
+import time
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlencode
+from starlette.requests import Request
+from app.core.config import settings
+from app.core.static_files import IMMUTABLE_CACHE_CONTROL, content_digest
+
+# Local uploads directory, served at /static
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'static')
+
+
+class StorageBackend:
+    """Where uploaded files live.
+
+    Keys are flat file names ("<sha256>.jpg", "<sha256>_256.webp"). Every
+    method that touches storage blocks, so async callers run them in a
+    worker thread.
+    """
+
+    def put(self, key: str, path: str, content_type: str) -> None:
+        """Store the local file at path under key (the file may be moved)"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> Optional[int]:
+        """Size in bytes of a stored file, or None if it does not exist"""
+        raise NotImplementedError
+
+    def read_head(self, key: str, length: int) -> bytes:
+        """The first length bytes of a stored file"""
+        raise NotImplementedError
+
+    def download(self, key: str, path: str) -> None:
+        """Copy a stored file to the local path"""
+        raise NotImplementedError
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Delete files; missing ones are ignored"""
+        raise NotImplementedError
+
+    def url(self, key: str, request: Optional[Request] = None) -> str:
+        """Public URL of a stored file"""
+        raise NotImplementedError
+
+    def presigned_upload(self, key: str, content_type: str, size: int, sha256: str, request: Request) -> Dict:
+        """How a client can PUT a file of exactly size bytes to key without going through the API.
+
+        Returns {"method", "url", "headers", "expires_at"}; the client must
+        send exactly those headers.
+        """
+        raise NotImplementedError
+
+
+class FilesystemStorage(StorageBackend):
+    """Files in a local directory served by the app at /static.
+
+    Direct uploads go to the app's own /uploads/direct endpoint with a URL
+    signed like an S3 presigned URL, so clients use the same flow against
+    both backends.
+    """
+
+    def __init__(self, root: str, public_base_url: Optional[str] = None):
+        self.root = root
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+
+    def _path(self, key: str) -> str:
+        if os.path.basename(key) != key or key.startswith("."):
+            raise ValueError(f"Invalid storage key: {key}")
+        return os.path.join(self.root, key)
+
+    def put(self, key: str, path: str, content_type: str) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        final = self._path(key)
+        if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.root):
+            # Copy next to the destination first so the rename stays atomic
+            staged = f"{final}.{os.getpid()}.part"
+            shutil.copyfile(path, staged)
+            os.remove(path)
+            path = staged
+        os.replace(path, final)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def size(self, key: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            return None
+
+    def read_head(self, key: str, length: int) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read(length)
+
+    def download(self, key: str, path: str) -> None:
+        shutil.copyfile(self._path(key), path)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def url(self, key: str, request: Optional[Request] = None) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        if request is not None:
+            return f"{request.url.scheme}://{request.url.netloc}/static/{key}"
+        return f"{settings.base_url.rstrip('/')}/static/{key}"
+
+    def presigned_upload(self, key: str, content_type: str, size: int, sha256: str, request: Request) -> Dict:
+        expires_at = int(time.time()) + settings.presigned_upload_expiry_seconds
+        query = urlencode({
+            "content_type": content_type,
+            "size": size,
+            "expires": expires_at,
+            "signature": sign_direct_upload(key, content_type, size, expires_at),
+        })
+        base = f"{request.url.scheme}://{request.url.netloc}"
+        return {
+            "method": "PUT",
+            "url": f"{base}{request.app.url_path_for('direct_upload', key=key)}?{query}",
+            "headers": {"Content-Type": content_type},
+            "expires_at": expires_at,
+        }
+
+
+class S3Storage(StorageBackend):
+    """Files in an S3-compatible bucket (AWS S3, MinIO, R2, ...).
+
+    Objects are written with immutable cache headers and clients upload
+    with presigned PUTs whose length and SHA-256 checksum are part of the
+    signature, so the bucket itself rejects anything but the announced
+    bytes.
+    """
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None,
+                 access_key_id: Optional[str] = None, secret_access_key: Optional[str] = None,
+                 public_base_url: Optional[str] = None):
+        try:
+            # Imported here: boto3 is slow to import and only this backend needs it
+            import boto3
+        except ImportError:
+            raise RuntimeError("storage_backend 's3' needs boto3 (pip install boto3)")
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+        if public_base_url:
+            self.public_base_url = public_base_url.rstrip("/")
+        elif endpoint_url:
+            self.public_base_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.public_base_url = f"https://{bucket}.s3.amazonaws.com"
+
+    def put(self, key: str, path: str, content_type: str) -> None:
+        self.client.upload_file(
+            path, self.bucket, key,
+            ExtraArgs={"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL}
+        )
+        os.remove(path)
+
+    def size(self, key: str) -> Optional[int]:
+        from botocore.exceptions import ClientError
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self.size(key) is not None
+
+    def read_head(self, key: str, length: int) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes=0-{length - 1}")["Body"].read()
+
+    def download(self, key: str, path: str) -> None:
+        self.client.download_file(self.bucket, key, path)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for i in range(0, len(keys), 1000):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys[i:i + 1000]], "Quiet": True}
+            )
+
+    def url(self, key: str, request: Optional[Request] = None) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    def presigned_upload(self, key: str, content_type: str, size: int, sha256: str, request: Request) -> Dict:
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "CacheControl": IMMUTABLE_CACHE_CONTROL,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=settings.presigned_upload_expiry_seconds,
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+                "x-amz-checksum-sha256": checksum,
+            },
+            "expires_at": int(time.time()) + settings.presigned_upload_expiry_seconds,
+        }
+
+
+def sign_direct_upload(key: str, content_type: str, size: int, expires_at: int) -> str:
+    """Signature of a FilesystemStorage direct upload URL"""
+    message = f"{key}\n{content_type}\n{size}\n{expires_at}".encode()
+    return hmac.new(settings.secret_key.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_storage() -> StorageBackend:
+    if settings.storage_backend == "s3":
+        return S3Storage(
+            bucket=settings.s3_bucket,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+            public_base_url=settings.storage_public_base_url,
+        )
+    return FilesystemStorage(settings.storage_local_dir or STATIC_DIR, settings.storage_public_base_url)
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """The configured storage backend, created on first use"""
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+    return _storage
+
+
+def get_public_image_url(image_path: str, request: Request) -> Optional[str]:
+    """Public URL for a stored User.image / Worker.image value.
+
+    Content-addressed images are resolved through the storage backend, so
+    values saved under another host or backend still point at the file.
+    Other absolute URLs are returned as is and legacy paths are served from
+    /static.
+    """
+    if not image_path:
+        return None
+    if content_digest(image_path):
+        return get_storage().url(os.path.basename(image_path.split("?", 1)[0]), request)
+    if image_path.startswith("http://") or image_path.startswith("https://"):
+        return image_path
+    if image_path.startswith("/static/"):
+        return f"{request.url.scheme}://{request.url.netloc}{image_path}"
+    filename = os.path.basename(image_path)
+    return f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
@@ -0,0 +1,235 @@
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import handler_name
+
+# Set by setup_tracing(); while it is None every helper here is a no-op and
+# OpenTelemetry is never imported, so tracing costs nothing when it is off.
+_tracer = None
+
+
+def setup_tracing() -> None:
+    """Configure the OpenTelemetry SDK from settings.tracing_exporter.
+
+    "otlp" sends spans to a collector (OTLP over HTTP, e.g. a local
+    Jaeger or otel-collector), "file" appends them as JSON lines to
+    tracing_file_path and "console" prints them.
+    """
+    global _tracer
+    if settings.tracing_exporter == "none" or _tracer is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        raise RuntimeError("tracing_exporter needs opentelemetry-sdk (pip install opentelemetry-sdk)")
+
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            raise RuntimeError(
+                "tracing_exporter 'otlp' needs opentelemetry-exporter-otlp-proto-http "
+                "(pip install opentelemetry-exporter-otlp-proto-http)"
+            )
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    elif settings.tracing_exporter == "file":
+        out = open(settings.tracing_file_path, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    elif settings.tracing_exporter == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        raise RuntimeError(f"Unknown tracing_exporter: {settings.tracing_exporter}")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("helpmate")
+
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict] = None):
+    """Run the block in a child span of the current one"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def traced(name: Optional[str] = None):
+    """Decorator running each call of a function (sync or async) in its own span"""
+    def decorate(func: Callable):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def traced_task(func: Callable, name: Optional[str] = None) -> Callable:
+    """Wrap a background task so it runs in a span under the request that queued it.
+
+    The trace context is captured here, when the task is queued, and
+    attached again when it runs, so it survives thread pools and new event
+    loops (e.g. `lambda: asyncio.run(...)`) that don't copy context.
+    """
+    if _tracer is None:
+        return func
+    from opentelemetry import context
+
+    parent = context.get_current()
+    span_name = f"background {name or getattr(func, '__qualname__', 'task')}"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = context.attach(parent)
+            try:
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            finally:
+                context.detach(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = context.attach(parent)
+        try:
+            with span(span_name):
+                return func(*args, **kwargs)
+        finally:
+            context.detach(token)
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _tracer is None:
+        return
+    from opentelemetry.trace import SpanKind
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    context._trace_span = _tracer.start_span(
+        operation,
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement,
+            "db.operation": operation,
+        },
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = getattr(context, "_trace_span", None)
+    if current is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            current.set_attribute("db.rowcount", cursor.rowcount)
+        current.end()
+
+
+def _handle_error(exception_context):
+    current = getattr(exception_context.execution_context, "_trace_span", None)
+    if current is not None:
+        from opentelemetry.trace import Status, StatusCode
+        current.record_exception(exception_context.original_exception)
+        current.set_status(Status(StatusCode.ERROR))
+        current.end()
+
+
+def trace_queries(engine: Engine) -> None:
+    """Give every statement executed on engine its own span"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class TracingMiddleware:
+    """Starts a server span for each HTTP request or WebSocket connection.
+
+    An incoming W3C traceparent header is continued. The span is named
+    after the matched route once routing has happened, and ends when the
+    last body byte is sent, so background tasks that run afterwards show up
+    as later children instead of stretching the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if _tracer is None or scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        from opentelemetry import context, propagate, trace
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        method = scope.get("method", "WS")
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        parent = propagate.extract(headers)
+        request_span = _tracer.start_span(
+            f"{method} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        token = context.attach(trace.set_span_in_context(request_span, parent))
+        ended = False
+
+        def finish(status_code: Optional[int]) -> None:
+            nonlocal ended
+            if ended:
+                return
+            ended = True
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                request_span.update_name(f"{method} {route.path}")
+                request_span.set_attribute("http.route", route.path)
+            request_span.set_attribute("code.function", handler_name(scope))
+            if status_code is not None:
+                request_span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    request_span.set_status(Status(StatusCode.ERROR))
+            request_span.end()
+
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish(status_code)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            request_span.record_exception(e)
+            request_span.set_status(Status(StatusCode.ERROR))
+            finish(500)
+            raise
+        finally:
+            finish(status_code)
+            context.detach(token)
+
+
+setup_tracing()
@@ -1,17 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.core.database import engine
-from app.models import User, Worker, WorkerOrder, Category, Service, Order, Review, Chat, Message, UserFavorite
-from app.routers import auth, categories, workers, services, orders, chat, favorites, notifications, admin
-
-from app.core.database import Base
-Base.metadata.create_all(bind=engine)
+from app.core.database import SessionLocal
+from app.core.responses import FastJSONResponse
+from app.core.static_files import ImmutableStaticFiles
+from app.core.lazy_routers import LazyRouters, LazyRouterMiddleware
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.tracing import TracingMiddleware
+from app.services.category_registry import category_registry
+from app.services.scheduler import scheduler
+from app.core.config import settings
+from app.routers import ROUTERS
 
 app = FastAPI(
     title="HelpMate API",
     description="A comprehensive home service provider platform API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 app.add_middleware(
@@ -20,19 +25,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination metadata sent alongside list bodies; browsers hide other headers from scripts
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", ImmutableStaticFiles(directory=settings.storage_local_dir or "static"), name="static")
+
+routers = LazyRouters(app, "/api/v1", ROUTERS)
+if settings.lazy_startup:
+    # Serverless: import each router on the first request that needs it
+    app.add_middleware(LazyRouterMiddleware, routers=routers)
+else:
+    routers.load_all()
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if settings.tracing_exporter != "none":
+    app.add_middleware(TracingMiddleware)
+
+@app.on_event("startup")
+def create_tables():
+    # Schema changes normally run as an explicit step (python migrate_db.py), not on every start
+    if settings.create_tables_on_startup:
+        from app.core.database import Base, engine
+        Base.metadata.create_all(bind=engine)
 
-app.include_router(auth.router, prefix="/api/v1")
-app.include_router(categories.router, prefix="/api/v1")
-app.include_router(workers.router, prefix="/api/v1")
-app.include_router(services.router, prefix="/api/v1")
-app.include_router(orders.router, prefix="/api/v1")
-app.include_router(chat.router, prefix="/api/v1")
-app.include_router(favorites.router, prefix="/api/v1")
-app.include_router(admin.router, prefix="/api/v1")
-app.include_router(notifications.router, prefix="/api/v1")
+@app.on_event("startup")
+def load_category_registry():
+    # Otherwise the registry loads itself on first use
+    if settings.lazy_startup:
+        return
+    db = SessionLocal()
+    try:
+        category_registry.load(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_scheduler():
+    if settings.scheduler_enabled:
+        from app.services import scheduled_jobs  # noqa: F401 - registers the jobs
+        scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    await scheduler.stop()
 
 @app.get("/")
 async def root():
@@ -45,4 +81,13 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint (per process)"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.metrics_token and request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8") 
\ No newline at end of file
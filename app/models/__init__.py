@@ -1,11 +1,14 @@
 # Import all models in the correct order to avoid circular dependencies
 from .user import User, UserFavorite
 from .worker import Worker, WorkerOrder
-from .category import Category
+from .category import Category, CategoryVersion, SkillKeyword
 from .service import Service
-from .order import Order, Review
+from .order import Order, Review, ReviewVote, OrderEvent, OrderSeries, SeriesSlot
 from .chat import Chat, Message
-from .notification import Notification
+from .notification import Notification, OutboxMessage
+from .analytics import OrderRollup
+from .scheduler import SchedulerLease
+from .image import StoredImage
 
 # Export all models
 __all__ = [
@@ -14,10 +17,20 @@ __all__ = [
     "Worker", 
     "WorkerOrder",
     "Category",
+    "CategoryVersion",
+    "SkillKeyword",
     "Service",
     "Order",
     "Review",
+    "ReviewVote",
+    "OrderEvent",
+    "OrderSeries",
+    "SeriesSlot",
     "Chat",
     "Message",
-    "Notification"
+    "Notification",
+    "OutboxMessage",
+    "OrderRollup",
+    "SchedulerLease",
+    "StoredImage"
 ] 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, UniqueConstraint
+from app.core.database import Base
+
+
+class OrderRollup(Base):
+    """Order counts and amounts pre-aggregated per time bucket, category, worker and status"""
+    __tablename__ = "order_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    granularity = Column(String, nullable=False)  # hour, day (by created_at); scheduled_day (by scheduled_date)
+    bucket_start = Column(DateTime, nullable=False)  # UTC, truncated to the granularity
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    worker_id = Column(Integer, ForeignKey("workers.id"), nullable=False)
+    status = Column(String, nullable=False)
+    
+    # Measures for the orders currently in this status
+    order_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    total_hours = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket_start", "category_id", "worker_id", "status",
+            name="uq_order_rollups_bucket"
+        ),
+        Index("ix_order_rollups_granularity_bucket_start", "granularity", "bucket_start"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean
+from sqlalchemy import Column, Integer, String, Text, Boolean, Float, ForeignKey
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -12,6 +12,29 @@ class Category(Base):
     icon = Column(String)  # Icon name or path
     color = Column(String)  # Hex color code
     is_active = Column(Boolean, default=True)
+    version = Column(Integer, default=0)  # Bumped on every write, see CategoryRegistry
     
     # Relationships
-    services = relationship("Service", back_populates="category") 
\ No newline at end of file
+    services = relationship("Service", back_populates="category")
+
+
+class CategoryVersion(Base):
+    """Single-row counter handing out Category.version numbers, see CategoryRegistry"""
+    __tablename__ = "category_versions"
+    
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SkillKeyword(Base):
+    __tablename__ = "skill_keywords"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # Whole-word keyword or phrase; a trailing "*" matches any word starting with it
+    keyword = Column(String, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
+    weight = Column(Float, default=1.0)
+    is_active = Column(Boolean, default=True)
+    
+    # Relationships
+    category = relationship("Category")
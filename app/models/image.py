@@ -0,0 +1,64 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, case, event, update
+from sqlalchemy.orm import Session, attributes
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.core.static_files import content_digest
+from app.models.user import User
+from app.models.worker import Worker
+
+
+class StoredImage(Base):
+    """A content-addressed upload in static/ and how many profiles point at it"""
+    __tablename__ = "stored_images"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    digest = Column(String, unique=True, nullable=False)  # sha256 of the file, also its name
+    ext = Column(String, nullable=False)  # e.g. '.jpg'
+    size_bytes = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # User.image / Worker.image values naming it
+    unreferenced_at = Column(DateTime)  # When ref_count last dropped to 0 (or upload time)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+@event.listens_for(Session, "before_flush")
+def _count_image_references(session: Session, flush_context, instances) -> None:
+    """Keep StoredImage.ref_count in step with User.image and Worker.image.
+
+    Runs for every flush, so profile edits, registrations and deletions all
+    adjust the counts in the same transaction as the row they change.
+    """
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, (User, Worker)):
+            deltas[content_digest(obj.image)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, (User, Worker)):
+            history = attributes.get_history(obj, "image")
+            for value in (*history.unchanged, *history.deleted):
+                deltas[content_digest(value)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, (User, Worker)) and obj not in session.deleted:
+            history = attributes.get_history(obj, "image")
+            if history.has_changes():
+                for value in history.deleted:
+                    deltas[content_digest(value)] -= 1
+                for value in history.added:
+                    deltas[content_digest(value)] += 1
+    deltas.pop(None, None)
+
+    now = datetime.utcnow()
+    for digest, delta in deltas.items():
+        if not delta:
+            continue
+        new_count = StoredImage.ref_count + delta
+        session.execute(
+            update(StoredImage)
+            .where(StoredImage.digest == digest)
+            .values(
+                ref_count=new_count,
+                unreferenced_at=case((new_count > 0, None), else_=now),
+            )
+            .execution_options(synchronize_session=False)
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,4 +16,26 @@ class Notification(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", backref="notifications", foreign_keys=[user_id])
-    worker = relationship("Worker", backref="notifications", foreign_keys=[worker_id]) 
\ No newline at end of file
+    worker = relationship("Worker", backref="notifications", foreign_keys=[worker_id])
+
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+    )
+
+
+class OutboxMessage(Base):
+    """Side effect (e.g. an email) owed for an order event, written in the same transaction"""
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("order_events.id"), nullable=False)
+    kind = Column(String, nullable=False)  # e.g., 'order_booked_email_user', 'order_completed_email_worker'
+    attempts = Column(Integer, default=0)
+    claimed_at = Column(DateTime)
+    sent_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "kind", name="uq_outbox_messages_event_kind"),
+    )
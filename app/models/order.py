@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,7 +16,8 @@ class Order(Base):
     description = Column(Text)
     hours = Column(Integer, default=1)
     total_amount = Column(Float, nullable=False)
-    status = Column(String, default="pending")  # pending, accepted, in_progress, completed, cancelled
+    status = Column(String, default="pending")  # pending, accepted, in_progress, completed, cancelled, expired
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every change, see OrderStateMachine
     payment_method = Column(String, default="pay_in_person")  # pay_in_advance, pay_in_person
     
     # Scheduling
@@ -32,6 +33,14 @@ class Order(Base):
     worker = relationship("Worker", back_populates="orders_received")
     service = relationship("Service", back_populates="orders")
     review = relationship("Review", back_populates="order", uselist=False)
+    events = relationship("OrderEvent", back_populates="order", order_by="OrderEvent.id")
+
+    __table_args__ = (
+        Index("ix_orders_worker_id_status_created_at", "worker_id", "status", "created_at"),
+        Index("ix_orders_worker_id_status_scheduled_date", "worker_id", "status", "scheduled_date"),
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_worker_id_status_id", "worker_id", "status", "id"),
+    )
 
 
 class Review(Base):
@@ -45,9 +54,90 @@ class Review(Base):
     # Review details
     rating = Column(Integer, nullable=False)  # 1-5 stars
     comment = Column(Text)
+    helpful_count = Column(Integer, nullable=False, default=0, server_default="0")  # One per ReviewVote
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="reviews")
     worker = relationship("Worker", back_populates="reviews_received")
-    order = relationship("Order", back_populates="review") 
\ No newline at end of file
+    order = relationship("Order", back_populates="review")
+
+    __table_args__ = (
+        Index("ix_reviews_worker_id_created_at", "worker_id", "created_at"),
+        Index("ix_reviews_worker_id_id", "worker_id", "id"),
+        Index("ix_reviews_worker_id_helpful_count_id", "worker_id", "helpful_count", "id"),
+    )
+
+
+class ReviewVote(Base):
+    """A user marking a review as helpful, at most once per review"""
+    __tablename__ = "review_votes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    review_id = Column(Integer, ForeignKey("reviews.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ux_review_votes_review_id_user_id", "review_id", "user_id", unique=True),
+    )
+
+
+class OrderEvent(Base):
+    """Append-only history of order status transitions"""
+    __tablename__ = "order_events"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    from_status = Column(String)  # None for the creation event
+    to_status = Column(String, nullable=False)
+    actor_type = Column(String, nullable=False)  # user, worker, admin, system
+    actor_id = Column(Integer)
+    note = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    order = relationship("Order", back_populates="events")
+
+    __table_args__ = (
+        Index("ix_order_events_order_id_created_at", "order_id", "created_at"),
+    )
+
+
+class OrderSeries(Base):
+    """A recurring booking; its occurrences are reserved up front as SeriesSlots"""
+    __tablename__ = "order_series"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    worker_id = Column(Integer, ForeignKey("workers.id"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id"), nullable=False)
+    description = Column(Text)
+    hours = Column(Integer, default=1)
+    hourly_rate = Column(Float, nullable=False)  # Price locked in when the series is booked
+    payment_method = Column(String, default="pay_in_person")
+    rrule = Column(String, nullable=False)  # e.g. FREQ=WEEKLY;BYDAY=TU,TH;COUNT=12
+    starts_at = Column(DateTime, nullable=False)
+    status = Column(String, default="active")  # active, cancelled
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    slots = relationship("SeriesSlot", back_populates="series", order_by="SeriesSlot.starts_at")
+
+
+class SeriesSlot(Base):
+    """One reserved occurrence of a series; becomes an Order when it is materialized"""
+    __tablename__ = "series_slots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    series_id = Column(Integer, ForeignKey("order_series.id"), nullable=False)
+    worker_id = Column(Integer, ForeignKey("workers.id"), nullable=False)
+    starts_at = Column(DateTime, nullable=False)
+    ends_at = Column(DateTime, nullable=False)
+    status = Column(String, default="reserved")  # reserved, materialized, cancelled
+    order_id = Column(Integer, ForeignKey("orders.id"))
+    
+    series = relationship("OrderSeries", back_populates="slots")
+
+    __table_args__ = (
+        Index("ix_series_slots_worker_id_starts_at", "worker_id", "starts_at"),
+        Index("ix_series_slots_status_starts_at", "status", "starts_at"),
+    )
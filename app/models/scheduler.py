@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class SchedulerLease(Base):
+    """Row lock naming the replica that currently runs the periodic jobs"""
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
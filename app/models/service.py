@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -25,4 +25,8 @@ class Service(Base):
     # Relationships
     category = relationship("Category", back_populates="services")
     worker = relationship("Worker")
-    orders = relationship("Order", back_populates="service") 
\ No newline at end of file
+    orders = relationship("Order", back_populates="service")
+
+    __table_args__ = (
+        Index("ix_services_category_id_is_available", "category_id", "is_available"),
+    ) 
\ No newline at end of file
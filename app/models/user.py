@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -40,6 +40,10 @@ class UserFavorite(Base):
     user = relationship("User", back_populates="favorites")
     worker = relationship("Worker")
 
+    __table_args__ = (
+        Index("ux_user_favorites_user_id_worker_id", "user_id", "worker_id", unique=True),
+    )
+
 
 class PasswordReset(Base):
     __tablename__ = "password_resets"
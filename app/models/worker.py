@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -36,6 +36,11 @@ class Worker(Base):
     reviews_received = relationship("Review", back_populates="worker")
     chats = relationship("Chat", back_populates="worker")
 
+    __table_args__ = (
+        # Case-insensitive email lookups, e.g. the bulk import's duplicate check
+        Index("ix_workers_email_lower", func.lower(email)),
+    )
+
 
 class WorkerOrder(Base):
     __tablename__ = "worker_orders"
@@ -50,4 +55,10 @@ class WorkerOrder(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    worker = relationship("Worker", back_populates="orders_placed") 
\ No newline at end of file
+    worker = relationship("Worker", back_populates="orders_placed")
+    service = relationship("Service")
+
+    __table_args__ = (
+        Index("ix_worker_orders_worker_id_status", "worker_id", "status"),
+        Index("ix_worker_orders_service_id", "service_id"),
+    )
@@ -1 +1,17 @@
- 
\ No newline at end of file
+# Router modules in matching order, with the path prefix (under /api/v1) each one serves.
+# order_series must come before orders so /orders/series is not taken for an order id.
+ROUTERS = (
+    ("auth", "/auth"),
+    ("categories", "/categories"),
+    ("workers", "/workers"),
+    ("services", "/services"),
+    ("order_series", "/orders/series"),
+    ("orders", "/orders"),
+    ("worker_orders", "/worker-orders"),
+    ("uploads", "/uploads"),
+    ("chat", "/chat"),
+    ("favorites", "/favorites"),
+    ("admin", "/admin"),
+    ("analytics", "/admin/analytics"),
+    ("notifications", "/notifications"),
+)
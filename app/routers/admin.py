@@ -1,17 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response, UploadFile, File, Query
 from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
 from app.core.database import get_db
+from app.core.cache import response_cache
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.worker import Worker
-from app.models.category import Category
-from app.models.order import Order
-from app.schemas.category import CategoryCreate, CategoryResponse
+from app.models.category import Category, SkillKeyword
+from app.models.order import Order, OrderEvent
+from app.schemas.category import CategoryCreate, CategoryResponse, SkillKeywordCreate, SkillKeywordResponse
+from app.schemas.user import UserResponse
+from app.schemas.worker import WorkerResponse
+from app.schemas.order import OrderSummary, OrderBulkTransition, OrderBulkTransitionResult, OrderEventResponse
 from app.routers.auth import get_current_user
 from app.models.service import Service
+from app.services.projection_service import ProjectionService
+from app.services.category_registry import category_registry
+from app.services.worker_import_service import WorkerImportService, ImportReport
+from app.services.repair_service import repair_jobs, RepairProgress
+from app.services.export_service import ExportService
+from app.services.order_state_machine import OrderStateMachine
+from app.services.outbox_service import OutboxService
+from app.services.scheduler import JobStats, SchedulerStatus
+from app.services.scheduled_jobs import scheduler
+from app.core.responses import TrustedJSONResponse
+from app.core.slow_queries import SlowQuery, slow_query_log
+from app.core.tracing import traced_task
 import asyncio
+import io
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Paging contract of the admin user, worker and order lists, shown in the API docs
+PAGED_LIST_DESCRIPTION = """Newest first, keyset paginated on id so no row is skipped or repeated.
+
+Pages hold `limit` rows (50 by default, at most 500). The body is a plain list; the
+cursor for the next page is only sent in the `X-Next-Cursor` response header, which is
+absent on the last page. Pass it back as `?cursor=` to continue. `?format=ndjson|csv`
+streams every matching row instead.
+
+**Breaking change:** these lists used to return every row in one response; clients must
+now follow `X-Next-Cursor` to read all of them."""
+
 def admin_required(current_user: User = Depends(get_current_user)):
     if not getattr(current_user, "is_admin", False):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
@@ -31,11 +62,54 @@ def add_category(
         color=category.color,
         is_active=True,
     )
+    category_registry.mark_changed(db, db_category)
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    category_registry.load(db)
     return db_category
 
+# Skill keywords used to map worker skills to categories
+@router.get("/skill-keywords", response_model=List[SkillKeywordResponse])
+def list_skill_keywords(db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
+    return db.query(SkillKeyword).order_by(SkillKeyword.category_id, SkillKeyword.id).all()
+
+@router.post("/skill-keywords", response_model=SkillKeywordResponse)
+def add_skill_keyword(
+    keyword: SkillKeywordCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    category = db.query(Category).filter(Category.id == keyword.category_id).first()
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    db_keyword = SkillKeyword(
+        keyword=keyword.keyword.strip().lower(),
+        category_id=keyword.category_id,
+        weight=keyword.weight,
+        is_active=True,
+    )
+    db.add(db_keyword)
+    # Bumping the category version makes every process recompile its matcher
+    category_registry.mark_changed(db, category)
+    db.commit()
+    db.refresh(db_keyword)
+    category_registry.load(db)
+    return db_keyword
+
+@router.delete("/skill-keywords/{keyword_id}")
+def delete_skill_keyword(keyword_id: int, db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
+    db_keyword = db.query(SkillKeyword).filter(SkillKeyword.id == keyword_id).first()
+    if not db_keyword:
+        raise HTTPException(status_code=404, detail="Skill keyword not found")
+    category = db.query(Category).filter(Category.id == db_keyword.category_id).first()
+    db.delete(db_keyword)
+    if category:
+        category_registry.mark_changed(db, category)
+    db.commit()
+    category_registry.load(db)
+    return {"success": True, "keyword_id": keyword_id}
+
 # Activate/Deactivate User
 @router.put("/users/{user_id}/activate")
 def activate_user(user_id: int, active: bool, db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
@@ -46,6 +120,76 @@ def activate_user(user_id: int, active: bool, db: Session = Depends(get_db), cur
     db.commit()
     return {"success": True, "user_id": user_id, "is_active": user.is_active}
 
+# Bulk import workers from a CSV or JSONL file
+@router.post("/workers/import", response_model=ImportReport)
+def import_workers(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|jsonl)$"),
+    batch_size: int = Query(500, ge=1, le=5000),
+    activate: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+    background_tasks: BackgroundTasks = None,
+):
+    if file_format is None:
+        file_format = "jsonl" if (file.filename or "").lower().endswith((".jsonl", ".ndjson")) else "csv"
+    # Stream the spooled upload line by line instead of reading it into memory
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    report, pending_emails = WorkerImportService.import_workers(
+        db, lines, file_format, batch_size=batch_size, activate=activate
+    )
+    if report.created:
+        response_cache.invalidate("workers")
+    if pending_emails and background_tasks is not None:
+        background_tasks.add_task(traced_task(
+            lambda: asyncio.run(WorkerImportService.send_verification_emails(pending_emails)),
+            "WorkerImportService.send_verification_emails",
+        ))
+    return report
+
+# Repair worker services (remap broken categories, create missing services)
+@router.post("/repairs/worker-services", response_model=RepairProgress)
+def start_worker_services_repair(
+    dry_run: bool = True,
+    batch_size: int = Query(500, ge=1, le=10000),
+    current_user: User = Depends(admin_required),
+    background_tasks: BackgroundTasks = None,
+):
+    if not dry_run and repair_jobs.is_running():
+        raise HTTPException(status_code=409, detail="A repair is already running")
+    progress = repair_jobs.create(dry_run=dry_run, batch_size=batch_size)
+    background_tasks.add_task(traced_task(repair_jobs.run), progress)
+    return progress
+
+@router.get("/repairs/{job_id}", response_model=RepairProgress)
+def get_repair_progress(job_id: str, current_user: User = Depends(admin_required)):
+    progress = repair_jobs.get(job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Repair job not found")
+    return progress
+
+# Periodic job status and timings
+@router.get("/scheduler", response_model=SchedulerStatus)
+def get_scheduler_status(current_user: User = Depends(admin_required)):
+    return scheduler.status()
+
+@router.post("/scheduler/jobs/{name}/run", response_model=JobStats)
+def run_scheduled_job(name: str, current_user: User = Depends(admin_required)):
+    stats = scheduler.run_now(name)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return stats
+
+# Recent slow SQL statements (newest first), with EXPLAIN plans when sampled
+@router.get("/slow-queries", response_model=List[SlowQuery])
+def list_slow_queries(limit: int = Query(50, ge=1, le=1000), current_user: User = Depends(admin_required)):
+    return slow_query_log.entries(limit)
+
+@router.delete("/slow-queries")
+def clear_slow_queries(current_user: User = Depends(admin_required)):
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
+
 # Activate/Deactivate Worker
 @router.put("/workers/{worker_id}/activate")
 def activate_worker(worker_id: int, active: bool, db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
@@ -54,88 +198,140 @@ def activate_worker(worker_id: int, active: bool, db: Session = Depends(get_db),
         raise HTTPException(status_code=404, detail="Worker not found")
     worker.is_active = active
     db.commit()
+    response_cache.invalidate("workers")
     return {"success": True, "worker_id": worker_id, "is_active": worker.is_active}
 
 # Change Order Status
 @router.put("/orders/{order_id}/status")
-def change_order_status(order_id: int, status: str, db: Session = Depends(get_db), current_user: User = Depends(admin_required), background_tasks: BackgroundTasks = None):
+def change_order_status(order_id: int, status: str, note: Optional[str] = None, db: Session = Depends(get_db), current_user: User = Depends(admin_required), background_tasks: BackgroundTasks = None):
     order = db.query(Order).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    if status not in ["pending", "completed", "cancelled"]:
-        raise HTTPException(status_code=400, detail="Invalid status")
-    status_was_completed = order.status == "completed"
-    order.status = status
+    event = OrderStateMachine.transition(db, order, status, "admin", current_user.id, note)
     db.commit()
-    # If status changed to completed, send notification
-    if not status_was_completed and order.status == "completed":
-        from app.models.notification import Notification
-        user_notif = Notification(
-            user_id=order.user_id,
-            type="order_completed",
-            title="Order Completed",
-            message=f"Your order (ID: {order.id}) has been marked as completed. Description: {order.description}"
-        )
-        worker_notif = Notification(
-            worker_id=order.worker_id,
-            type="order_completed",
-            title="Order Completed",
-            message=f"Your order (ID: {order.id}) has been marked as completed. Description: {order.description}"
-        )
-        db.add(user_notif)
-        db.add(worker_notif)
-        db.commit()
-        if background_tasks is not None:
-            from app.services.email_service import email_service
-            user = db.query(User).filter(User.id == order.user_id).first()
-            worker = db.query(Worker).filter(Worker.id == order.worker_id).first()
-            background_tasks.add_task(
-                lambda: asyncio.run(email_service.send_order_completed_email(user, worker, order))
-            )
+    OutboxService.schedule(background_tasks, [event])
     return {"success": True, "order_id": order_id, "status": order.status}
 
-# List all users
-@router.get("/users")
-def list_users(db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
-    users = db.query(User).order_by(User.created_at.desc()).all()
+# Change the status of many orders at once
+@router.post("/orders/status", response_model=OrderBulkTransitionResult)
+def bulk_change_order_status(
+    request: OrderBulkTransition,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+    background_tasks: BackgroundTasks = None,
+):
+    orders = db.query(Order).filter(Order.id.in_(request.order_ids)).all()
+    events, errors = OrderStateMachine.transition_many(
+        db, orders, request.status, "admin", current_user.id, request.note
+    )
+    db.commit()
+    OutboxService.schedule(background_tasks, events)
+    updated = [event.order_id for event in events]
+    unchanged = [order.id for order in orders if order.id not in errors and order.id not in set(updated)]
+    found = {order.id for order in orders}
+    errors.update({order_id: "Order not found" for order_id in request.order_ids if order_id not in found})
+    return OrderBulkTransitionResult(updated=updated, unchanged=unchanged, errors=errors)
+
+# Status history of an order
+@router.get("/orders/{order_id}/events", response_model=List[OrderEventResponse])
+def list_order_events(order_id: int, db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
+    if not db.query(Order.id).filter(Order.id == order_id).first():
+        raise HTTPException(status_code=404, detail="Order not found")
+    return db.query(OrderEvent).filter(OrderEvent.order_id == order_id).order_by(OrderEvent.id).all()
+
+def _created_between(query, column, created_from: Optional[datetime], created_to: Optional[datetime]):
+    if created_from:
+        query = query.filter(column >= created_from)
+    if created_to:
+        query = query.filter(column < created_to)
+    return query
+
+# List users (keyset paginated; ?format=ndjson|csv streams every matching row)
+@router.get("/users", response_model=List[UserResponse], description=PAGED_LIST_DESCRIPTION)
+def list_users(
+    response: Response,
+    active: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    def build_query(session: Session):
+        query = session.query(*ProjectionService.columns_for(User, UserResponse))
+        if active is not None:
+            query = query.filter(User.is_active == active)
+        return _created_between(query, User.created_at, created_from, created_to)
+    
+    if export_format != "json":
+        return ExportService.stream(lambda s: build_query(s).order_by(User.id), UserResponse, export_format, "users")
+    users, next_cursor = paginate(build_query(db), User, User.id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return users
 
-# List all workers
-@router.get("/workers")
-def list_workers(db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
-    workers = db.query(Worker).order_by(Worker.created_at.desc()).all()
+# List workers (keyset paginated; ?format=ndjson|csv streams every matching row)
+@router.get("/workers", response_model=List[WorkerResponse], description=PAGED_LIST_DESCRIPTION)
+def list_workers(
+    response: Response,
+    active: Optional[bool] = None,
+    verified: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    def build_query(session: Session):
+        query = session.query(*ProjectionService.columns_for(Worker, WorkerResponse))
+        if active is not None:
+            query = query.filter(Worker.is_active == active)
+        if verified is not None:
+            query = query.filter(Worker.is_verified == verified)
+        return _created_between(query, Worker.created_at, created_from, created_to)
+    
+    if export_format != "json":
+        return ExportService.stream(lambda s: build_query(s).order_by(Worker.id), WorkerResponse, export_format, "workers")
+    workers, next_cursor = paginate(build_query(db), Worker, Worker.id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return workers
 
-# List all orders
-@router.get("/orders")
-def list_orders(db: Session = Depends(get_db), current_user: User = Depends(admin_required)):
-    orders = db.query(Order).order_by(Order.created_at.desc()).all()
-    result = []
-    for order in orders:
-        user = db.query(User).filter(User.id == order.user_id).first()
-        worker = db.query(Worker).filter(Worker.id == order.worker_id).first()
-        service = db.query(Service).filter(Service.id == order.service_id).first()
-        order_dict = order.__dict__.copy()
-        # Remove SQLAlchemy state
-        order_dict.pop('_sa_instance_state', None)
-        order_dict['user'] = {
-            'id': user.id,
-            'full_name': user.full_name,
-            'email': user.email
-        } if user else None
-        order_dict['worker'] = {
-            'id': worker.id,
-            'full_name': worker.full_name,
-            'email': worker.email
-        } if worker else None
-        order_dict['service'] = {
-            'id': service.id,
-            'title': service.title,
-            'description': service.description,
-            'hourly_rate': service.hourly_rate
-        } if service else None
-        result.append(order_dict)
-    return result
+# List orders (one joined query; keyset paginated; ?format=ndjson|csv streams every matching row)
+@router.get("/orders", response_model=List[OrderSummary], description=PAGED_LIST_DESCRIPTION)
+def list_orders(
+    order_status: Optional[str] = Query(None, alias="status"),
+    worker_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    expand: Optional[str] = None,
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson|csv)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    def build_query(session: Session):
+        query = ProjectionService.order_query(session)
+        if order_status:
+            query = query.filter(Order.status == order_status)
+        if worker_id is not None:
+            query = query.filter(Order.worker_id == worker_id)
+        if user_id is not None:
+            query = query.filter(Order.user_id == user_id)
+        return _created_between(query, Order.created_at, created_from, created_to)
+    
+    if export_format != "json":
+        return ExportService.stream(lambda s: build_query(s).order_by(Order.id), OrderSummary, export_format, "orders")
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.ORDER_EXPANSIONS)
+    rows, next_cursor = paginate(build_query(db), Order, Order.id, cursor, limit)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return TrustedJSONResponse(ProjectionService.order_summaries(db, rows, expansions), List[OrderSummary], headers=headers)
 
 # List all categories
 @router.get("/categories")
@@ -0,0 +1,159 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.user import User
+from app.models.worker import Worker
+from app.models.analytics import OrderRollup
+from app.schemas.analytics import (
+    AnalyticsSummary, StatusTotal, AnalyticsTimeseries, TimeseriesPoint,
+    CategoryAnalytics, WorkerUtilization, BackfillReport
+)
+from app.routers.admin import admin_required
+from app.services.analytics_service import AnalyticsService, BOOKED_STATUSES, SCHEDULED, bucket_start
+from app.services.category_registry import category_registry
+
+router = APIRouter(prefix="/admin/analytics", tags=["admin"])
+
+_completed_count = func.sum(case((OrderRollup.status == "completed", OrderRollup.order_count), else_=0))
+_gmv = func.sum(case((OrderRollup.status == "completed", OrderRollup.total_amount), else_=0.0))
+_booked_hours = func.sum(case((OrderRollup.status.in_(BOOKED_STATUSES), OrderRollup.total_hours), else_=0))
+
+
+def _rollups(db: Session, granularity: str, start: datetime, end: datetime, *columns):
+    """Query rollup rows whose bucket falls in [start, end)"""
+    return db.query(*columns).filter(
+        OrderRollup.granularity == granularity,
+        OrderRollup.bucket_start >= bucket_start(start, granularity),
+        OrderRollup.bucket_start < end,
+    )
+
+# Order totals by status and GMV
+@router.get("/summary", response_model=AnalyticsSummary)
+def get_summary(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    start, end = AnalyticsService.window(start, end)
+    rows = _rollups(
+        db, "day", start, end,
+        OrderRollup.status, func.sum(OrderRollup.order_count), func.sum(OrderRollup.total_amount)
+    ).group_by(OrderRollup.status).all()
+    by_status = [
+        StatusTotal(status=order_status, order_count=count or 0, total_amount=amount or 0.0)
+        for order_status, count, amount in rows if count
+    ]
+    completed = next((s for s in by_status if s.status == "completed"), None)
+    return AnalyticsSummary(
+        start=start,
+        end=end,
+        total_orders=sum(s.order_count for s in by_status),
+        completed_orders=completed.order_count if completed else 0,
+        gmv=completed.total_amount if completed else 0.0,
+        by_status=by_status,
+    )
+
+# Orders and amounts per hour or day
+@router.get("/timeseries", response_model=AnalyticsTimeseries)
+def get_timeseries(
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    order_status: Optional[str] = Query(None, alias="status"),
+    category_id: Optional[int] = None,
+    worker_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    start, end = AnalyticsService.window(start, end, default_days=2 if granularity == "hour" else 30)
+    query = _rollups(
+        db, granularity, start, end,
+        OrderRollup.bucket_start, func.sum(OrderRollup.order_count), func.sum(OrderRollup.total_amount)
+    )
+    if order_status:
+        query = query.filter(OrderRollup.status == order_status)
+    if category_id is not None:
+        query = query.filter(OrderRollup.category_id == category_id)
+    if worker_id is not None:
+        query = query.filter(OrderRollup.worker_id == worker_id)
+    rows = query.group_by(OrderRollup.bucket_start).order_by(OrderRollup.bucket_start).all()
+    return AnalyticsTimeseries(
+        granularity=granularity,
+        start=start,
+        end=end,
+        points=[
+            TimeseriesPoint(bucket_start=moment, order_count=count or 0, total_amount=amount or 0.0)
+            for moment, count, amount in rows if count
+        ],
+    )
+
+# Bookings per category
+@router.get("/categories", response_model=List[CategoryAnalytics])
+def get_category_analytics(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    start, end = AnalyticsService.window(start, end)
+    rows = _rollups(
+        db, "day", start, end,
+        OrderRollup.category_id, func.sum(OrderRollup.order_count), _completed_count, _gmv
+    ).group_by(OrderRollup.category_id).order_by(func.sum(OrderRollup.order_count).desc()).all()
+    result = []
+    for category_id, count, completed, gmv in rows:
+        if not count:
+            continue
+        category = category_registry.get(db, category_id)
+        result.append(CategoryAnalytics(
+            category_id=category_id,
+            category_name=category.name if category else None,
+            order_count=count,
+            completed_orders=completed or 0,
+            gmv=gmv or 0.0,
+        ))
+    return result
+
+# Booked hours and utilization per worker, for orders scheduled in the window
+@router.get("/workers", response_model=List[WorkerUtilization])
+def get_worker_utilization(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    start, end = AnalyticsService.window(start, end)
+    rows = _rollups(
+        db, SCHEDULED, start, end,
+        OrderRollup.worker_id, func.sum(OrderRollup.order_count), _completed_count, _booked_hours, _gmv
+    ).group_by(OrderRollup.worker_id).order_by(_booked_hours.desc(), OrderRollup.worker_id).limit(limit).all()
+    names = dict(db.query(Worker.id, Worker.full_name).filter(Worker.id.in_([row[0] for row in rows]))) if rows else {}
+    available_hours = max((end - start).total_seconds() / 86400, 1) * settings.worker_available_hours_per_day
+    return [
+        WorkerUtilization(
+            worker_id=worker_id,
+            worker_name=names.get(worker_id),
+            order_count=count or 0,
+            completed_orders=completed or 0,
+            booked_hours=booked or 0,
+            gmv=gmv or 0.0,
+            utilization=round((booked or 0) / available_hours, 4),
+        )
+        for worker_id, count, completed, booked, gmv in rows
+    ]
+
+# Rebuild the rollups from the orders table
+@router.post("/backfill", response_model=BackfillReport)
+def backfill_rollups(
+    since: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_required),
+):
+    scanned, written = AnalyticsService.backfill(db, since)
+    return BackfillReport(since=since, orders_scanned=scanned, rollup_rows=written)
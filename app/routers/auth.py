@@ -2,34 +2,25 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFi
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.responses import TrustedJSONResponse
+from app.core.cache import response_cache
 from app.core.security import verify_password, get_password_hash, create_access_token, verify_token
 from app.models.user import User, PasswordReset, EmailVerificationToken
 from app.models.worker import Worker
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, UserUpdate, ChangePasswordRequest as UserChangePasswordRequest, ForgotPasswordRequest as UserForgotPasswordRequest, ResetPasswordRequest as UserResetPasswordRequest
+from app.schemas.upload import ImageUploadResponse
 from app.schemas.worker import WorkerCreate, WorkerLogin, WorkerResponse, WorkerUpdate, ChangePasswordRequest as WorkerChangePasswordRequest, ForgotPasswordRequest as WorkerForgotPasswordRequest, ResetPasswordRequest as WorkerResetPasswordRequest
 from app.services.worker_service import WorkerService
 from app.services.email_service import email_service
-import os
+from app.services.upload_service import upload_service
+from app.core.storage import get_public_image_url
+from app.core.tracing import traced_task
 import asyncio
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def get_public_image_url(image_path: str, request: Request) -> str:
-    if not image_path:
-        return None
-    # If already a URL, return as is
-    if image_path.startswith("http://") or image_path.startswith("https://"):
-        return image_path
-    # If already a /static/ path, return full URL
-    if image_path.startswith("/static/"):
-        return f"{request.url.scheme}://{request.url.netloc}{image_path}"
-    # Otherwise, treat as filename in static
-    filename = os.path.basename(image_path)
-    return f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
-
-
 @router.post("/register/user", response_model=UserResponse)
 def register_user(user: UserCreate, db: Session = Depends(get_db), background_tasks: BackgroundTasks = None):
     """Register a new user"""
@@ -58,9 +49,10 @@ def register_user(user: UserCreate, db: Session = Depends(get_db), background_ta
     # Create verification token and send email
     token_record = email_service.create_verification_token(db, db_user.id, "user")
     if background_tasks is not None:
-        background_tasks.add_task(
-            lambda: asyncio.run(email_service.send_verification_email(db_user.email, token_record.token, "user"))
-        )
+        background_tasks.add_task(traced_task(
+            lambda: asyncio.run(email_service.send_verification_email(db_user.email, token_record.token, "user")),
+            "send_verification_email",
+        ))
     return db_user
 
 
@@ -86,9 +78,10 @@ def register_worker(worker: WorkerCreate, db: Session = Depends(get_db), backgro
         # Create verification token and send email
         token_record = email_service.create_verification_token(db, db_worker.id, "worker")
         if background_tasks is not None:
-            background_tasks.add_task(
-                lambda: asyncio.run(email_service.send_verification_email(db_worker.email, token_record.token, "worker"))
-            )
+            background_tasks.add_task(traced_task(
+                lambda: asyncio.run(email_service.send_verification_email(db_worker.email, token_record.token, "worker")),
+                "send_verification_email",
+            ))
         return db_worker
     except Exception as e:
         db.rollback()
@@ -374,9 +367,10 @@ async def get_user_profile(request: Request, current_user: User = Depends(get_cu
             detail="Only users can access this endpoint"
         )
     # Patch image field to public URL
-    user_dict = current_user.__dict__.copy()
-    user_dict["image"] = get_public_image_url(current_user.image, request) if current_user.image else None
-    return user_dict
+    profile = UserResponse.model_validate(current_user).model_copy(
+        update={"image": get_public_image_url(current_user.image, request) if current_user.image else None}
+    )
+    return TrustedJSONResponse(profile, UserResponse)
 
 
 @router.put("/user/profile", response_model=UserResponse)
@@ -398,25 +392,16 @@ async def update_user_profile(
     db.commit()
     db.refresh(current_user)
     # Patch image field to public URL
-    user_dict = current_user.__dict__.copy()
-    user_dict["image"] = get_public_image_url(current_user.image, request) if current_user.image else None
-    return user_dict 
-
-
-@router.post("/user/upload-profile-image")
-async def upload_profile_image(request: Request, file: UploadFile = File(...)):
-    """Upload a profile image for the user. Returns the public URL."""
-    # Save file to static directory
-    static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'static')
-    os.makedirs(static_dir, exist_ok=True)
-    file_ext = os.path.splitext(file.filename)[1]
-    filename = f"user_{os.urandom(8).hex()}{file_ext}"
-    file_path = os.path.join(static_dir, filename)
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    public_url = f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
-    return {"url": public_url} 
+    profile = UserResponse.model_validate(current_user).model_copy(
+        update={"image": get_public_image_url(current_user.image, request) if current_user.image else None}
+    )
+    return TrustedJSONResponse(profile, UserResponse) 
+
+
+@router.post("/user/upload-profile-image", response_model=ImageUploadResponse)
+async def upload_profile_image(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Upload a profile image for the user. Returns the public URL of the image and its thumbnails."""
+    return await upload_service.save_profile_image(request, file, db) 
 
 
 @router.get("/worker/profile", response_model=WorkerResponse)
@@ -427,9 +412,10 @@ async def get_worker_profile(request: Request, current_user: Worker = Depends(ge
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only workers can access this endpoint"
         )
-    worker_dict = current_user.__dict__.copy()
-    worker_dict["image"] = get_public_image_url(current_user.image, request) if current_user.image else None
-    return worker_dict
+    profile = WorkerResponse.model_validate(current_user).model_copy(
+        update={"image": get_public_image_url(current_user.image, request) if current_user.image else None}
+    )
+    return TrustedJSONResponse(profile, WorkerResponse)
 
 @router.put("/worker/profile", response_model=WorkerResponse)
 async def update_worker_profile(
@@ -448,25 +434,17 @@ async def update_worker_profile(
         setattr(current_user, field, value)
     db.commit()
     db.refresh(current_user)
-    worker_dict = current_user.__dict__.copy()
-    worker_dict["image"] = get_public_image_url(current_user.image, request) if current_user.image else None
-    return worker_dict
-
-
-@router.post("/worker/upload-profile-image")
-async def upload_worker_profile_image(request: Request, file: UploadFile = File(...)):
-    """Upload a profile image for the worker. Returns the public URL."""
-    # Save file to static directory
-    static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'static')
-    os.makedirs(static_dir, exist_ok=True)
-    file_ext = os.path.splitext(file.filename)[1]
-    filename = f"worker_{os.urandom(8).hex()}{file_ext}"
-    file_path = os.path.join(static_dir, filename)
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    public_url = f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
-    return {"url": public_url}
+    response_cache.invalidate("workers")
+    profile = WorkerResponse.model_validate(current_user).model_copy(
+        update={"image": get_public_image_url(current_user.image, request) if current_user.image else None}
+    )
+    return TrustedJSONResponse(profile, WorkerResponse)
+
+
+@router.post("/worker/upload-profile-image", response_model=ImageUploadResponse)
+async def upload_worker_profile_image(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Upload a profile image for the worker. Returns the public URL of the image and its thumbnails."""
+    return await upload_service.save_profile_image(request, file, db)
 
 
 @router.post("/user/change-password")
@@ -541,6 +519,7 @@ def verify_email(token: str, db: Session = Depends(get_db)):
             worker.is_active = True
             email_service.mark_verification_token_used(db, record)
             db.commit()
+            response_cache.invalidate("workers")
             return {"message": "Email verified successfully. You can now log in."}
     raise HTTPException(status_code=400, detail="Invalid or expired verification token.") 
 
@@ -1,24 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.services.category_registry import category_registry
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+# Categories change rarely; let clients and CDNs keep them for a while
+CATEGORIES_CACHE_CONTROL = "public, max-age=300"
+
 
 @router.get("/", response_model=List[CategoryResponse])
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, db: Session = Depends(get_db)):
     """Get all active categories"""
-    categories = db.query(Category).filter(Category.is_active == True).all()
-    return categories
+    return response_cache.respond(
+        request,
+        tags={"categories"},
+        cache_control=CATEGORIES_CACHE_CONTROL,
+        type_=List[CategoryResponse],
+        load=lambda: category_registry.all(db)
+    )
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 def get_category(category_id: int, db: Session = Depends(get_db)):
     """Get a specific category by ID"""
-    category = db.query(Category).filter(Category.id == category_id).first()
+    category = category_registry.get(db, category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -39,9 +49,11 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
         )
     
     db_category = Category(**category.dict())
+    category_registry.mark_changed(db, db_category)
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    category_registry.load(db)
     return db_category
 
 
@@ -67,9 +79,11 @@ def update_category(category_id: int, category: CategoryUpdate, db: Session = De
     # Update category fields
     for field, value in category.dict(exclude_unset=True).items():
         setattr(db_category, field, value)
+    category_registry.mark_changed(db, db_category)
     
     db.commit()
     db.refresh(db_category)
+    category_registry.load(db)
     return db_category
 
 
@@ -84,5 +98,7 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         )
     
     db_category.is_active = False
+    category_registry.mark_changed(db, db_category)
     db.commit()
+    category_registry.load(db)
     return {"message": "Category deleted successfully"} 
\ No newline at end of file
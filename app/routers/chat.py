@@ -7,6 +7,8 @@ from app.models.user import User
 from app.models.worker import Worker
 from app.schemas.chat import ChatCreate, ChatResponse, MessageCreate, MessageResponse, ChatListResponse
 from app.routers.auth import get_current_user
+from app.core.responses import TrustedJSONResponse
+from app.core.tracing import span
 import asyncio
 
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -16,14 +18,17 @@ active_connections: Dict[int, Set[WebSocket]] = {}
 
 async def broadcast_message(chat_id: int, message: dict):
     connections = active_connections.get(chat_id, set())
-    to_remove = set()
-    for ws in connections:
-        try:
-            await ws.send_json(message)
-        except Exception:
-            to_remove.add(ws)
-    for ws in to_remove:
-        connections.discard(ws)
+    with span("chat.broadcast_message", {"chat.id": chat_id, "chat.recipients": len(connections)}) as current:
+        to_remove = set()
+        for ws in connections:
+            try:
+                await ws.send_json(message)
+            except Exception:
+                to_remove.add(ws)
+        for ws in to_remove:
+            connections.discard(ws)
+        if current is not None:
+            current.set_attribute("chat.failed_recipients", len(to_remove))
 
 @router.websocket("/ws/chat/{chat_id}")
 async def websocket_chat(websocket: WebSocket, chat_id: int):
@@ -36,9 +41,11 @@ async def websocket_chat(websocket: WebSocket, chat_id: int):
             data = await websocket.receive_text()  # Just keep alive, no direct send from client
             await asyncio.sleep(0.1)
     except WebSocketDisconnect:
-        active_connections[chat_id].discard(websocket)
-        if not active_connections[chat_id]:
-            del active_connections[chat_id]
+        # broadcast_message may already have dropped this socket, or the whole chat
+        connections = active_connections.get(chat_id, set())
+        connections.discard(websocket)
+        if not connections:
+            active_connections.pop(chat_id, None)
 
 
 @router.post("/", response_model=ChatResponse)
@@ -129,7 +136,7 @@ async def get_user_chats(
         )
         result.append(chat_data)
     
-    return result
+    return TrustedJSONResponse(result, List[ChatListResponse])
 
 
 @router.get("/{chat_id}", response_model=ChatResponse)
@@ -196,7 +203,7 @@ async def send_message(
     db.commit()
     db.refresh(db_message)
     # Broadcast to WebSocket
-    await broadcast_message(chat_id, MessageResponse.from_orm(db_message).dict())
+    await broadcast_message(chat_id, MessageResponse.model_validate(db_message).model_dump(mode="json"))
     return db_message
 
 
@@ -281,7 +288,7 @@ async def get_worker_chats(
         )
         result.append(chat_data)
     
-    return result
+    return TrustedJSONResponse(result, List[ChatListResponse])
 
 
 @router.post("/worker/{chat_id}/messages", response_model=MessageResponse)
@@ -321,7 +328,7 @@ async def send_worker_message(
     db.commit()
     db.refresh(db_message)
     # Broadcast to WebSocket
-    await broadcast_message(chat_id, MessageResponse.from_orm(db_message).dict())
+    await broadcast_message(chat_id, MessageResponse.model_validate(db_message).model_dump(mode="json"))
     return db_message
 
 
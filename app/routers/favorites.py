@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.user import User, UserFavorite
@@ -23,7 +24,12 @@ def add_favorite(data: FavoriteRequest, db: Session = Depends(get_db), current_u
         return {"message": "Already in favorites"}
     fav = UserFavorite(user_id=current_user.id, worker_id=data.worker_id)
     db.add(fav)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request added it first (unique on user_id, worker_id)
+        db.rollback()
+        return {"message": "Already in favorites"}
     return {"message": "Added to favorites"}
 
 @router.delete("/{worker_id}", status_code=200)
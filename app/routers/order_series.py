@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from sqlalchemy.orm import Session, selectinload
+from typing import List
+from app.core.database import get_db
+from app.models.order import OrderSeries
+from app.models.service import Service
+from app.models.user import User
+from app.models.worker import Worker
+from app.schemas.order import OrderSeriesCreate, OrderSeriesResponse
+from app.routers.auth import get_current_user
+from app.services.outbox_service import OutboxService
+from app.services.series_service import SeriesService
+
+router = APIRouter(prefix="/orders/series", tags=["orders"])
+
+
+def _get_own_series(db: Session, series_id: int, current_user: User) -> OrderSeries:
+    series = db.query(OrderSeries).options(selectinload(OrderSeries.slots)).filter(
+        OrderSeries.id == series_id,
+        OrderSeries.user_id == current_user.id
+    ).first()
+    if not series:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Series not found"
+        )
+    return series
+
+
+@router.post("/", response_model=OrderSeriesResponse)
+async def create_series(
+    data: OrderSeriesCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None
+):
+    """Book a recurring order; every occurrence is checked and reserved at once"""
+    if not isinstance(current_user, User):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users can create orders"
+        )
+    
+    service = db.query(Service).filter(Service.id == data.service_id).first()
+    if not service:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service not found"
+        )
+    if not service.is_available:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Service is not available"
+        )
+    worker = db.query(Worker).filter(Worker.id == service.worker_id).first()
+    if not worker or not worker.is_available:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Worker is currently not available for booking"
+        )
+    
+    series, events = SeriesService.create_series(db, current_user.id, service, data)
+    db.commit()
+    OutboxService.schedule(background_tasks, events)
+    return _get_own_series(db, series.id, current_user)
+
+
+@router.get("/", response_model=List[OrderSeriesResponse])
+async def get_series(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's recurring orders"""
+    if not isinstance(current_user, User):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users can access this endpoint"
+        )
+    return db.query(OrderSeries).options(selectinload(OrderSeries.slots)).filter(
+        OrderSeries.user_id == current_user.id
+    ).order_by(OrderSeries.created_at.desc()).all()
+
+
+@router.get("/{series_id}", response_model=OrderSeriesResponse)
+async def get_one_series(
+    series_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a recurring order with its slots"""
+    if not isinstance(current_user, User):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users can access this endpoint"
+        )
+    return _get_own_series(db, series_id, current_user)
+
+
+@router.delete("/{series_id}")
+async def cancel_series(
+    series_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None
+):
+    """Cancel a recurring order: free the remaining slots and cancel its upcoming orders"""
+    if not isinstance(current_user, User):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users can cancel orders"
+        )
+    series = _get_own_series(db, series_id, current_user)
+    if series.status == "cancelled":
+        return {"message": "Series already cancelled"}
+    events = SeriesService.cancel_series(db, series, "user", current_user.id)
+    db.commit()
+    OutboxService.schedule(background_tasks, events)
+    return {"message": "Series cancelled successfully", "cancelled_orders": len(events)}
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
+from datetime import timedelta
 from app.core.database import get_db
 from app.models.order import Order, Review
 from app.models.user import User
 from app.models.service import Service
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, ReviewCreate, ReviewResponse
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderSummary, ReviewCreate, ReviewResponse, OrderAction, WorkerInboxPage
+)
 from app.routers.auth import get_current_user
+from app.services.projection_service import ProjectionService
+from app.services.analytics_service import AnalyticsService
+from app.services.order_state_machine import OrderStateMachine
+from app.services.outbox_service import OutboxService
+from app.services.schedule_service import ScheduleService
+from app.core.responses import TrustedJSONResponse
+from app.core.pagination import paginate
+from app.core.cache import response_cache
 from app.models.worker import Worker
-import asyncio
-from app.models.notification import Notification
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -46,8 +56,12 @@ async def create_order(
             detail="Service is not available"
         )
     
-    # Check if worker exists and is available
-    worker = db.query(Worker).filter(Worker.id == service.worker_id).first()
+    # Check if worker exists and is available; a timed booking reads the worker row
+    # under its lock so concurrent bookings for them are checked one at a time
+    if order.scheduled_date:
+        worker = ScheduleService.lock_worker(db, service.worker_id)
+    else:
+        worker = db.query(Worker).filter(Worker.id == service.worker_id).first()
     if not worker:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,40 +74,12 @@ async def create_order(
             detail="Worker is currently not available for booking"
         )
     
-    # Check for time conflicts if scheduled_date is provided
+    # Check the worker's orders and reserved series slots if scheduled_date is provided
     if order.scheduled_date:
-        # Check if worker has any overlapping orders at the same time
-        from datetime import timedelta
-        
-        # Calculate the end time of the requested booking
         end_time = order.scheduled_date + timedelta(hours=order.hours)
-        
-        # Check for overlapping orders using a subquery approach
-        from sqlalchemy import text
-        
-        # Use raw SQL for the complex time overlap check
-        overlap_query = text("""
-            SELECT * FROM orders 
-            WHERE worker_id = :worker_id 
-            AND status IN ('pending', 'accepted', 'in_progress')
-            AND scheduled_date IS NOT NULL
-            AND (
-                (scheduled_date <= :new_start AND scheduled_date + (hours || ' hours')::interval > :new_start)
-                OR (scheduled_date < :new_end AND scheduled_date + (hours || ' hours')::interval >= :new_end)
-                OR (scheduled_date >= :new_start AND scheduled_date + (hours || ' hours')::interval <= :new_end)
-            )
-        """)
-        
-        conflicting_orders = db.execute(
-            overlap_query,
-            {
-                'worker_id': worker.id,
-                'new_start': order.scheduled_date,
-                'new_end': end_time
-            }
-        ).first()
-        
-        if conflicting_orders:
+        if ScheduleService.find_conflicts(db, worker.id, [(order.scheduled_date, end_time)]):
+            # Release the worker lock now; the session is only closed after the response is sent
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Sorry, the worker is already booked at this time. Please choose another date and time."
@@ -114,54 +100,33 @@ async def create_order(
         scheduled_date=order.scheduled_date
     )
     db.add(db_order)
+    event = OrderStateMachine.record_created(db, db_order, "user", current_user.id)
     
     db.commit()
     db.refresh(db_order)
-    # Create notifications for user and worker
-    notif_title = "Order Booked"
-    notif_msg = f"Your order (ID: {db_order.id}) has been booked. Description: {db_order.description}"
-    user_notif = Notification(
-        user_id=current_user.id,
-        type="order_booked",
-        title=notif_title,
-        message=notif_msg
-    )
-    worker_notif = Notification(
-        worker_id=worker.id,
-        type="order_booked",
-        title=notif_title,
-        message=notif_msg
-    )
-    db.add(user_notif)
-    db.add(worker_notif)
-    db.commit()
-    # Send notification emails to user and worker
-    if background_tasks is not None:
-        from app.services.email_service import email_service
-        background_tasks.add_task(
-            lambda: asyncio.run(email_service.send_order_booked_email(current_user, worker, db_order))
-        )
+    # Booking notifications were written with the order; send the emails afterwards
+    OutboxService.schedule(background_tasks, [event])
     return db_order
 
 
-@router.get("/", response_model=List[OrderResponse])
+@router.get("/", response_model=List[OrderSummary])
 async def get_orders(
+    expand: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all orders for the current user"""
+    """Get all orders for the current user. Use ?expand=user,worker,service for nested objects."""
     if not isinstance(current_user, User):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only users can access this endpoint"
         )
     
-    orders = db.query(Order).options(
-        joinedload(Order.service).joinedload(Service.category),
-        joinedload(Order.worker),
-        joinedload(Order.user)
-    ).filter(Order.user_id == current_user.id).order_by(Order.created_at.desc()).all()
-    return orders
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.ORDER_EXPANSIONS)
+    rows = ProjectionService.order_query(db).filter(
+        Order.user_id == current_user.id
+    ).order_by(Order.created_at.desc()).all()
+    return TrustedJSONResponse(ProjectionService.order_summaries(db, rows, expansions), List[OrderSummary])
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
@@ -221,41 +186,33 @@ async def update_order(
             detail="Order not found or you don't have permission to update it"
         )
     
-    # Track if status is being set to completed
-    status_was_completed = db_order.status == "completed"
+    updates = order_update.dict(exclude_unset=True)
+    new_status = updates.pop("status", None)
+    
+    # A reschedule gets the same worker lock and conflict check as a new booking
+    if "scheduled_date" in updates or "hours" in updates:
+        scheduled_date = updates.get("scheduled_date", db_order.scheduled_date)
+        hours = updates.get("hours", db_order.hours) or 1
+        if scheduled_date:
+            ScheduleService.lock_worker(db, db_order.worker_id)
+            requested = [(scheduled_date, scheduled_date + timedelta(hours=hours))]
+            if ScheduleService.find_conflicts(db, db_order.worker_id, requested, exclude_order_id=db_order.id):
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Sorry, the worker is already booked at this time. Please choose another date and time."
+                )
+    
+    before = AnalyticsService.snapshot(db_order)
     # Update order fields
-    for field, value in order_update.dict(exclude_unset=True).items():
-        setattr(db_order, field, value)
+    OrderStateMachine.update_details(db, db_order, updates)
+    AnalyticsService.record_order(db, db_order, before)
+    event = None
+    if new_status is not None:
+        event = OrderStateMachine.transition(db, db_order, new_status, "user", current_user.id)
     db.commit()
     db.refresh(db_order)
-    # If status changed to completed, send notification and create notification records
-    if not status_was_completed and db_order.status == "completed":
-        from app.models.user import User
-        from app.models.worker import Worker
-        user = db.query(User).filter(User.id == db_order.user_id).first()
-        worker = db.query(Worker).filter(Worker.id == db_order.worker_id).first()
-        notif_title = "Order Completed"
-        notif_msg = f"Your order (ID: {db_order.id}) has been marked as completed. Description: {db_order.description}"
-        user_notif = Notification(
-            user_id=user.id,
-            type="order_completed",
-            title=notif_title,
-            message=notif_msg
-        )
-        worker_notif = Notification(
-            worker_id=worker.id,
-            type="order_completed",
-            title=notif_title,
-            message=notif_msg
-        )
-        db.add(user_notif)
-        db.add(worker_notif)
-        db.commit()
-        if background_tasks is not None:
-            from app.services.email_service import email_service
-            background_tasks.add_task(
-                lambda: asyncio.run(email_service.send_order_completed_email(user, worker, db_order))
-            )
+    OutboxService.schedule(background_tasks, [event])
     return db_order
 
 
@@ -283,13 +240,7 @@ async def cancel_order(
             detail="Order not found or you don't have permission to cancel it"
         )
     
-    if db_order.status in ["completed", "cancelled"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot cancel a completed or already cancelled order"
-        )
-    
-    db_order.status = "cancelled"
+    OrderStateMachine.transition(db, db_order, "cancelled", "user", current_user.id)
     
     db.commit()
     return {"message": "Order cancelled successfully"}
@@ -365,6 +316,7 @@ async def create_review(
     
     db.commit()
     db.refresh(db_review)
+    response_cache.invalidate("workers")
     return db_review
 
 
@@ -402,36 +354,123 @@ async def get_review(
     
     return review 
 
-@router.get("/worker/pending", response_model=List[OrderResponse])
+@router.get("/worker/pending", response_model=List[OrderSummary])
 async def get_pending_orders_for_worker(
+    expand: Optional[str] = None,
     current_worker: Worker = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all pending orders assigned to the current worker"""
     if not isinstance(current_worker, Worker):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only workers can access this endpoint")
-    orders = db.query(Order).options(
-        joinedload(Order.service).joinedload(Service.category),
-        joinedload(Order.user)
-    ).filter(
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.ORDER_EXPANSIONS)
+    rows = ProjectionService.order_query(db).filter(
         Order.worker_id == current_worker.id,
         Order.status == "pending"
     ).order_by(Order.created_at.desc()).all()
-    return orders
+    return TrustedJSONResponse(ProjectionService.order_summaries(db, rows, expansions), List[OrderSummary])
 
-@router.get("/worker/completed", response_model=List[OrderResponse])
+@router.get("/worker/completed", response_model=List[OrderSummary])
 async def get_completed_orders_for_worker(
+    expand: Optional[str] = None,
     current_worker: Worker = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all completed orders assigned to the current worker"""
     if not isinstance(current_worker, Worker):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only workers can access this endpoint")
-    orders = db.query(Order).options(
-        joinedload(Order.service).joinedload(Service.category),
-        joinedload(Order.user)
-    ).filter(
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.ORDER_EXPANSIONS)
+    rows = ProjectionService.order_query(db).filter(
         Order.worker_id == current_worker.id,
         Order.status == "completed"
     ).order_by(Order.created_at.desc()).all()
-    return orders 
\ No newline at end of file
+    return TrustedJSONResponse(ProjectionService.order_summaries(db, rows, expansions), List[OrderSummary])
+
+
+# Worker inbox tabs and the order statuses they show
+INBOX_TABS = {
+    "pending": ["pending"],
+    "active": ["accepted", "in_progress"],
+    "completed": ["completed"],
+    "cancelled": ["cancelled", "expired"],
+}
+
+# Worker actions and the status they move an order into
+WORKER_ACTIONS = {
+    "accept": "accepted",
+    "decline": "cancelled",
+    "start": "in_progress",
+    "complete": "completed",
+}
+
+
+@router.get("/worker/inbox", response_model=WorkerInboxPage)
+async def get_worker_inbox(
+    tab: str = Query("pending", pattern="^(pending|active|completed|cancelled|all)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    expand: Optional[str] = None,
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Orders assigned to the current worker, one status tab at a time, with counts for every tab"""
+    if not isinstance(current_worker, Worker):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only workers can access this endpoint")
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.ORDER_EXPANSIONS)
+    
+    # One grouped query over the (worker_id, status, created_at) index for all tab counts
+    by_status = dict(
+        db.query(Order.status, func.count(Order.id))
+        .filter(Order.worker_id == current_worker.id)
+        .group_by(Order.status)
+        .all()
+    )
+    counts = {name: sum(by_status.get(s, 0) for s in statuses) for name, statuses in INBOX_TABS.items()}
+    counts["all"] = sum(by_status.values())
+    
+    query = ProjectionService.order_query(db).filter(Order.worker_id == current_worker.id)
+    if tab != "all":
+        query = query.filter(Order.status.in_(INBOX_TABS[tab]))
+    # Newest by id: created_at is nullable, and NULL rows would never pass the cursor comparison
+    rows, next_cursor = paginate(query, Order, Order.id, cursor, limit)
+    page = WorkerInboxPage(
+        tab=tab,
+        counts=counts,
+        items=ProjectionService.order_summaries(db, rows, expansions),
+        next_cursor=next_cursor
+    )
+    return TrustedJSONResponse(page, WorkerInboxPage)
+
+
+@router.post("/worker/{order_id}/{action}", response_model=OrderSummary)
+async def act_on_order(
+    order_id: int,
+    action: str,
+    body: OrderAction,
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks = None
+):
+    """Accept, decline, start or complete an order; body.version must match the order's current version"""
+    if not isinstance(current_worker, Worker):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only workers can access this endpoint")
+    if action not in WORKER_ACTIONS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown order action")
+    
+    db_order = db.query(Order).filter(
+        Order.id == order_id,
+        Order.worker_id == current_worker.id
+    ).first()
+    if not db_order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    if action == "decline" and db_order.status != "pending":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only pending orders can be declined")
+    
+    event = OrderStateMachine.transition(
+        db, db_order, WORKER_ACTIONS[action], "worker", current_worker.id, body.note, expected_version=body.version
+    )
+    db.commit()
+    OutboxService.schedule(background_tasks, [event])
+    
+    row = ProjectionService.order_query(db).filter(Order.id == order_id).one()
+    return TrustedJSONResponse(ProjectionService.order_summaries(db, [row], set())[0], OrderSummary)
@@ -1,48 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.models.service import Service
 from app.models.worker import Worker
-from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse, ServiceSummary
 from app.routers.auth import get_current_user
+from app.services.projection_service import ProjectionService
+from app.services.category_registry import category_registry
 
 router = APIRouter(prefix="/services", tags=["services"])
 
+SERVICES_CACHE_CONTROL = "public, max-age=60"
 
-@router.get("/", response_model=List[ServiceResponse])
+
+@router.get("/", response_model=List[ServiceSummary])
 def get_services(
+    request: Request,
     category_id: int = None,
     worker_id: int = None,
     available_only: bool = True,
+    expand: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all services with optional filtering"""
-    query = db.query(Service)
-    
-    if available_only:
-        query = query.filter(Service.is_available == True)
-    
-    if category_id:
-        query = query.filter(Service.category_id == category_id)
+    """Get all services with optional filtering. Use ?expand=category,worker for nested objects."""
+    expansions = ProjectionService.parse_expand(expand, ProjectionService.SERVICE_EXPANSIONS)
     
-    if worker_id:
-        query = query.filter(Service.worker_id == worker_id)
+    def load():
+        query = ProjectionService.service_query(db)
+        
+        if available_only:
+            query = query.filter(Service.is_available == True)
+        
+        if category_id:
+            query = query.filter(Service.category_id == category_id)
+        
+        if worker_id:
+            query = query.filter(Service.worker_id == worker_id)
+        
+        return ProjectionService.service_summaries(db, query.all(), expansions)
     
-    services = query.all()
-    return services
+    return response_cache.respond(
+        request,
+        tags={"services", "categories", "workers"},
+        cache_control=SERVICES_CACHE_CONTROL,
+        type_=List[ServiceSummary],
+        load=load
+    )
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
-def get_service(service_id: int, db: Session = Depends(get_db)):
+def get_service(service_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific service by ID"""
-    service = db.query(Service).filter(Service.id == service_id).first()
-    if not service:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Service not found"
-        )
-    return service
+    def load():
+        service = db.query(Service).filter(Service.id == service_id).first()
+        if not service:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Service not found"
+            )
+        return service
+    
+    return response_cache.respond(
+        request,
+        tags={"services", "categories", "workers"},
+        cache_control=SERVICES_CACHE_CONTROL,
+        type_=ServiceResponse,
+        load=load
+    )
 
 
 @router.post("/", response_model=ServiceResponse)
@@ -60,8 +86,7 @@ async def create_service(
         )
     
     # Check if category exists
-    from app.models.category import Category
-    category = db.query(Category).filter(Category.id == service.category_id).first()
+    category = category_registry.get(db, service.category_id)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,6 +101,7 @@ async def create_service(
     db.add(db_service)
     db.commit()
     db.refresh(db_service)
+    response_cache.invalidate("services")
     return db_service
 
 
@@ -111,6 +137,7 @@ async def update_service(
     
     db.commit()
     db.refresh(db_service)
+    response_cache.invalidate("services")
     return db_service
 
 
@@ -142,6 +169,7 @@ async def delete_service(
     # Soft delete by setting is_available to False
     db_service.is_available = False
     db.commit()
+    response_cache.invalidate("services")
     return {"message": "Service deleted successfully"}
 
 
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.storage import FilesystemStorage, get_storage
+from app.schemas.upload import ImageUploadResponse, PresignRequest, PresignResponse, UploadCompleteRequest
+from app.routers.auth import get_current_user
+from app.services.upload_service import upload_service
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("/presign", response_model=PresignResponse)
+async def presign_upload(
+    data: PresignRequest,
+    request: Request,
+    current_user=Depends(get_current_user)
+):
+    """Get a URL to upload an image straight to storage; then call /uploads/complete with the key"""
+    return await upload_service.presign(request, data.sha256, data.content_type, data.size)
+
+
+@router.put("/direct/{key}", status_code=204)
+async def direct_upload(
+    key: str,
+    request: Request,
+    content_type: str,
+    size: int,
+    expires: int,
+    signature: str
+):
+    """Presigned upload target of the local storage backend"""
+    if not isinstance(get_storage(), FilesystemStorage):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    await upload_service.receive_direct(request, key, content_type, size, expires, signature)
+
+
+@router.post("/complete", response_model=ImageUploadResponse)
+async def complete_upload(
+    data: UploadCompleteRequest,
+    request: Request,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Register a directly uploaded image; returns its URL and the URLs of its thumbnails"""
+    return await upload_service.complete(request, db, data.key)
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.database import get_db
+from app.core.pagination import paginate
+from app.models.service import Service
+from app.models.worker import Worker, WorkerOrder
+from app.schemas.worker import WorkerOrderCreate, WorkerOrderResponse, WorkerOrderPage
+from app.routers.auth import get_current_user
+from app.services.worker_order_service import WorkerOrderService
+
+router = APIRouter(prefix="/worker-orders", tags=["worker orders"])
+
+
+def _require_worker(current_worker) -> Worker:
+    if not isinstance(current_worker, Worker):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only workers can access this endpoint"
+        )
+    return current_worker
+
+
+def _load(db: Session, order_ids: List[int]) -> List[WorkerOrderResponse]:
+    rows = WorkerOrderService.query(db).filter(WorkerOrder.id.in_(order_ids)).order_by(WorkerOrder.id).all()
+    return [WorkerOrderResponse.model_validate(row) for row in rows]
+
+
+@router.post("/", response_model=WorkerOrderResponse)
+async def create_worker_order(
+    data: WorkerOrderCreate,
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Order another worker's service"""
+    worker = _require_worker(current_worker)
+    order_ids = WorkerOrderService.create_many(db, worker.id, [data])
+    db.commit()
+    return _load(db, order_ids)[0]
+
+
+@router.post("/batch", response_model=List[WorkerOrderResponse])
+async def create_worker_orders(
+    data: List[WorkerOrderCreate],
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Place several orders at once; either all of them are created or none"""
+    worker = _require_worker(current_worker)
+    order_ids = WorkerOrderService.create_many(db, worker.id, data)
+    db.commit()
+    return _load(db, order_ids)
+
+
+@router.get("/", response_model=WorkerOrderPage)
+async def list_worker_orders(
+    role: str = Query("placed", pattern="^(placed|received)$"),
+    order_status: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Orders the current worker placed, or received for their services, newest first"""
+    worker = _require_worker(current_worker)
+    query = WorkerOrderService.query(db)
+    if role == "placed":
+        query = query.filter(WorkerOrder.worker_id == worker.id)
+    else:
+        query = query.filter(Service.worker_id == worker.id)
+    if order_status:
+        query = query.filter(WorkerOrder.status == order_status)
+    # Newest by id: created_at is nullable, and NULL rows would never pass the cursor comparison
+    rows, next_cursor = paginate(query, WorkerOrder, WorkerOrder.id, cursor, limit)
+    return WorkerOrderPage(
+        items=[WorkerOrderResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+
+@router.post("/{order_id}/accept", response_model=WorkerOrderResponse)
+async def accept_worker_order(
+    order_id: int,
+    current_worker: Worker = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Accept a pending order placed for one of the current worker's services"""
+    worker = _require_worker(current_worker)
+    WorkerOrderService.accept(db, order_id, worker.id)
+    db.commit()
+    return _load(db, [order_id])[0]
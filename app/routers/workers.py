@@ -1,38 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
+from app.core.cache import response_cache
+from app.core.responses import TrustedJSONResponse
+from app.core.pagination import paginate
+from app.models.user import User
 from app.models.worker import Worker
-from app.models.order import Review
+from app.models.order import Review, ReviewVote
 from app.schemas.worker import (
     WorkerUpdate, WorkerResponse
 )
-from app.schemas.order import ReviewResponse
+from app.schemas.order import WorkerReviewsPage
+from app.schemas.upload import ImageUploadResponse
 from app.routers.auth import get_current_user
 from app.services.worker_service import WorkerService
+from app.services.upload_service import upload_service
+from app.core.storage import get_public_image_url
 from sqlalchemy.orm import joinedload
-import os
 
 router = APIRouter(prefix="/workers", tags=["workers"])
 
-
-def get_public_image_url(image_path: str, request: Request) -> str:
-    if not image_path:
-        return None
-    if image_path.startswith("http://") or image_path.startswith("https://"):
-        return image_path
-    if image_path.startswith("/static/"):
-        return f"{request.url.scheme}://{request.url.netloc}{image_path}"
-    filename = os.path.basename(image_path)
-    return f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
+WORKERS_CACHE_CONTROL = "public, max-age=60"
 
 
 @router.get("/profile", response_model=WorkerResponse)
 async def get_worker_profile(request: Request, current_worker: Worker = Depends(get_current_user)):
     """Get current worker's profile"""
-    worker_dict = current_worker.__dict__.copy()
-    worker_dict["image"] = get_public_image_url(current_worker.image, request) if current_worker.image else None
-    return worker_dict
+    profile = WorkerResponse.model_validate(current_worker).model_copy(
+        update={"image": get_public_image_url(current_worker.image, request) if current_worker.image else None}
+    )
+    return TrustedJSONResponse(profile, WorkerResponse)
 
 
 @router.put("/profile", response_model=WorkerResponse)
@@ -48,67 +48,144 @@ async def update_worker_profile(
     
     db.commit()
     db.refresh(current_worker)
-    worker_dict = current_worker.__dict__.copy()
-    worker_dict["image"] = get_public_image_url(current_worker.image, request) if current_worker.image else None
-    return worker_dict
+    response_cache.invalidate("workers")
+    profile = WorkerResponse.model_validate(current_worker).model_copy(
+        update={"image": get_public_image_url(current_worker.image, request) if current_worker.image else None}
+    )
+    return TrustedJSONResponse(profile, WorkerResponse)
 
-@router.post("/upload-profile-image")
-async def upload_worker_profile_image(request: Request, file: UploadFile = File(...)):
-    """Upload a profile image for the worker. Returns the public URL."""
-    static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'static')
-    os.makedirs(static_dir, exist_ok=True)
-    file_ext = os.path.splitext(file.filename)[1]
-    filename = f"worker_{os.urandom(8).hex()}{file_ext}"
-    file_path = os.path.join(static_dir, filename)
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    public_url = f"{request.url.scheme}://{request.url.netloc}/static/{filename}"
-    return {"url": public_url}
+@router.post("/upload-profile-image", response_model=ImageUploadResponse)
+async def upload_worker_profile_image(request: Request, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Upload a profile image for the worker. Returns the public URL of the image and its thumbnails."""
+    return await upload_service.save_profile_image(request, file, db)
 
 @router.get("/", response_model=List[WorkerResponse])
 def get_workers(
+    request: Request,
     category_id: int = None,
     available_only: bool = True,
     db: Session = Depends(get_db)
 ):
     """Get all workers with optional filtering"""
-    query = db.query(Worker).filter(Worker.is_active == True)
-    
-    if available_only:
-        query = query.filter(Worker.is_available == True)
-    
-    if category_id:
-        # Filter by category through services
-        from app.models.service import Service
-        query = query.join(Service, Worker.id == Service.worker_id).filter(Service.category_id == category_id)
+    def load():
+        query = db.query(Worker).filter(Worker.is_active == True)
+        
+        if available_only:
+            query = query.filter(Worker.is_available == True)
+        
+        if category_id:
+            # Filter by category through services
+            from app.models.service import Service
+            query = query.join(Service, Worker.id == Service.worker_id).filter(Service.category_id == category_id)
+        
+        return query.all()
     
-    workers = query.all()
-    return workers
+    return response_cache.respond(
+        request,
+        tags={"workers", "services"},
+        cache_control=WORKERS_CACHE_CONTROL,
+        type_=List[WorkerResponse],
+        load=load
+    )
 
 @router.get("/{worker_id}", response_model=WorkerResponse)
-def get_worker(worker_id: int, db: Session = Depends(get_db)):
+def get_worker(worker_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific worker by ID"""
+    def load():
+        worker = db.query(Worker).filter(Worker.id == worker_id).first()
+        if not worker:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Worker not found"
+            )
+        return worker
+    
+    return response_cache.respond(
+        request,
+        tags={"workers"},
+        cache_control=WORKERS_CACHE_CONTROL,
+        type_=WorkerResponse,
+        load=load
+    )
+
+@router.get("/{worker_id}/reviews", response_model=WorkerReviewsPage)
+def get_worker_reviews(
+    worker_id: int,
+    response: Response,
+    sort: str = Query("recent", pattern="^(recent|helpful)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get a page of reviews for a specific worker"""
+    # Check if worker exists
     worker = db.query(Worker).filter(Worker.id == worker_id).first()
     if not worker:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Worker not found"
         )
-    return worker
+    
+    # Rating distribution from a single grouped query
+    counts = dict(
+        db.query(Review.rating, func.count(Review.id))
+        .filter(Review.worker_id == worker_id)
+        .group_by(Review.rating)
+        .all()
+    )
+    distribution = {rating: counts.get(rating, 0) for rating in range(1, 6)}
+    total = sum(counts.values())
+    average = sum(rating * count for rating, count in counts.items()) / total if total else 0.0
+    
+    # Newest by id: created_at is nullable, and NULL rows would never pass the cursor comparison
+    sort_column = Review.id if sort == "recent" else Review.helpful_count
+    query = db.query(Review).options(
+        joinedload(Review.user)
+    ).filter(Review.worker_id == worker_id)
+    reviews, next_cursor = paginate(query, Review, sort_column, cursor, limit)
+    
+    response.headers["X-Total-Count"] = str(total)
+    return {
+        "worker": worker,
+        "summary": {"average": round(average, 2), "total": total, "distribution": distribution},
+        "items": reviews,
+        "next_cursor": next_cursor
+    }
 
-@router.get("/{worker_id}/reviews", response_model=List[ReviewResponse])
-def get_worker_reviews(worker_id: int, db: Session = Depends(get_db)):
-    """Get all reviews for a specific worker"""
-    # Check if worker exists
-    worker = db.query(Worker).filter(Worker.id == worker_id).first()
-    if not worker:
+
+@router.post("/{worker_id}/reviews/{review_id}/helpful")
+async def mark_review_helpful(
+    worker_id: int,
+    review_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Mark a worker review as helpful (only users can vote)"""
+    if not isinstance(current_user, User):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users can mark reviews as helpful"
+        )
+    
+    review = db.query(Review.id).filter(
+        Review.id == review_id,
+        Review.worker_id == worker_id
+    ).first()
+    if not review:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Worker not found"
+            detail="Review not found"
         )
     
-    reviews = db.query(Review).options(
-        joinedload(Review.user)
-    ).filter(Review.worker_id == worker_id).all()
-    return reviews 
\ No newline at end of file
+    # Count each user once (unique on review_id, user_id)
+    db.add(ReviewVote(review_id=review_id, user_id=current_user.id))
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return {"message": "Review already marked as helpful"}
+    db.query(Review).filter(Review.id == review_id).update(
+        {Review.helpful_count: Review.helpful_count + 1}, synchronize_session=False
+    )
+    db.commit()
+    return {"message": "Review marked as helpful"}
@@ -0,0 +1,56 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class StatusTotal(BaseModel):
+    status: str
+    order_count: int
+    total_amount: float
+
+
+class AnalyticsSummary(BaseModel):
+    start: datetime
+    end: datetime
+    total_orders: int
+    completed_orders: int
+    gmv: float  # Total amount of completed orders
+    by_status: List[StatusTotal]
+
+
+class TimeseriesPoint(BaseModel):
+    bucket_start: datetime
+    order_count: int
+    total_amount: float
+
+
+class AnalyticsTimeseries(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    points: List[TimeseriesPoint]
+
+
+class CategoryAnalytics(BaseModel):
+    category_id: int
+    category_name: Optional[str] = None
+    order_count: int
+    completed_orders: int
+    gmv: float
+
+
+class WorkerUtilization(BaseModel):
+    # Totals over the orders scheduled in the window, not those created in it
+    worker_id: int
+    worker_name: Optional[str] = None
+    order_count: int
+    completed_orders: int
+    booked_hours: int
+    gmv: float
+    utilization: float  # hours booked for the window / available hours in it
+
+
+class BackfillReport(BaseModel):
+    since: Optional[datetime] = None
+    orders_scanned: int
+    rollup_rows: int
@@ -26,4 +26,18 @@ class CategoryResponse(CategoryBase):
     is_active: bool
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class SkillKeywordCreate(BaseModel):
+    keyword: str  # Whole words; a trailing "*" matches word prefixes
+    category_id: int
+    weight: float = 1.0
+
+
+class SkillKeywordResponse(SkillKeywordCreate):
+    id: int
+    is_active: bool
+    
+    class Config:
+        from_attributes = True
@@ -1,9 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 from datetime import datetime
 from .user import UserResponse
 from .worker import WorkerResponse
-from .service import ServiceResponse
+from .service import ServiceResponse, ServiceSummary
+
+# Longest single booking; the schedule conflict check relies on this bound
+MAX_BOOKING_HOURS = 24
 
 
 class OrderBase(BaseModel):
@@ -15,12 +18,12 @@ class OrderBase(BaseModel):
 
 
 class OrderCreate(OrderBase):
-    pass
+    hours: int = Field(1, ge=1, le=MAX_BOOKING_HOURS)
 
 
 class OrderUpdate(BaseModel):
     description: Optional[str] = None
-    hours: Optional[int] = None
+    hours: Optional[int] = Field(None, ge=1, le=MAX_BOOKING_HOURS)
     scheduled_date: Optional[datetime] = None
     status: Optional[str] = None
 
@@ -31,6 +34,7 @@ class OrderResponse(OrderBase):
     worker_id: int
     total_amount: float
     status: str
+    version: int = 1
     payment_method: str
     completed_date: Optional[datetime] = None
     created_at: datetime
@@ -43,6 +47,106 @@ class OrderResponse(OrderBase):
         from_attributes = True
 
 
+class OrderSummary(OrderBase):
+    id: int
+    user_id: int
+    worker_id: int
+    total_amount: float
+    status: str
+    version: int = 1
+    payment_method: str
+    completed_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None  # The column is nullable; such rows still belong in the list
+    updated_at: Optional[datetime] = None
+    service_title: str
+    worker_name: str
+    user_name: str
+    # Only populated when requested through ?expand=
+    user: Optional[UserResponse] = None
+    worker: Optional[WorkerResponse] = None
+    service: Optional[ServiceSummary] = None
+
+    class Config:
+        from_attributes = True
+
+
+class OrderAction(BaseModel):
+    version: int  # The order version the worker acted on, for optimistic concurrency
+    note: Optional[str] = None
+
+
+class WorkerInboxPage(BaseModel):
+    tab: str
+    counts: Dict[str, int]  # Orders per tab
+    items: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+
+class OrderSeriesCreate(BaseModel):
+    service_id: int
+    description: Optional[str] = None
+    hours: int = Field(1, ge=1, le=MAX_BOOKING_HOURS)
+    payment_method: Optional[str] = "pay_in_person"
+    starts_at: datetime  # First occurrence; later ones keep its time of day
+    rrule: str  # RRULE subset, e.g. FREQ=WEEKLY;BYDAY=TU,TH;COUNT=12
+
+
+class SeriesSlotResponse(BaseModel):
+    id: int
+    starts_at: datetime
+    ends_at: datetime
+    status: str  # reserved, materialized, cancelled
+    order_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class OrderSeriesResponse(BaseModel):
+    id: int
+    user_id: int
+    worker_id: int
+    service_id: int
+    description: Optional[str] = None
+    hours: int
+    hourly_rate: float
+    payment_method: str
+    rrule: str
+    starts_at: datetime
+    status: str
+    created_at: datetime
+    slots: List[SeriesSlotResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class OrderEventResponse(BaseModel):
+    id: int
+    order_id: int
+    from_status: Optional[str] = None
+    to_status: str
+    actor_type: str
+    actor_id: Optional[int] = None
+    note: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OrderBulkTransition(BaseModel):
+    order_ids: List[int]
+    status: str
+    note: Optional[str] = None
+
+
+class OrderBulkTransitionResult(BaseModel):
+    updated: List[int]
+    unchanged: List[int]  # Already in the requested status
+    errors: Dict[int, str]
+
+
 class ReviewCreate(BaseModel):
     rating: int  # 1-5
     comment: Optional[str] = None
@@ -60,4 +164,39 @@ class ReviewResponse(BaseModel):
     worker: WorkerResponse
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class ReviewerSummary(BaseModel):
+    id: int
+    full_name: str
+    image: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ReviewSummary(BaseModel):
+    id: int
+    order_id: int
+    rating: int
+    comment: Optional[str] = None
+    helpful_count: int = 0
+    created_at: Optional[datetime] = None  # The column is nullable; such rows still belong in the list
+    user: ReviewerSummary
+
+    class Config:
+        from_attributes = True
+
+
+class RatingSummary(BaseModel):
+    average: float
+    total: int
+    distribution: Dict[int, int]
+
+
+class WorkerReviewsPage(BaseModel):
+    worker: WorkerResponse
+    summary: RatingSummary
+    items: List[ReviewSummary]
+    next_cursor: Optional[str] = None
@@ -36,4 +36,20 @@ class ServiceResponse(ServiceBase):
     worker: WorkerResponse
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+
+class ServiceSummary(ServiceBase):
+    id: int
+    worker_id: int
+    is_available: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    category_name: str
+    worker_name: str
+    # Only populated when requested through ?expand=
+    category: Optional[CategoryResponse] = None
+    worker: Optional[WorkerResponse] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+
+class ImageUploadResponse(BaseModel):
+    url: str
+    variants: Dict[str, Dict[str, str]]  # size -> {"webp": url, "jpeg": url}
+
+
+class PresignRequest(BaseModel):
+    sha256: str = Field(pattern="^[0-9a-f]{64}$")  # Hex digest of the file the client will upload
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class DirectUpload(BaseModel):
+    method: str
+    url: str
+    headers: Dict[str, str]  # Must be sent exactly as given
+    expires_at: int  # Unix time
+
+
+class PresignResponse(BaseModel):
+    key: str
+    upload: Optional[DirectUpload] = None  # None when the same bytes are already stored
+
+
+class UploadCompleteRequest(BaseModel):
+    key: str
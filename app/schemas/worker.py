@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -30,7 +30,7 @@ class WorkerResponse(BaseModel):
     image: Optional[str] = None
     bio: Optional[str] = None
     skills: List[str] = []
-    hourly_rate: float
+    hourly_rate: Optional[float] = None  # NULL on workers created before rates were required
     experience_years: Optional[int] = None
     is_available: bool
     rating: float
@@ -40,6 +40,12 @@ class WorkerResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    @field_validator("skills", mode="before")
+    @classmethod
+    def skills_or_empty(cls, value):
+        # Older worker rows have NULL skills; clients always get a list
+        return [] if value is None else value
+
     class Config:
         from_attributes = True
 
@@ -68,4 +74,31 @@ class ForgotPasswordRequest(BaseModel):
 class ResetPasswordRequest(BaseModel):
     email: EmailStr
     reset_code: str
-    new_password: str 
\ No newline at end of file
+    new_password: str
+
+
+class WorkerOrderCreate(BaseModel):
+    service_id: int  # Another worker's service
+    description: Optional[str] = None
+    scheduled_date: Optional[datetime] = None
+
+
+class WorkerOrderResponse(BaseModel):
+    id: int
+    worker_id: int  # Worker who placed the order
+    service_id: int
+    status: str
+    description: Optional[str] = None
+    scheduled_date: Optional[datetime] = None
+    created_at: Optional[datetime] = None  # The column is nullable; such rows still belong in the list
+    updated_at: Optional[datetime] = None
+    service_title: str
+    provider_id: int  # Worker who owns the service
+    
+    class Config:
+        from_attributes = True
+
+
+class WorkerOrderPage(BaseModel):
+    items: List[WorkerOrderResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.analytics import OrderRollup
+from app.models.order import Order
+from app.models.service import Service
+
+GRANULARITIES = ("hour", "day")
+
+# Day buckets keyed by scheduled_date instead of created_at, for utilization
+SCHEDULED = "scheduled_day"
+
+# Order statuses whose hours count as booked time for utilization
+BOOKED_STATUSES = ("accepted", "in_progress", "completed")
+
+# (granularity, bucket_start, category_id, worker_id, status) -> [order_count, total_amount, total_hours]
+RollupKey = Tuple[str, datetime, int, int, str]
+RollupDeltas = Dict[RollupKey, list]
+
+# (status, total_amount, hours, scheduled_date) of an order before it changes
+OrderSnapshot = Tuple[str, float, int, Optional[datetime]]
+
+_UPSERT_BATCH = 1000
+
+
+def to_utc(moment: datetime) -> datetime:
+    """Naive UTC datetime, whatever the driver handed back"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    moment = to_utc(moment)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _buckets(created_at: Optional[datetime], scheduled_date: Optional[datetime]) -> List[Tuple[str, datetime]]:
+    """(granularity, bucket_start) of every rollup row an order counts in"""
+    buckets = [(granularity, bucket_start(created_at, granularity)) for granularity in GRANULARITIES] if created_at else []
+    if scheduled_date is not None:
+        buckets.append((SCHEDULED, bucket_start(scheduled_date, "day")))
+    return buckets
+
+
+def _add(deltas: RollupDeltas, buckets: List[Tuple[str, datetime]], category_id: int, worker_id: int,
+         order_status: str, count: int, amount: float, hours: int) -> None:
+    for granularity, start in buckets:
+        key = (granularity, start, category_id, worker_id, order_status)
+        totals = deltas.setdefault(key, [0, 0.0, 0])
+        totals[0] += count
+        totals[1] += amount
+        totals[2] += hours
+
+
+class AnalyticsService:
+    """Maintains the order_rollups table behind the admin analytics endpoints.
+
+    Every order sits in one row per granularity, keyed by the bucket of its
+    created_at, its category, worker and current status, plus one
+    scheduled_day row keyed by its scheduled_date (if any) that the
+    utilization view reads. Creating an order
+    adds it to its rows and a status change moves it between them, inside
+    the same transaction as the order write, so dashboard queries only read
+    a bounded number of pre-aggregated rows. backfill() rebuilds the rows
+    from the orders table.
+    """
+
+    @staticmethod
+    def snapshot(order: Order) -> OrderSnapshot:
+        """Capture the measures of an order before changing it"""
+        return order.status or "pending", order.total_amount or 0.0, order.hours or 0, order.scheduled_date
+
+    @staticmethod
+    def record_order(db: Session, order: Order, before: Optional[OrderSnapshot] = None) -> None:
+        """Apply a new order (before=None) or a change to one; call before commit"""
+        AnalyticsService.record_orders(db, [(order, before)])
+
+    @staticmethod
+    def record_orders(db: Session, changes: List[Tuple[Order, Optional[OrderSnapshot]]]) -> None:
+        """Apply several order changes with one category lookup and one upsert"""
+        changes = [(order, before) for order, before in changes if before != AnalyticsService.snapshot(order)]
+        if not changes:
+            return
+        service_ids = {order.service_id for order, _ in changes}
+        categories = dict(db.query(Service.id, Service.category_id).filter(Service.id.in_(service_ids)))
+        deltas: RollupDeltas = {}
+        for order, before in changes:
+            category_id = categories.get(order.service_id)
+            if category_id is None:
+                continue
+            created_at = order.created_at or datetime.utcnow()
+            if before is not None:
+                old_status, old_amount, old_hours, old_scheduled = before
+                _add(deltas, _buckets(created_at, old_scheduled), category_id, order.worker_id,
+                     old_status, -1, -old_amount, -old_hours)
+            new_status, new_amount, new_hours, new_scheduled = AnalyticsService.snapshot(order)
+            _add(deltas, _buckets(created_at, new_scheduled), category_id, order.worker_id,
+                 new_status, 1, new_amount, new_hours)
+        if deltas:
+            AnalyticsService._upsert(db, deltas)
+
+    @staticmethod
+    def _upsert(db: Session, deltas: RollupDeltas) -> None:
+        """Add deltas onto existing rollup rows, creating missing ones"""
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(OrderRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["granularity", "bucket_start", "category_id", "worker_id", "status"],
+            set_={
+                "order_count": OrderRollup.order_count + stmt.excluded.order_count,
+                "total_amount": OrderRollup.total_amount + stmt.excluded.total_amount,
+                "total_hours": OrderRollup.total_hours + stmt.excluded.total_hours,
+            },
+        )
+        rows = [
+            {
+                "granularity": granularity,
+                "bucket_start": start,
+                "category_id": category_id,
+                "worker_id": worker_id,
+                "status": order_status,
+                "order_count": count,
+                "total_amount": amount,
+                "total_hours": hours,
+            }
+            for (granularity, start, category_id, worker_id, order_status), (count, amount, hours) in deltas.items()
+        ]
+        for i in range(0, len(rows), _UPSERT_BATCH):
+            db.execute(stmt, rows[i:i + _UPSERT_BATCH])
+
+    @staticmethod
+    def backfill(db: Session, since: Optional[datetime] = None) -> Tuple[int, int]:
+        """Rebuild the rollups whose buckets start on or after the given day (or all of them).
+
+        Orders are streamed with yield_per and folded into per-bucket totals,
+        so memory grows with the number of buckets, not orders. Returns
+        (orders scanned, rollup rows written).
+        """
+        query = db.query(
+            Order.created_at, Order.scheduled_date, Service.category_id, Order.worker_id,
+            Order.status, Order.total_amount, Order.hours
+        ).join(Service, Service.id == Order.service_id)
+        delete = db.query(OrderRollup)
+        if since is not None:
+            since = bucket_start(since, "day")
+            query = query.filter(or_(Order.created_at >= since, Order.scheduled_date >= since))
+            delete = delete.filter(OrderRollup.bucket_start >= since)
+        delete.delete(synchronize_session=False)
+
+        deltas: RollupDeltas = {}
+        scanned = 0
+        for created_at, scheduled_date, category_id, worker_id, order_status, amount, hours in query.yield_per(5000):
+            buckets = _buckets(created_at, scheduled_date)
+            if since is not None:
+                # An order created before the window may still be scheduled inside it, or the other way round
+                buckets = [(granularity, start) for granularity, start in buckets if start >= since]
+            _add(deltas, buckets, category_id, worker_id, order_status or "pending", 1, amount or 0.0, hours or 0)
+            scanned += 1
+        AnalyticsService._upsert(db, deltas)
+        db.commit()
+        return scanned, len(deltas)
+
+    @staticmethod
+    def window(start: Optional[datetime], end: Optional[datetime], default_days: int = 30) -> Tuple[datetime, datetime]:
+        """Resolve an optional [start, end) range, defaulting to the last default_days days"""
+        end = to_utc(end) if end else datetime.utcnow()
+        start = to_utc(start) if start else end - timedelta(days=default_days)
+        return start, end
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.models.category import Category, CategoryVersion
+from app.schemas.category import CategoryResponse
+
+
+class CategoryRegistry:
+    """Process-wide, in-memory copy of the categories table.
+
+    Lookups by id or (case-insensitive) name are dict hits. Every write takes
+    the next number from the single-row CategoryVersion counter through
+    mark_changed(), and each process compares (counter, count) against its
+    snapshot at most once per check_interval seconds, so writes made by other
+    replicas are picked up without a restart. The counter is incremented in
+    place, which row-locks it until commit, so concurrent writers never
+    share a version. Listeners registered with subscribe() run after every
+    reload.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._by_id: Dict[int, CategoryResponse] = {}
+        self._by_name: Dict[str, CategoryResponse] = {}
+        self._version: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._listeners: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Register a callback to run whenever the registry reloads"""
+        self._listeners.append(listener)
+
+    @staticmethod
+    def _current_version(db: Session) -> Tuple[int, int]:
+        version = db.query(CategoryVersion.version).filter(CategoryVersion.id == 1).scalar()
+        return int(version or 0), int(db.query(func.count(Category.id)).scalar())
+
+    def load(self, db: Session) -> None:
+        """(Re)load every category from the database"""
+        with self._lock:
+            version = self._current_version(db)
+            categories = [CategoryResponse.model_validate(c) for c in db.query(Category).all()]
+            self._by_id = {c.id: c for c in categories}
+            self._by_name = {c.name.lower(): c for c in categories}
+            self._version = version
+            self._checked_at = time.monotonic()
+        for listener in self._listeners:
+            listener()
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if self._version is None:
+            self.load(db)
+            return
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        if self._current_version(db) != self._version:
+            self.load(db)
+        else:
+            self._checked_at = time.monotonic()
+
+    @staticmethod
+    def mark_changed(db: Session, category: Category) -> None:
+        """Give a category being written the next version (call before commit)"""
+        version = db.execute(
+            update(CategoryVersion)
+            .where(CategoryVersion.id == 1)
+            .values(version=CategoryVersion.version + 1)
+            .returning(CategoryVersion.version)
+        ).scalar()
+        if version is None:
+            # Tables made by create_all rather than the migrations have no counter row yet
+            version = (db.query(func.coalesce(func.max(Category.version), 0)).scalar() or 0) + 1
+            db.add(CategoryVersion(id=1, version=version))
+            db.flush()
+        category.version = version
+
+    def get(self, db: Session, category_id: int) -> Optional[CategoryResponse]:
+        self._ensure_fresh(db)
+        return self._by_id.get(category_id)
+
+    def get_by_name(self, db: Session, name: str) -> Optional[CategoryResponse]:
+        self._ensure_fresh(db)
+        return self._by_name.get(name.lower())
+
+    def name_to_id(self, db: Session) -> Dict[str, int]:
+        """Lower-cased category name -> id for every category"""
+        self._ensure_fresh(db)
+        return {name: c.id for name, c in self._by_name.items()}
+
+    def all(self, db: Session, active_only: bool = True) -> List[CategoryResponse]:
+        self._ensure_fresh(db)
+        return [c for c in self._by_id.values() if c.is_active or not active_only]
+
+
+# Global category registry instance
+category_registry = CategoryRegistry(check_interval=settings.category_registry_check_seconds)
+# Cached catalog responses embed category data
+category_registry.subscribe(lambda: response_cache.invalidate("categories"))
@@ -2,28 +2,40 @@ import os
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
 from sqlalchemy.orm import Session
-from app.models.user import PasswordReset, EmailVerificationToken, User
-from app.models.worker import Worker
+from app.models.user import PasswordReset, EmailVerificationToken
 from app.models.order import Order
 from app.core.config import settings
+from app.core.tracing import traced
 import uuid
 
 class EmailService:
     def __init__(self):
-        self.mail_config = ConnectionConfig(
-            MAIL_USERNAME=settings.smtp_username,
-            MAIL_PASSWORD=settings.smtp_password,
-            MAIL_FROM=settings.smtp_username,
-            MAIL_PORT=settings.smtp_port or 587,
-            MAIL_SERVER=settings.smtp_server or "smtp.gmail.com",
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True,
-            VALIDATE_CERTS=True
-        )
-        self.fastmail = FastMail(self.mail_config)
+        self._fastmail = None
+
+    @property
+    def fastmail(self):
+        """SMTP client, created on first send so importing this module stays cheap"""
+        if self._fastmail is None:
+            from fastapi_mail import FastMail, ConnectionConfig
+            self.mail_config = ConnectionConfig(
+                MAIL_USERNAME=settings.smtp_username,
+                MAIL_PASSWORD=settings.smtp_password,
+                MAIL_FROM=settings.smtp_username,
+                MAIL_PORT=settings.smtp_port or 587,
+                MAIL_SERVER=settings.smtp_server or "smtp.gmail.com",
+                MAIL_STARTTLS=True,
+                MAIL_SSL_TLS=False,
+                USE_CREDENTIALS=True,
+                VALIDATE_CERTS=True
+            )
+            self._fastmail = FastMail(self.mail_config)
+        return self._fastmail
+
+    @staticmethod
+    def _message(**fields):
+        from fastapi_mail import MessageSchema
+        return MessageSchema(**fields)
 
     def generate_reset_code(self) -> str:
         """Generate a 6-digit reset code"""
@@ -55,6 +67,7 @@ class EmailService:
         
         return reset_record
 
+    @traced()
     async def send_reset_email(self, email: str, reset_code: str, user_type: str):
         """Send password reset email"""
         subject = f"Password Reset Code - {settings.app_name}"
@@ -97,7 +110,7 @@ class EmailService:
         </html>
         """
         
-        message = MessageSchema(
+        message = self._message(
             subject=subject,
             recipients=[email],
             body=html_content,
@@ -149,6 +162,7 @@ class EmailService:
         db.refresh(record)
         return record
 
+    @traced()
     async def send_verification_email(self, email: str, token: str, user_type: str):
         subject = f"Verify Your Email - {settings.app_name}"
         verify_url = f"{settings.base_url}/api/v1/auth/verify-email?token={token}"
@@ -176,7 +190,7 @@ class EmailService:
         </div>
         </body></html>
         """
-        message = MessageSchema(
+        message = self._message(
             subject=subject,
             recipients=[email],
             body=html_content,
@@ -203,7 +217,8 @@ class EmailService:
         db.commit()
 
     # --- Order Notification Emails ---
-    async def send_order_booked_email(self, user: User, worker: Worker, order: Order):
+    @traced()
+    async def send_order_booked_email(self, email: str, order: Order):
         subject = f"Order Booked - {settings.app_name}"
         html_content = f"""
         <html><body>
@@ -227,19 +242,17 @@ class EmailService:
         </div>
         </body></html>
         """
-        for email in [user.email, worker.email]:
-            message = MessageSchema(
-                subject=subject,
-                recipients=[email],
-                body=html_content,
-                subtype="html"
-            )
-            try:
-                await self.fastmail.send_message(message)
-            except Exception as e:
-                print(f"Error sending order booked email to {email}: {e}")
+        message = self._message(
+            subject=subject,
+            recipients=[email],
+            body=html_content,
+            subtype="html"
+        )
+        # Failures propagate so the outbox keeps the message pending and retries it
+        await self.fastmail.send_message(message)
 
-    async def send_order_completed_email(self, user: User, worker: Worker, order: Order):
+    @traced()
+    async def send_order_completed_email(self, email: str, order: Order):
         subject = f"Order Completed - {settings.app_name}"
         html_content = f"""
         <html><body>
@@ -263,17 +276,14 @@ class EmailService:
         </div>
         </body></html>
         """
-        for email in [user.email, worker.email]:
-            message = MessageSchema(
-                subject=subject,
-                recipients=[email],
-                body=html_content,
-                subtype="html"
-            )
-            try:
-                await self.fastmail.send_message(message)
-            except Exception as e:
-                print(f"Error sending order completed email to {email}: {e}")
+        message = self._message(
+            subject=subject,
+            recipients=[email],
+            body=html_content,
+            subtype="html"
+        )
+        # Failures propagate so the outbox keeps the message pending and retries it
+        await self.fastmail.send_message(message)
 
 # Global email service instance
 email_service = EmailService() 
\ No newline at end of file
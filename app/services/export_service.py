@@ -0,0 +1,90 @@
+import csv
+import io
+from typing import Callable, Iterator, List
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+from app.core.database import SessionLocal
+from app.core.responses import get_adapter
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value):
+    # Lists (worker skills) use the same ";" separator the CSV importer reads
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+class ExportService:
+    """Streams admin list queries as NDJSON or CSV.
+
+    Rows are read through ``yield_per`` so the driver hands them over in
+    chunks (a server-side cursor on Postgres) and each chunk is written out
+    before the next one is fetched; the table is never held in memory. The
+    export opens its own session because the request's session is closed
+    before a streaming body is sent.
+    """
+
+    CHUNK_ROWS = 1000
+
+    @staticmethod
+    def field_names(query: Query, schema) -> List[str]:
+        """Schema fields that the query selects, in schema order"""
+        selected = {column["name"] for column in query.column_descriptions}
+        return [name for name in schema.model_fields if name in selected]
+
+    @staticmethod
+    def _chunks(query: Query) -> Iterator[list]:
+        chunk = []
+        for row in query.yield_per(ExportService.CHUNK_ROWS):
+            chunk.append(row)
+            if len(chunk) >= ExportService.CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def ndjson_lines(query: Query, schema) -> Iterator[bytes]:
+        adapter = get_adapter(schema)
+        fields = set(ExportService.field_names(query, schema))
+        for chunk in ExportService._chunks(query):
+            yield b"".join(
+                adapter.dump_json(schema.model_validate(row), include=fields) + b"\n" for row in chunk
+            )
+
+    @staticmethod
+    def csv_lines(query: Query, schema) -> Iterator[str]:
+        fields = ExportService.field_names(query, schema)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for chunk in ExportService._chunks(query):
+            writer.writerows([_csv_value(getattr(row, name)) for name in fields] for row in chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def stream(build_query: Callable[[Session], Query], schema, file_format: str, filename: str) -> StreamingResponse:
+        """Stream the rows of build_query(session) as an NDJSON or CSV download"""
+        lines = ExportService.csv_lines if file_format == "csv" else ExportService.ndjson_lines
+
+        def body():
+            db = SessionLocal()
+            try:
+                yield from lines(build_query(db), schema)
+            finally:
+                db.close()
+
+        return StreamingResponse(
+            body(),
+            media_type=EXPORT_MEDIA_TYPES[file_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'},
+        )
@@ -0,0 +1,231 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.order import Order, OrderEvent
+from app.models.notification import Notification, OutboxMessage
+from app.services.analytics_service import AnalyticsService
+
+# Allowed status changes; an order is only completed after it was accepted and
+# started, and completed, cancelled and expired are final
+TRANSITIONS: Dict[str, Set[str]] = {
+    "pending": {"accepted", "cancelled", "expired"},
+    "accepted": {"in_progress", "cancelled"},
+    "in_progress": {"completed", "cancelled"},
+    "completed": set(),
+    "cancelled": set(),
+    "expired": set(),
+}
+
+# Statuses each kind of actor may move an order into
+ACTOR_TARGETS: Dict[str, Set[str]] = {
+    "user": {"cancelled"},  # Completion is the worker's call; it unlocks reviews
+    "worker": {"accepted", "in_progress", "completed", "cancelled"},
+    "admin": set(TRANSITIONS),
+    "system": set(TRANSITIONS),
+}
+
+# Error for orders changed since they were read (409)
+CONFLICT = "Order was changed by another request"
+
+# Notification (type, title, message) sent to both parties when an order enters a status
+NOTIFICATIONS: Dict[str, Tuple[str, str, str]] = {
+    "pending": ("order_booked", "Order Booked", "Your order (ID: {id}) has been booked. Description: {description}"),
+    "accepted": ("order_accepted", "Order Accepted", "Your order (ID: {id}) has been accepted. Description: {description}"),
+    "in_progress": ("order_started", "Order Started", "Your order (ID: {id}) is now in progress. Description: {description}"),
+    "completed": ("order_completed", "Order Completed", "Your order (ID: {id}) has been marked as completed. Description: {description}"),
+    "cancelled": ("order_cancelled", "Order Cancelled", "Your order (ID: {id}) has been cancelled. Description: {description}"),
+    "expired": ("order_expired", "Order Expired", "Your order (ID: {id}) expired because it was not accepted before its scheduled date. Description: {description}"),
+}
+
+# Outbox messages owed when an order enters a status, one per recipient so a
+# retry never resends to someone who already got theirs
+OUTBOX_KINDS: Dict[str, List[str]] = {
+    "pending": ["order_booked_email_user", "order_booked_email_worker"],
+    "completed": ["order_completed_email_user", "order_completed_email_worker"],
+}
+
+
+class OrderStateMachine:
+    """The only place order statuses change.
+
+    A transition is checked against TRANSITIONS and the actor's allowed
+    targets, then applied with a conditional ``UPDATE ... WHERE status =
+    <expected>`` that also bumps Order.version, so two concurrent requests
+    can never both perform it; callers that read a version can pass it back
+    for optimistic concurrency. Each applied transition appends an
+    OrderEvent and adds its notifications, outbox messages and rollup
+    changes in the same transaction, so side effects happen exactly once.
+    Moving an order into the status it already has is a no-op. Callers
+    commit and then hand the events to OutboxService.schedule().
+    """
+
+    @staticmethod
+    def check(order: Order, to_status: str, actor_type: str) -> Optional[str]:
+        """Return why the transition is not allowed, or None"""
+        if to_status not in TRANSITIONS:
+            return "Invalid status"
+        if to_status not in ACTOR_TARGETS.get(actor_type, set()):
+            return f"A {actor_type} cannot set an order to {to_status}"
+        if to_status != order.status and to_status not in TRANSITIONS.get(order.status, set()):
+            return f"Cannot change order status from {order.status} to {to_status}"
+        return None
+
+    @staticmethod
+    def transition(
+        db: Session,
+        order: Order,
+        to_status: str,
+        actor_type: str,
+        actor_id: Optional[int] = None,
+        note: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[OrderEvent]:
+        """Move one order to to_status, raising HTTPException if that is not allowed"""
+        events, errors = OrderStateMachine.transition_many(
+            db, [order], to_status, actor_type, actor_id, note,
+            expected_versions={order.id: expected_version} if expected_version is not None else None
+        )
+        if order.id in errors:
+            conflict = errors[order.id] == CONFLICT
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT if conflict else status.HTTP_400_BAD_REQUEST,
+                detail=errors[order.id]
+            )
+        return events[0] if events else None
+
+    @staticmethod
+    def transition_many(
+        db: Session,
+        orders: List[Order],
+        to_status: str,
+        actor_type: str,
+        actor_id: Optional[int] = None,
+        note: Optional[str] = None,
+        expected_versions: Optional[Dict[int, int]] = None,
+    ) -> Tuple[List[OrderEvent], Dict[int, str]]:
+        """Move several orders to to_status with one UPDATE per current status.
+
+        With expected_versions (order id -> version) an order is only changed
+        if it still has that version. Returns the events written and an error
+        message per order id that was refused. Orders already in to_status
+        are neither.
+        """
+        errors: Dict[int, str] = {}
+        by_status: Dict[str, List[Order]] = {}
+        for order in orders:
+            error = OrderStateMachine.check(order, to_status, actor_type)
+            if expected_versions is not None and order.version != expected_versions.get(order.id):
+                error = CONFLICT
+            if error:
+                errors[order.id] = error
+            elif order.status != to_status:
+                by_status.setdefault(order.status, []).append(order)
+
+        now = datetime.utcnow()
+        values = {"status": to_status}
+        if to_status == "completed":
+            values["completed_date"] = now
+        changed: List[Tuple[Order, tuple]] = []
+        for from_status, group in by_status.items():
+            if expected_versions is not None:
+                target = tuple_(Order.id, Order.version).in_([(o.id, expected_versions[o.id]) for o in group])
+            else:
+                target = Order.id.in_([o.id for o in group])
+            updated = dict(db.execute(
+                update(Order)
+                .where(target, Order.status == from_status)
+                .values(**values, version=Order.version + 1, updated_at=now)
+                .returning(Order.id, Order.version)
+                .execution_options(synchronize_session=False)
+            ).all())
+            for order in group:
+                if order.id not in updated:
+                    errors[order.id] = CONFLICT
+                    continue
+                before = AnalyticsService.snapshot(order)
+                for key, value in values.items():
+                    set_committed_value(order, key, value)
+                set_committed_value(order, "version", updated[order.id])
+                set_committed_value(order, "updated_at", now)
+                changed.append((order, before))
+
+        events = [
+            OrderEvent(
+                order_id=order.id,
+                from_status=before[0],
+                to_status=to_status,
+                actor_type=actor_type,
+                actor_id=actor_id,
+                note=note,
+            )
+            for order, before in changed
+        ]
+        OrderStateMachine._record(db, [order for order, _ in changed], events, to_status)
+        AnalyticsService.record_orders(db, changed)
+        return events, errors
+
+    @staticmethod
+    def update_details(db: Session, order: Order, values: Dict[str, object]) -> None:
+        """Change fields other than status, bumping the version like a transition does.
+
+        Raises 409 if the order changed since it was read, so a worker acting
+        on the old version (or a concurrent edit) is refused.
+        """
+        if not values:
+            return
+        now = datetime.utcnow()
+        version = db.execute(
+            update(Order)
+            .where(Order.id == order.id, Order.version == order.version)
+            .values(**values, version=Order.version + 1, updated_at=now)
+            .returning(Order.version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=CONFLICT)
+        for key, value in values.items():
+            set_committed_value(order, key, value)
+        set_committed_value(order, "version", version)
+        set_committed_value(order, "updated_at", now)
+
+    @staticmethod
+    def record_created(db: Session, order: Order, actor_type: str, actor_id: Optional[int] = None) -> OrderEvent:
+        """Record a newly added order as its first event (call before commit)"""
+        if order.id is None:
+            # Stamp it rather than rely on the server default, which the rollup bucket would not see until a reload
+            order.created_at = order.created_at or datetime.now(timezone.utc)
+            db.flush()
+        event = OrderEvent(
+            order_id=order.id,
+            from_status=None,
+            to_status=order.status or "pending",
+            actor_type=actor_type,
+            actor_id=actor_id,
+        )
+        OrderStateMachine._record(db, [order], [event], event.to_status)
+        AnalyticsService.record_order(db, order)
+        return event
+
+    @staticmethod
+    def _record(db: Session, orders: List[Order], events: List[OrderEvent], to_status: str) -> None:
+        """Write events, then the notifications and outbox messages they owe"""
+        if not events:
+            return
+        db.add_all(events)
+        db.flush()
+        if to_status in NOTIFICATIONS:
+            notif_type, title, template = NOTIFICATIONS[to_status]
+            notifications = []
+            for order in orders:
+                message = template.format(id=order.id, description=order.description)
+                notifications.append(Notification(user_id=order.user_id, type=notif_type, title=title, message=message))
+                notifications.append(Notification(worker_id=order.worker_id, type=notif_type, title=title, message=message))
+            db.add_all(notifications)
+        db.add_all([
+            OutboxMessage(event_id=event.id, kind=kind)
+            for event in events
+            for kind in OUTBOX_KINDS.get(to_status, [])
+        ])
@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi import BackgroundTasks
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.tracing import traced_task
+from app.models.notification import OutboxMessage
+from app.models.order import Order, OrderEvent
+
+# A claimed message that has not been marked sent after this long is retried
+CLAIM_TIMEOUT = timedelta(minutes=5)
+MAX_ATTEMPTS = 5
+
+# Message kind -> (EmailService method, parties of the order it is sent to)
+EMAILS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "order_booked_email_user": ("send_order_booked_email", ("user",)),
+    "order_booked_email_worker": ("send_order_booked_email", ("worker",)),
+    "order_completed_email_user": ("send_order_completed_email", ("user",)),
+    "order_completed_email_worker": ("send_order_completed_email", ("worker",)),
+    # Written before messages were split per recipient
+    "order_booked_email": ("send_order_booked_email", ("user", "worker")),
+    "order_completed_email": ("send_order_completed_email", ("user", "worker")),
+}
+
+
+async def _send(kind: str, order: Order) -> None:
+    from app.services.email_service import email_service
+    if kind not in EMAILS:
+        raise ValueError(f"Unknown outbox message kind: {kind}")
+    method, parties = EMAILS[kind]
+    for party in parties:
+        await getattr(email_service, method)(getattr(order, party).email, order)
+
+
+class OutboxService:
+    """Delivers the outbox messages written by OrderStateMachine.
+
+    A message is claimed with a conditional UPDATE before it is sent, so
+    the request that scheduled it and any later retry pass never both send
+    it. Failed or abandoned messages stay pending and are picked up again
+    by dispatch_pending() until MAX_ATTEMPTS is reached.
+    """
+
+    @staticmethod
+    def schedule(background_tasks: Optional[BackgroundTasks], events: List[Optional[OrderEvent]]) -> None:
+        """Deliver the messages of freshly committed events after the response is sent"""
+        event_ids = [event.id for event in events if event is not None]
+        if event_ids and background_tasks is not None:
+            background_tasks.add_task(traced_task(OutboxService.dispatch_events), event_ids)
+
+    @staticmethod
+    def dispatch_events(event_ids: List[int]) -> int:
+        db = SessionLocal()
+        try:
+            ids = [
+                message_id for (message_id,) in db.query(OutboxMessage.id).filter(
+                    OutboxMessage.event_id.in_(event_ids), OutboxMessage.sent_at == None
+                )
+            ]
+            return OutboxService._dispatch(db, ids)
+        finally:
+            db.close()
+
+    @staticmethod
+    def dispatch_pending(limit: int = 100) -> int:
+        """Retry unsent messages that nobody is working on; returns how many were sent"""
+        db = SessionLocal()
+        try:
+            stale = datetime.utcnow() - CLAIM_TIMEOUT
+            ids = [
+                message_id for (message_id,) in db.query(OutboxMessage.id).filter(
+                    OutboxMessage.sent_at == None,
+                    OutboxMessage.attempts < MAX_ATTEMPTS,
+                    or_(OutboxMessage.claimed_at == None, OutboxMessage.claimed_at < stale)
+                ).order_by(OutboxMessage.id).limit(limit)
+            ]
+            return OutboxService._dispatch(db, ids)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claim(db: Session, message_id: int) -> bool:
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(OutboxMessage)
+            .where(
+                OutboxMessage.id == message_id,
+                OutboxMessage.sent_at == None,
+                or_(OutboxMessage.claimed_at == None, OutboxMessage.claimed_at < now - CLAIM_TIMEOUT)
+            )
+            .values(claimed_at=now, attempts=OutboxMessage.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return claimed == 1
+
+    @staticmethod
+    def _dispatch(db: Session, message_ids: List[int]) -> int:
+        sent = 0
+        for message_id in message_ids:
+            if not OutboxService._claim(db, message_id):
+                continue
+            message = db.query(OutboxMessage).filter(OutboxMessage.id == message_id).first()
+            order = db.query(Order).join(OrderEvent, OrderEvent.order_id == Order.id).filter(
+                OrderEvent.id == message.event_id
+            ).first()
+            try:
+                asyncio.run(_send(message.kind, order))
+            except Exception as e:
+                message.claimed_at = None
+                message.last_error = str(e)
+            else:
+                message.sent_at = datetime.utcnow()
+                message.last_error = None
+                sent += 1
+            db.commit()
+        return sent
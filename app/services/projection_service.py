@@ -0,0 +1,112 @@
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Set
+from app.models import User, Worker, Category, Service, Order
+from app.schemas.user import UserResponse
+from app.schemas.worker import WorkerResponse
+from app.schemas.category import CategoryResponse
+from app.schemas.service import ServiceSummary
+from app.schemas.order import OrderSummary
+
+
+class ProjectionService:
+    """Column-only list queries mapped onto the lightweight summary schemas.
+
+    List endpoints select just the columns a summary needs (plus the names of
+    related rows through joins) instead of hydrating full ORM graphs. Nested
+    objects are only loaded when asked for through ``?expand=``, and then each
+    distinct related row is loaded once with a single ``IN`` query.
+    """
+
+    ORDER_EXPANSIONS = {"user", "worker", "service"}
+    SERVICE_EXPANSIONS = {"category", "worker"}
+
+    @staticmethod
+    def parse_expand(expand: Optional[str], allowed: Set[str]) -> Set[str]:
+        """Parse a comma separated ?expand= value against the allowed names"""
+        if not expand:
+            return set()
+        requested = {part.strip() for part in expand.split(",") if part.strip()}
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot expand: {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(allowed))}"
+            )
+        return requested
+
+    @staticmethod
+    def columns_for(model, schema) -> list:
+        """Model columns backing the scalar fields of a response schema"""
+        return [getattr(model, name) for name in schema.model_fields if name in model.__table__.columns]
+
+    @staticmethod
+    def load_by_ids(db: Session, model, schema, ids: Iterable[int]) -> Dict[int, object]:
+        """Load each distinct row once and map id -> schema instance"""
+        ids = set(ids)
+        if not ids:
+            return {}
+        rows = db.query(*ProjectionService.columns_for(model, schema)).filter(model.id.in_(ids)).all()
+        return {row.id: schema.model_validate(row) for row in rows}
+
+    # --- Orders ---
+    @staticmethod
+    def order_query(db: Session):
+        """Column-only query for OrderSummary rows"""
+        return db.query(
+            *ProjectionService.columns_for(Order, OrderSummary),
+            Service.title.label("service_title"),
+            Worker.full_name.label("worker_name"),
+            User.full_name.label("user_name")
+        ).join(Service, Service.id == Order.service_id).join(
+            Worker, Worker.id == Order.worker_id
+        ).join(User, User.id == Order.user_id)
+
+    @staticmethod
+    def order_summaries(db: Session, rows, expand: Set[str]) -> List[OrderSummary]:
+        """Map order rows to OrderSummary and attach the requested expansions"""
+        orders = [OrderSummary.model_validate(row) for row in rows]
+        if "user" in expand:
+            users = ProjectionService.load_by_ids(db, User, UserResponse, (o.user_id for o in orders))
+            for order in orders:
+                order.user = users.get(order.user_id)
+        if "worker" in expand:
+            workers = ProjectionService.load_by_ids(db, Worker, WorkerResponse, (o.worker_id for o in orders))
+            for order in orders:
+                order.worker = workers.get(order.worker_id)
+        if "service" in expand:
+            service_ids = {o.service_id for o in orders}
+            services = {
+                s.id: s for s in ProjectionService.service_summaries(
+                    db, ProjectionService.service_query(db).filter(Service.id.in_(service_ids)).all(), set()
+                )
+            } if service_ids else {}
+            for order in orders:
+                order.service = services.get(order.service_id)
+        return orders
+
+    # --- Services ---
+    @staticmethod
+    def service_query(db: Session):
+        """Column-only query for ServiceSummary rows"""
+        return db.query(
+            *ProjectionService.columns_for(Service, ServiceSummary),
+            Category.name.label("category_name"),
+            Worker.full_name.label("worker_name")
+        ).join(Category, Category.id == Service.category_id).join(
+            Worker, Worker.id == Service.worker_id
+        )
+
+    @staticmethod
+    def service_summaries(db: Session, rows, expand: Set[str]) -> List[ServiceSummary]:
+        """Map service rows to ServiceSummary and attach the requested expansions"""
+        services = [ServiceSummary.model_validate(row) for row in rows]
+        if "category" in expand:
+            categories = ProjectionService.load_by_ids(db, Category, CategoryResponse, (s.category_id for s in services))
+            for service in services:
+                service.category = categories.get(service.category_id)
+        if "worker" in expand:
+            workers = ProjectionService.load_by_ids(db, Worker, WorkerResponse, (s.worker_id for s in services))
+            for service in services:
+                service.worker = workers.get(service.worker_id)
+        return services
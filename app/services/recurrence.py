@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+
+
+def _parse_until(value: str) -> datetime:
+    value = value.rstrip("Z")
+    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            until = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        # A date-only UNTIL includes that whole day
+        return until + timedelta(days=1) - timedelta(microseconds=1) if fmt == "%Y%m%d" else until
+    raise ValueError(f"Invalid UNTIL: {value}")
+
+
+def parse_rule(rule: str) -> Dict:
+    """Parse the supported RRULE subset: FREQ, INTERVAL, BYDAY (weekly), COUNT and UNTIL"""
+    parts = {}
+    for part in rule.upper().removeprefix("RRULE:").split(";"):
+        if not part.strip():
+            continue
+        key, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid rule part: {part}")
+        parts[key.strip()] = value.strip()
+
+    unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL"}
+    if unknown:
+        raise ValueError(f"Unsupported rule parts: {', '.join(sorted(unknown))}")
+    if parts.get("FREQ") not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if "COUNT" not in parts and "UNTIL" not in parts:
+        raise ValueError("A rule needs COUNT or UNTIL")
+
+    parsed = {"freq": parts["FREQ"], "interval": 1, "byday": None, "count": None, "until": None}
+    try:
+        parsed["interval"] = int(parts.get("INTERVAL", 1))
+        if "COUNT" in parts:
+            parsed["count"] = int(parts["COUNT"])
+    except ValueError:
+        raise ValueError("INTERVAL and COUNT must be integers")
+    if parsed["interval"] < 1 or (parsed["count"] is not None and parsed["count"] < 1):
+        raise ValueError("INTERVAL and COUNT must be positive")
+    if "UNTIL" in parts:
+        parsed["until"] = _parse_until(parts["UNTIL"])
+    if "BYDAY" in parts:
+        if parsed["freq"] != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        days = [d.strip() for d in parts["BYDAY"].split(",") if d.strip()]
+        if not days or any(d not in WEEKDAYS for d in days):
+            raise ValueError("BYDAY must list days as MO,TU,WE,TH,FR,SA,SU")
+        parsed["byday"] = sorted({WEEKDAYS[d] for d in days})
+    return parsed
+
+
+def _candidates(parsed: Dict, dtstart: datetime):
+    step = parsed["interval"]
+    if parsed["freq"] == "DAILY":
+        moment = dtstart
+        while True:
+            yield moment
+            moment += timedelta(days=step)
+    elif parsed["freq"] == "WEEKLY":
+        days = parsed["byday"] or [dtstart.weekday()]
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        while True:
+            for day in days:
+                moment = week_start + timedelta(days=day)
+                if moment >= dtstart:
+                    yield moment
+            week_start += timedelta(weeks=step)
+    else:
+        month_index = dtstart.year * 12 + dtstart.month - 1
+        while True:
+            year, month = divmod(month_index, 12)
+            try:
+                yield dtstart.replace(year=year, month=month + 1)
+            except ValueError:
+                pass  # The month has no such day (e.g. the 31st)
+            month_index += step
+
+
+def occurrences(rule: str, dtstart: datetime, limit: int) -> List[datetime]:
+    """Expand a rule into its start times; raises ValueError past limit occurrences"""
+    parsed = parse_rule(rule)
+    result: List[datetime] = []
+    for moment in _candidates(parsed, dtstart):
+        if parsed["until"] is not None and moment > parsed["until"]:
+            break
+        if parsed["count"] is not None and len(result) >= parsed["count"]:
+            break
+        if len(result) >= limit:
+            raise ValueError(f"A series can have at most {limit} occurrences")
+        result.append(moment)
+    return result
+
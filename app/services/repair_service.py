@@ -0,0 +1,214 @@
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from sqlalchemy import exists, func, select, text, update
+from sqlalchemy.orm import Session
+from app.core.cache import response_cache
+from app.core.database import SessionLocal
+from app.models import Worker, Service, Category
+from app.services.worker_service import WorkerService
+
+# Cap on the number of diff entries kept in memory for one run
+MAX_DIFF_ENTRIES = 1000
+
+
+class RepairProgress(BaseModel):
+    id: str
+    dry_run: bool
+    status: str = "pending"  # pending, running, completed, failed
+    phase: Optional[str] = None
+    batch_size: int
+    services_total: int = 0
+    services_scanned: int = 0
+    services_remapped: int = 0
+    services_unmapped: int = 0
+    workers_total: int = 0
+    workers_scanned: int = 0
+    workers_skipped: int = 0
+    services_created: int = 0
+    diff: List[Dict] = []
+    diff_truncated: bool = False
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# Services whose category_id is missing or points at no category
+_broken_category = (Service.category_id == None) | ~exists().where(Category.id == Service.category_id)
+
+# Best category for a service title: the longest category name it contains
+_title_match = (
+    select(Category.id)
+    .where(func.lower(Service.title).contains(func.lower(Category.name)))
+    .order_by(func.length(Category.name).desc(), Category.id)
+    .limit(1)
+    .scalar_subquery()
+)
+
+# Insert a service unless the worker already has one in that category
+_insert_service = text("""
+    INSERT INTO services (title, description, category_id, worker_id, hourly_rate, minimum_hours, is_available)
+    SELECT :title, :description, :category_id, :worker_id, :hourly_rate, 1, :is_available
+    WHERE NOT EXISTS (
+        SELECT 1 FROM services WHERE worker_id = :worker_id AND category_id = :category_id
+    )
+""")
+
+
+class WorkerServicesRepair:
+    """Idempotent, set-based repair of worker services.
+
+    Phase 1 remaps services with a missing or dangling category_id to the
+    category whose name appears in the title, one UPDATE per batch of ids.
+    Phase 2 creates services for workers that have none, classifying their
+    skills and inserting with a guarded INSERT ... SELECT per batch. Every
+    batch commits on its own, so transactions stay short and a rerun only
+    touches rows that still need fixing. With dry_run nothing is written and
+    the planned changes are returned as a diff.
+    """
+
+    def __init__(self, db: Session, progress: RepairProgress):
+        self.db = db
+        self.progress = progress
+
+    def _record(self, entry: Dict) -> None:
+        if len(self.progress.diff) < MAX_DIFF_ENTRIES:
+            self.progress.diff.append(entry)
+        else:
+            self.progress.diff_truncated = True
+
+    def run(self) -> RepairProgress:
+        progress = self.progress
+        progress.status = "running"
+        progress.started_at = datetime.utcnow()
+        try:
+            progress.services_total = self.db.query(func.count(Service.id)).filter(_broken_category).scalar()
+            progress.workers_total = self.db.query(func.count(Worker.id)).filter(
+                ~exists().where(Service.worker_id == Worker.id)
+            ).scalar()
+            progress.phase = "remap_service_categories"
+            self._remap_service_categories()
+            progress.phase = "create_missing_services"
+            self._create_missing_services()
+            progress.status = "completed"
+        except Exception as e:
+            self.db.rollback()
+            progress.status = "failed"
+            progress.error = str(e)
+        finally:
+            progress.finished_at = datetime.utcnow()
+        return progress
+
+    def _remap_service_categories(self) -> None:
+        progress = self.progress
+        after = 0
+        while True:
+            ids = [row.id for row in self.db.query(Service.id).filter(
+                Service.id > after, _broken_category
+            ).order_by(Service.id).limit(progress.batch_size)]
+            if not ids:
+                break
+            after = ids[-1]
+
+            planned = self.db.query(
+                Service.id, Service.title, Service.category_id, _title_match.label("new_category_id")
+            ).filter(Service.id.in_(ids)).all()
+            for row in planned:
+                self._record({
+                    "action": "remap_service" if row.new_category_id else "unmapped_service",
+                    "service_id": row.id,
+                    "title": row.title,
+                    "old_category_id": row.category_id,
+                    "new_category_id": row.new_category_id,
+                })
+            mapped = sum(1 for row in planned if row.new_category_id)
+
+            if not progress.dry_run:
+                self.db.execute(
+                    update(Service)
+                    .where(Service.id.in_(ids), _title_match != None)
+                    .values(category_id=_title_match)
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+            progress.services_scanned += len(ids)
+            progress.services_remapped += mapped
+            progress.services_unmapped += len(planned) - mapped
+
+    def _create_missing_services(self) -> None:
+        progress = self.progress
+        after = 0
+        while True:
+            workers = self.db.query(
+                Worker.id, Worker.full_name, Worker.skills, Worker.hourly_rate, Worker.is_available
+            ).filter(
+                Worker.id > after,
+                ~exists().where(Service.worker_id == Worker.id)
+            ).order_by(Worker.id).limit(progress.batch_size).all()
+            if not workers:
+                break
+            after = workers[-1].id
+
+            rows = []
+            for worker in workers:
+                skills_by_category = WorkerService.skills_by_category(self.db, worker.skills or [])
+                if not skills_by_category:
+                    progress.workers_skipped += 1
+                    continue
+                for category_id, skill in skills_by_category.items():
+                    rows.append({
+                        "title": f"Professional {skill}",
+                        "description": f"Professional {skill} service by {worker.full_name}",
+                        "category_id": category_id,
+                        "worker_id": worker.id,
+                        "hourly_rate": worker.hourly_rate or 20.0,
+                        "is_available": worker.is_available if worker.is_available is not None else True,
+                    })
+                    self._record({
+                        "action": "create_service",
+                        "worker_id": worker.id,
+                        "title": f"Professional {skill}",
+                        "category_id": category_id,
+                    })
+
+            if rows and not progress.dry_run:
+                self.db.execute(_insert_service, rows)
+                self.db.commit()
+            progress.workers_scanned += len(workers)
+            progress.services_created += len(rows)
+
+
+class RepairJobs:
+    """In-memory registry of repair runs so admins can poll their progress"""
+
+    def __init__(self):
+        self._jobs: Dict[str, RepairProgress] = {}
+        self._lock = threading.Lock()
+
+    def create(self, dry_run: bool, batch_size: int) -> RepairProgress:
+        progress = RepairProgress(id=uuid.uuid4().hex, dry_run=dry_run, batch_size=batch_size)
+        with self._lock:
+            self._jobs[progress.id] = progress
+        return progress
+
+    def get(self, job_id: str) -> Optional[RepairProgress]:
+        return self._jobs.get(job_id)
+
+    def is_running(self) -> bool:
+        return any(job.status in ("pending", "running") and not job.dry_run for job in self._jobs.values())
+
+    @staticmethod
+    def run(progress: RepairProgress) -> None:
+        db = SessionLocal()
+        try:
+            WorkerServicesRepair(db, progress).run()
+        finally:
+            db.close()
+        if not progress.dry_run:
+            response_cache.invalidate("services")
+
+
+# Global repair job registry
+repair_jobs = RepairJobs()
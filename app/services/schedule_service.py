@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.order import Order, SeriesSlot
+from app.models.worker import Worker
+from app.schemas.order import MAX_BOOKING_HOURS
+from app.services.analytics_service import to_utc
+
+# Order statuses that occupy the worker's time
+ACTIVE_ORDER_STATUSES = ("pending", "accepted", "in_progress")
+
+Interval = Tuple[datetime, datetime]
+
+
+def _merge(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping intervals into disjoint ones"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ScheduleService:
+    """Checks requested time slots against a worker's schedule.
+
+    A worker's schedule is their active orders plus the reserved slots of
+    recurring series. find_conflicts() loads everything in the requested
+    span with one range query per source and sweeps the sorted requests
+    against the merged busy intervals, so checking a whole series costs the
+    same two queries as checking a single order.
+    """
+
+    @staticmethod
+    def lock_worker(db: Session, worker_id: int) -> Optional[Worker]:
+        """Load and lock the worker row so concurrent bookings for them are checked one at a time"""
+        return db.query(Worker).filter(Worker.id == worker_id).with_for_update().first()
+
+    @staticmethod
+    def busy_intervals(
+        db: Session, worker_id: int, start: datetime, end: datetime, exclude_order_id: Optional[int] = None
+    ) -> List[Interval]:
+        query = db.query(Order.scheduled_date, Order.hours).filter(
+            Order.worker_id == worker_id,
+            Order.status.in_(ACTIVE_ORDER_STATUSES),
+            Order.scheduled_date != None,
+            Order.scheduled_date < end,
+            Order.scheduled_date > start - timedelta(hours=MAX_BOOKING_HOURS)
+        )
+        if exclude_order_id is not None:
+            query = query.filter(Order.id != exclude_order_id)
+        orders = query.all()
+        slots = db.query(SeriesSlot.starts_at, SeriesSlot.ends_at).filter(
+            SeriesSlot.worker_id == worker_id,
+            SeriesSlot.status == "reserved",
+            SeriesSlot.starts_at < end,
+            SeriesSlot.ends_at > start
+        ).all()
+        intervals = [(scheduled, scheduled + timedelta(hours=hours or 1)) for scheduled, hours in orders]
+        intervals.extend((starts_at, ends_at) for starts_at, ends_at in slots)
+        return intervals
+
+    @staticmethod
+    def find_conflicts(
+        db: Session, worker_id: int, requested: List[Interval], exclude_order_id: Optional[int] = None
+    ) -> List[Interval]:
+        """Return the requested intervals that overlap the worker's schedule (minus the order being moved)"""
+        if not requested:
+            return []
+        requested = sorted((to_utc(start), to_utc(end)) for start, end in requested)
+        busy = _merge(ScheduleService.busy_intervals(
+            db, worker_id, requested[0][0], max(end for _, end in requested), exclude_order_id
+        ))
+        conflicts = []
+        i = 0
+        for start, end in requested:
+            # Busy intervals are disjoint and sorted, so ends only grow
+            while i < len(busy) and busy[i][1] <= start:
+                i += 1
+            if i < len(busy) and busy[i][0] < end:
+                conflicts.append((start, end))
+        return conflicts
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.order import Order
+from app.models.user import PasswordReset, EmailVerificationToken
+from app.services.analytics_service import AnalyticsService
+from app.services.order_state_machine import OrderStateMachine
+from app.services.outbox_service import OutboxService
+from app.services.series_service import SeriesService
+from app.services.upload_service import UploadService
+from app.services.scheduler import scheduler
+
+# Upper bound on batches per run so one run never holds the scheduler for long
+MAX_BATCHES_PER_RUN = 20
+
+
+@scheduler.job("expire_stale_orders", interval=300)
+def expire_stale_orders(db: Session) -> int:
+    """Expire pending orders whose scheduled date passed more than the grace period ago"""
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.pending_order_grace_minutes)
+    expired = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        orders = db.query(Order).filter(
+            Order.status == "pending",
+            Order.scheduled_date != None,
+            Order.scheduled_date < cutoff
+        ).order_by(Order.id).limit(settings.order_expiry_batch_size).all()
+        if not orders:
+            break
+        events, _ = OrderStateMachine.transition_many(
+            db, orders, "expired", "system", note="Not accepted before the scheduled date"
+        )
+        db.commit()
+        expired += len(events)
+        if not events:
+            break
+    return expired
+
+
+@scheduler.job("materialize_series", interval=3600)
+def materialize_series(db: Session) -> int:
+    """Turn reserved recurring slots that are coming up into orders"""
+    created = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        events = SeriesService.materialize(db)
+        db.commit()
+        OutboxService.dispatch_events([event.id for event in events])
+        created += len(events)
+        if not events:
+            break
+    return created
+
+
+@scheduler.job("cleanup_tokens", interval=3600)
+def cleanup_tokens(db: Session) -> int:
+    """Delete used or expired password reset codes and verification tokens past retention"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.token_retention_days)
+    deleted = 0
+    for model in (PasswordReset, EmailVerificationToken):
+        deleted += db.query(model).filter(
+            model.expires_at < cutoff,
+            or_(model.is_used == True, model.expires_at < datetime.utcnow())
+        ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+@scheduler.job("refresh_rollups", interval=3600)
+def refresh_rollups(db: Session) -> str:
+    """Rebuild yesterday's and today's order rollups to repair any drift"""
+    scanned, written = AnalyticsService.backfill(db, since=datetime.utcnow() - timedelta(days=1))
+    return f"{scanned} orders, {written} rollup rows"
+
+
+@scheduler.job("dispatch_outbox", interval=60)
+def dispatch_outbox(db: Session) -> int:
+    """Retry outbox messages that were not delivered after their request"""
+    return OutboxService.dispatch_pending()
+
+
+@scheduler.job("collect_images", interval=3600)
+def collect_images(db: Session) -> int:
+    """Delete uploaded images that no profile has referenced for the grace period"""
+    return UploadService.collect_orphans(db)
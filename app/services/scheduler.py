@@ -0,0 +1,199 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.scheduler import SchedulerLease
+
+LEASE_NAME = "scheduler"
+
+
+class JobStats(BaseModel):
+    name: str
+    interval_seconds: float
+    runs: int = 0
+    failures: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    max_duration_ms: float = 0.0
+    total_duration_ms: float = 0.0
+    last_result: Optional[str] = None
+    last_error: Optional[str] = None
+
+
+class SchedulerStatus(BaseModel):
+    holder: str
+    is_leader: bool
+    running: bool
+    jobs: List[JobStats]
+
+
+class _Job:
+    def __init__(self, name: str, interval: float, func: Callable[[Session], object]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_run = 0.0
+        self.stats = JobStats(name=name, interval_seconds=interval)
+
+
+class Scheduler:
+    """In-process asyncio scheduler for periodic maintenance jobs.
+
+    Every replica runs the loop, but only the one holding the
+    ``scheduler_leases`` row runs jobs. The lease is taken or renewed with
+    a conditional UPDATE each tick and expires if the leader stops renewing
+    it, so another replica takes over within lease_seconds. Jobs are plain
+    functions of a Session run in a worker thread, one at a time, and their
+    timings are kept in JobStats.
+    """
+
+    def __init__(self, tick_seconds: float, lease_seconds: float):
+        self.tick_seconds = tick_seconds
+        self.lease_seconds = lease_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._jobs: Dict[str, _Job] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def job(self, name: str, interval: float):
+        """Decorator registering func(db) to run every interval seconds"""
+        def register(func: Callable[[Session], object]):
+            self._jobs[name] = _Job(name, interval, func)
+            return func
+        return register
+
+    def acquire_lease(self, db: Session) -> bool:
+        """Take or renew the lease; returns whether this replica is the leader"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        renewed = db.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == LEASE_NAME,
+                or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+            )
+            .values(holder=self.holder, expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not renewed:
+            if db.query(SchedulerLease.name).filter(SchedulerLease.name == LEASE_NAME).first():
+                db.rollback()
+                return False
+            try:
+                db.add(SchedulerLease(name=LEASE_NAME, holder=self.holder, expires_at=expires_at))
+                db.flush()
+            except IntegrityError:
+                # Another replica created the lease first
+                db.rollback()
+                return False
+        db.commit()
+        return True
+
+    def release_lease(self) -> None:
+        """Give up the lease so another replica can take over at once"""
+        db = SessionLocal()
+        try:
+            db.query(SchedulerLease).filter(
+                SchedulerLease.name == LEASE_NAME, SchedulerLease.holder == self.holder
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def run_job(self, job: _Job) -> None:
+        stats = job.stats
+        stats.last_started_at = datetime.utcnow()
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            result = job.func(db)
+            stats.last_result = None if result is None else str(result)
+            stats.last_error = None
+        except Exception as e:
+            db.rollback()
+            stats.failures += 1
+            stats.last_error = str(e)
+            print(f"Scheduled job {job.name} failed: {e}")
+        finally:
+            db.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            stats.runs += 1
+            stats.last_duration_ms = round(elapsed, 2)
+            stats.total_duration_ms = round(stats.total_duration_ms + elapsed, 2)
+            stats.max_duration_ms = round(max(stats.max_duration_ms, elapsed), 2)
+
+    def _renew(self) -> bool:
+        db = SessionLocal()
+        try:
+            self.is_leader = self.acquire_lease(db)
+        finally:
+            db.close()
+        return self.is_leader
+
+    def tick(self) -> None:
+        """As leader, run every job that is due, renewing the lease before each one"""
+        for job in self._jobs.values():
+            if not self._renew():
+                return
+            now = time.monotonic()
+            if now >= job.next_run:
+                job.next_run = now + job.interval
+                self.run_job(job)
+
+    def run_now(self, name: str) -> Optional[JobStats]:
+        """Run a job immediately on this replica, e.g. from the admin API"""
+        job = self._jobs.get(name)
+        if job is None:
+            return None
+        self.run_job(job)
+        return job.stats
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.tick)
+            except Exception as e:
+                self.is_leader = False
+                print(f"Scheduler tick failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.is_leader:
+            await asyncio.to_thread(self.release_lease)
+            self.is_leader = False
+
+    def status(self) -> SchedulerStatus:
+        return SchedulerStatus(
+            holder=self.holder,
+            is_leader=self.is_leader,
+            running=self._task is not None,
+            jobs=[job.stats for job in self._jobs.values()],
+        )
+
+
+# Global scheduler instance; jobs are registered in app.services.scheduled_jobs
+scheduler = Scheduler(
+    tick_seconds=settings.scheduler_tick_seconds,
+    lease_seconds=settings.scheduler_lease_seconds,
+)
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.order import Order, OrderEvent, OrderSeries, SeriesSlot
+from app.models.service import Service
+from app.schemas.order import OrderSeriesCreate
+from app.services.analytics_service import to_utc
+from app.services.order_state_machine import OrderStateMachine
+from app.services.recurrence import occurrences
+from app.services.schedule_service import ScheduleService
+
+
+class SeriesService:
+    """Recurring bookings.
+
+    Creating a series expands its rule, checks every occurrence against the
+    worker's schedule in one pass and reserves them all as SeriesSlots in
+    the same transaction, so a series is booked completely or not at all.
+    Slots only become Orders once they are within series_materialize_days,
+    which keeps far-future occurrences out of inboxes, expiry and rollups.
+    """
+
+    @staticmethod
+    def create_series(db: Session, user_id: int, service: Service, data: OrderSeriesCreate) -> Tuple[OrderSeries, List[OrderEvent]]:
+        starts_at = to_utc(data.starts_at)
+        if starts_at <= datetime.utcnow():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A series must start in the future")
+        try:
+            starts = occurrences(data.rrule, starts_at, settings.series_max_occurrences)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid rrule: {e}")
+        intervals = [(start, start + timedelta(hours=data.hours)) for start in starts]
+
+        ScheduleService.lock_worker(db, service.worker_id)
+        conflicts = ScheduleService.find_conflicts(db, service.worker_id, intervals)
+        if conflicts:
+            db.rollback()  # Release the worker lock before the error response goes out
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "message": "Sorry, the worker is already booked for some of these dates.",
+                    "conflicts": [start.isoformat() for start, _ in conflicts],
+                }
+            )
+
+        series = OrderSeries(
+            user_id=user_id,
+            worker_id=service.worker_id,
+            service_id=service.id,
+            description=data.description,
+            hours=data.hours,
+            hourly_rate=service.hourly_rate,
+            payment_method=data.payment_method,
+            rrule=data.rrule.upper(),
+            starts_at=starts_at,
+            status="active",
+        )
+        db.add(series)
+        db.flush()
+        db.execute(insert(SeriesSlot), [
+            {"series_id": series.id, "worker_id": series.worker_id, "starts_at": start, "ends_at": end, "status": "reserved"}
+            for start, end in intervals
+        ])
+        events = SeriesService.materialize(db, series_id=series.id)
+        return series, events
+
+    @staticmethod
+    def materialize(db: Session, series_id: Optional[int] = None, limit: int = 500) -> List[OrderEvent]:
+        """Turn reserved slots starting within the materialize window into orders (call before commit)"""
+        horizon = datetime.utcnow() + timedelta(days=settings.series_materialize_days)
+        query = db.query(SeriesSlot, OrderSeries).join(OrderSeries, OrderSeries.id == SeriesSlot.series_id).filter(
+            SeriesSlot.status == "reserved",
+            SeriesSlot.starts_at < horizon,
+            OrderSeries.status == "active"
+        )
+        if series_id is not None:
+            query = query.filter(SeriesSlot.series_id == series_id)
+        rows = query.order_by(SeriesSlot.starts_at).limit(limit).all()
+        if not rows:
+            return []
+
+        # Set created_at up front so recording the orders does not reload it row by row
+        now = datetime.now(timezone.utc)
+        orders = [
+            Order(
+                user_id=series.user_id,
+                worker_id=series.worker_id,
+                service_id=series.service_id,
+                description=series.description,
+                hours=series.hours,
+                total_amount=series.hourly_rate * series.hours,
+                payment_method=series.payment_method,
+                scheduled_date=slot.starts_at,
+                created_at=now,
+            )
+            for slot, series in rows
+        ]
+        db.add_all(orders)
+        db.flush()
+        events = []
+        for (slot, series), order in zip(rows, orders):
+            slot.status = "materialized"
+            slot.order_id = order.id
+            events.append(OrderStateMachine.record_created(db, order, "system"))
+        return events
+
+    @staticmethod
+    def cancel_series(db: Session, series: OrderSeries, actor_type: str, actor_id: Optional[int]) -> List[OrderEvent]:
+        """Release the remaining slots and cancel upcoming orders of the series (call before commit)"""
+        series.status = "cancelled"
+        db.execute(
+            update(SeriesSlot)
+            .where(SeriesSlot.series_id == series.id, SeriesSlot.status == "reserved")
+            .values(status="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        upcoming = db.query(Order).join(SeriesSlot, SeriesSlot.order_id == Order.id).filter(
+            SeriesSlot.series_id == series.id,
+            Order.status.in_(("pending", "accepted")),
+            Order.scheduled_date > datetime.utcnow()
+        ).all()
+        events, _ = OrderStateMachine.transition_many(
+            db, upcoming, "cancelled", actor_type, actor_id, note="Series cancelled"
+        )
+        return events
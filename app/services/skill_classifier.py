@@ -0,0 +1,148 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.category import SkillKeyword
+from app.services.category_registry import category_registry
+
+# Built-in rules, extended and overridden by the skill_keywords table.
+# (keyword, category name, weight). A trailing "*" makes the last word a prefix.
+DEFAULT_SKILL_KEYWORDS: List[Tuple[str, str, float]] = [
+    ("plumb*", "plumber", 2), ("pipe*", "plumber", 1), ("water", "plumber", 1), ("drain*", "plumber", 1),
+    ("clean*", "cleaner", 2), ("housekeep*", "cleaner", 2), ("house", "cleaner", 1),
+    ("electric*", "electrician", 2), ("wiring", "electrician", 2), ("wire*", "electrician", 1),
+    ("babysit*", "babysitting", 2), ("nanny", "babysitting", 2), ("child*", "babysitting", 2), ("care", "babysitting", 1),
+    ("ac", "ac repair", 2), ("hvac", "ac repair", 2), ("air conditioning", "ac repair", 2),
+    ("air", "ac repair", 1), ("cooling", "ac repair", 1),
+    ("tutor*", "tutoring", 2), ("teach*", "tutoring", 2), ("homework", "tutoring", 1),
+    ("math*", "tutoring", 1), ("science", "tutoring", 1), ("english", "tutoring", 1),
+    ("physician", "physician", 2), ("doctor", "physician", 2), ("medical", "physician", 2), ("nurs*", "physician", 1),
+    ("carpent*", "carpenter", 2), ("wood*", "carpenter", 1), ("handyman", "carpenter", 1), ("furniture", "carpenter", 1),
+    ("garden*", "gardener", 2), ("landscap*", "gardener", 2), ("lawn*", "gardener", 1),
+    ("cook*", "cook", 2), ("chef", "cook", 2), ("cater*", "cook", 1), ("food", "cook", 1),
+    ("driv*", "driver", 2), ("chauffeur", "driver", 2), ("transport*", "driver", 1),
+    ("security", "security", 2), ("guard*", "security", 2),
+]
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ("children", "stems", "payload")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.stems: Dict[str, "_Node"] = {}
+        self.payload: List[Tuple[int, float]] = []
+
+
+class SkillMatcher:
+    """Token trie over keyword phrases with whole-word matching.
+
+    Each word of a skill starts a walk down the trie; exact words follow
+    ``children`` and prefix words (``"plumb*"``) follow ``stems``. Every
+    complete phrase adds its weight to its category and the highest total
+    wins, ties going to the category matched earliest in the skill.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, int, float]]):
+        self.root = _Node()
+        for keyword, category_id, weight in rules:
+            words = tokenize(keyword.rstrip("*"))
+            if not words:
+                continue
+            node = self.root
+            for i, word in enumerate(words):
+                is_stem = i == len(words) - 1 and keyword.endswith("*")
+                edges = node.stems if is_stem else node.children
+                node = edges.setdefault(word, _Node())
+            node.payload.append((category_id, weight))
+
+    def scores(self, skill: str) -> Dict[int, Tuple[float, int]]:
+        """category_id -> (total weight, position of first match)"""
+        tokens = tokenize(skill)
+        scores: Dict[int, Tuple[float, int]] = {}
+        for start in range(len(tokens)):
+            frontier = [self.root]
+            for token in tokens[start:]:
+                next_frontier = []
+                for node in frontier:
+                    child = node.children.get(token)
+                    if child is not None:
+                        next_frontier.append(child)
+                    next_frontier.extend(n for stem, n in node.stems.items() if token.startswith(stem))
+                for node in next_frontier:
+                    for category_id, weight in node.payload:
+                        total, first = scores.get(category_id, (0.0, start))
+                        scores[category_id] = (total + weight, min(first, start))
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+        return scores
+
+    def classify(self, skill: str) -> Optional[int]:
+        scores = self.scores(skill)
+        if not scores:
+            return None
+        return max(scores.items(), key=lambda item: (item[1][0], -item[1][1]))[0]
+
+
+class SkillClassifier:
+    """Builds the SkillMatcher once and reuses it until the rules change.
+
+    Rules are DEFAULT_SKILL_KEYWORDS merged with the skill_keywords table
+    (rows replace a built-in keyword, inactive rows remove it). The compiled
+    matcher is dropped whenever the category registry reloads; keyword writes
+    bump their category's version so other processes see them through the
+    registry's version check.
+    """
+
+    def __init__(self):
+        self._matcher: Optional[SkillMatcher] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._matcher = None
+
+    def _load_rules(self, db: Session) -> List[Tuple[str, int, float]]:
+        categories = category_registry.name_to_id(db)
+        rules: Dict[str, Tuple[int, float]] = {
+            keyword: (categories[name], weight)
+            for keyword, name, weight in DEFAULT_SKILL_KEYWORDS
+            if name in categories
+        }
+        # Database rows override built-in keywords; inactive rows disable them
+        for row in db.query(SkillKeyword).order_by(SkillKeyword.id).all():
+            if row.is_active:
+                rules[row.keyword] = (row.category_id, row.weight or 1.0)
+            else:
+                rules.pop(row.keyword, None)
+        return [(keyword, category_id, weight) for keyword, (category_id, weight) in rules.items()]
+
+    def matcher(self, db: Session) -> SkillMatcher:
+        # Checking the registry first lets a version change invalidate us
+        category_registry.name_to_id(db)
+        matcher = self._matcher
+        if matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    self._matcher = SkillMatcher(self._load_rules(db))
+                matcher = self._matcher
+        return matcher
+
+    def classify(self, db: Session, skill: str) -> Optional[int]:
+        """Return the best matching category id for a skill, if any"""
+        return self.matcher(db).classify(skill)
+
+    def classify_many(self, db: Session, skills: Iterable[str]) -> List[Tuple[str, Optional[int]]]:
+        matcher = self.matcher(db)
+        return [(skill, matcher.classify(skill)) for skill in skills]
+
+
+# Global skill classifier instance
+skill_classifier = SkillClassifier()
+category_registry.subscribe(skill_classifier.invalidate)
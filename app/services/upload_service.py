@@ -0,0 +1,352 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, UploadFile, status
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.static_files import content_digest
+from app.core.storage import StorageBackend, get_storage, sign_direct_upload
+from app.models.image import StoredImage
+
+_pil_image = False
+
+
+def _pil():
+    """PIL.Image, or None without Pillow; imported on first use to keep cold starts fast"""
+    global _pil_image
+    if _pil_image is False:
+        try:
+            from PIL import Image
+        except ImportError:  # pragma: no cover - Pillow is listed in requirements.txt
+            Image = None
+        _pil_image = Image
+    return _pil_image
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of each accepted image format and the extension it is stored with
+SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+CONTENT_TYPES = {".jpg": "image/jpeg", ".png": "image/png", ".gif": "image/gif", ".webp": "image/webp"}
+
+
+def detect_extension(head: bytes) -> Optional[str]:
+    """Extension for the image format the first bytes of a file belong to, or None"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    for signature, ext in SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+def _thumbnail_names(stem: str, size: int) -> Dict[str, str]:
+    return {"webp": f"{stem}_{size}.webp", "jpeg": f"{stem}_{size}.jpg"}
+
+
+def _image_keys(key: str, stem: str, sizes) -> List[str]:
+    """An image's key followed by the keys of its thumbnails"""
+    return [key] + [name for size in sizes for name in _thumbnail_names(stem, size).values()]
+
+
+def _temp_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f"helpmate_upload_{os.urandom(8).hex()}.part")
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write(out, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def _upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _make_thumbnails(storage: StorageBackend, path: str, stem: str, sizes) -> Dict[int, Dict[str, str]]:
+    """Store a WebP and a JPEG of the image fitted into each size; runs in the thumbnail pool.
+
+    Thumbnails that already exist are kept: with content-addressed names
+    they were rendered from the same bytes.
+    """
+    variants = {size: _thumbnail_names(stem, size) for size in sizes}
+    missing = [size for size, names in variants.items() if not all(storage.exists(name) for name in names.values())]
+    if not missing:
+        return variants
+    with _pil().open(path) as image:
+        image.load()
+        image = image.convert("RGB")
+        for size in missing:
+            thumbnail = image.copy()
+            # thumbnail() keeps the aspect ratio and never upscales
+            thumbnail.thumbnail((size, size))
+            for kind, fmt, options in (
+                ("webp", "WEBP", {"quality": 80, "method": 4}),
+                ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+            ):
+                tmp = _temp_path()
+                try:
+                    thumbnail.save(tmp, fmt, **options)
+                    storage.put(variants[size][kind], tmp, CONTENT_TYPES[".webp" if kind == "webp" else ".jpg"])
+                finally:
+                    _remove(tmp)
+    return variants
+
+
+class UploadService:
+    """Profile image uploads shared by the user and worker endpoints.
+
+    The upload is read in CHUNK_SIZE pieces and each piece is hashed and
+    written from a worker thread, so neither the whole file nor the disk
+    I/O ever sits on the event loop. The format is taken from the file's
+    magic bytes, not its name, and the upload is abandoned as soon as it
+    passes upload_max_bytes. When Pillow is installed, resized WebP and
+    JPEG variants are generated in a small thread pool so list screens can
+    fetch a thumbnail instead of the original.
+
+    Files are named after the sha256 of their bytes, so uploading the same
+    picture twice stores it once and the names can be cached forever (see
+    ImmutableStaticFiles). Each file has a StoredImage row whose ref_count
+    follows User.image and Worker.image; collect_orphans() deletes files
+    that nothing has referenced for image_orphan_grace_hours.
+
+    Files go to the configured StorageBackend. Clients can also skip the
+    API for the bytes: presign() hands out a direct upload URL for a
+    declared hash, type and size, and complete() checks what arrived
+    before registering it.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=settings.thumbnail_workers, thread_name_prefix="thumbnails")
+        return self._pool
+
+    @staticmethod
+    def result(request: Request, key: str, variants: Dict[int, Dict[str, str]]) -> dict:
+        storage = get_storage()
+        return {
+            "url": storage.url(key, request),
+            "variants": {
+                str(size): {kind: storage.url(name, request) for kind, name in names.items()}
+                for size, names in variants.items()
+            },
+        }
+
+    async def _receive(self, chunks: AsyncIterator[bytes], tmp_path: str, max_bytes: int) -> Tuple[str, str, int]:
+        """Stream chunks into tmp_path; returns their sha256, extension and size"""
+        size = 0
+        ext = None
+        head = b""
+        digest = hashlib.sha256()
+        out = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Image must be at most {max_bytes / (1024 * 1024):g} MB"
+                    )
+                if ext is None:
+                    head += chunk[:16]
+                    if len(head) >= 12:
+                        ext = detect_extension(head)
+                        if ext is None:
+                            break
+                await asyncio.to_thread(_write, out, digest, chunk)
+        finally:
+            await asyncio.to_thread(out.close)
+        if ext is None:
+            ext = detect_extension(head)
+        if ext is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Only JPEG, PNG, GIF and WebP images are allowed"
+            )
+        return digest.hexdigest(), ext, size
+
+    async def _finish(self, request: Request, db: Session, stem: str, ext: str, size: int,
+                      local_path: str, stored: bool) -> dict:
+        """Render thumbnails from the local copy, store the original if needed and register it"""
+        storage = get_storage()
+        key = f"{stem}{ext}"
+        variants = {}
+        try:
+            if _pil() is not None and settings.thumbnail_sizes:
+                loop = asyncio.get_running_loop()
+                try:
+                    variants = await loop.run_in_executor(
+                        self._executor(), _make_thumbnails, storage, local_path, stem, settings.thumbnail_sizes
+                    )
+                except Exception:
+                    # Magic bytes matched but the image does not decode
+                    if db.query(StoredImage.id).filter(StoredImage.digest == stem).first() is None:
+                        await asyncio.to_thread(storage.delete, _image_keys(key, stem, settings.thumbnail_sizes))
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="The image could not be read"
+                    )
+            if not stored:
+                # Same key, same bytes: a re-upload only rewrites the existing file
+                await asyncio.to_thread(storage.put, key, local_path, CONTENT_TYPES[ext])
+        finally:
+            await asyncio.to_thread(_remove, local_path)
+        self.register(db, stem, ext, size)
+        return self.result(request, key, variants)
+
+    async def save_profile_image(self, request: Request, file: UploadFile, db: Session) -> dict:
+        """Store an uploaded profile image; returns its URL and the URLs of its thumbnails"""
+        tmp_path = _temp_path()
+        try:
+            stem, ext, size = await self._receive(_upload_chunks(file), tmp_path, settings.upload_max_bytes)
+        except BaseException:
+            await asyncio.to_thread(_remove, tmp_path)
+            raise
+        return await self._finish(request, db, stem, ext, size, tmp_path, stored=False)
+
+    async def presign(self, request: Request, sha256: str, content_type: str, size: int) -> dict:
+        """Direct upload instructions for an image, or none if those bytes are already stored"""
+        ext = next((e for e, t in CONTENT_TYPES.items() if t == content_type), None)
+        if ext is None:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Only JPEG, PNG, GIF and WebP images are allowed"
+            )
+        if size > settings.upload_max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Image must be at most {settings.upload_max_bytes / (1024 * 1024):g} MB"
+            )
+        storage = get_storage()
+        key = f"{sha256}{ext}"
+        if await asyncio.to_thread(storage.exists, key):
+            return {"key": key, "upload": None}
+        upload = await asyncio.to_thread(storage.presigned_upload, key, content_type, size, sha256, request)
+        return {"key": key, "upload": upload}
+
+    async def receive_direct(self, request: Request, key: str, content_type: str, size: int,
+                             expires: int, signature: str) -> None:
+        """Accept a presigned PUT for FilesystemStorage, checking what S3 would check"""
+        expected = sign_direct_upload(key, content_type, size, expires)
+        if not hmac.compare_digest(expected, signature) or expires < time.time():
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired upload URL")
+        if request.headers.get("content-type") != content_type:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content-Type does not match the signed upload")
+        tmp_path = _temp_path()
+        try:
+            stem, ext, received = await self._receive(request.stream(), tmp_path, size)
+            if received != size or f"{stem}{ext}" != key:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Uploaded bytes do not match the signed size and checksum"
+                )
+            await asyncio.to_thread(get_storage().put, key, tmp_path, content_type)
+        finally:
+            await asyncio.to_thread(_remove, tmp_path)
+
+    async def complete(self, request: Request, db: Session, key: str) -> dict:
+        """Validate and register an image uploaded directly to storage"""
+        stem = content_digest(key)
+        ext = os.path.splitext(key)[1]
+        if stem is None or key != f"{stem}{ext}":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid upload key")
+        storage = get_storage()
+        size = await asyncio.to_thread(storage.size, key)
+        if size is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+        known = db.query(StoredImage.id).filter(StoredImage.digest == stem).first() is not None
+        head = await asyncio.to_thread(storage.read_head, key, 16)
+        if not known and (size > settings.upload_max_bytes or detect_extension(head) != ext):
+            await asyncio.to_thread(storage.delete, [key])
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="The upload is not an allowed image"
+            )
+        local_path = _temp_path()
+        if not known or (_pil() is not None and settings.thumbnail_sizes):
+            await asyncio.to_thread(storage.download, key, local_path)
+        # Not every S3-compatible service enforces the signed checksum, so check it here
+        if not known and await asyncio.to_thread(_sha256_file, local_path) != stem:
+            await asyncio.to_thread(storage.delete, [key])
+            await asyncio.to_thread(_remove, local_path)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Uploaded bytes do not match the key"
+            )
+        return await self._finish(request, db, stem, ext, size, local_path, stored=True)
+
+    @staticmethod
+    def register(db: Session, digest: str, ext: str, size: int) -> None:
+        """Record an uploaded file; an unreferenced one gets a fresh grace period"""
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.utcnow()
+        stmt = insert(StoredImage).values(
+            digest=digest, ext=ext, size_bytes=size, ref_count=0, unreferenced_at=now
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["digest"],
+            set_={"unreferenced_at": now},
+            where=StoredImage.ref_count <= 0,
+        ))
+        db.commit()
+
+    @staticmethod
+    def collect_orphans(db: Session, limit: int = 500) -> int:
+        """Delete images no profile has referenced for image_orphan_grace_hours; returns how many"""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.image_orphan_grace_hours)
+        orphans = db.query(StoredImage.id, StoredImage.digest, StoredImage.ext).filter(
+            StoredImage.ref_count <= 0,
+            StoredImage.unreferenced_at < cutoff
+        ).order_by(StoredImage.id).limit(limit).all()
+        removed = 0
+        for image_id, digest, ext in orphans:
+            # Re-checked in the DELETE so a profile that just picked the image keeps it
+            deleted = db.query(StoredImage).filter(
+                StoredImage.id == image_id,
+                StoredImage.ref_count <= 0,
+                StoredImage.unreferenced_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                get_storage().delete(_image_keys(f"{digest}{ext}", digest, settings.thumbnail_sizes))
+                removed += 1
+        return removed
+
+
+# Global upload service instance
+upload_service = UploadService()
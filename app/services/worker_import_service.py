@@ -0,0 +1,257 @@
+import asyncio
+import csv
+import json
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.models.user import EmailVerificationToken
+from app.models.worker import Worker
+from app.models.service import Service
+from app.schemas.worker import WorkerCreate
+from app.services.category_registry import category_registry
+from app.services.worker_service import WorkerService
+
+
+# Verification emails sent at once after an import; bounds open SMTP connections
+EMAIL_CONCURRENCY = 10
+
+# Password hashing pool shared by every import in this process, created on first use
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_hash_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """The shared hashing pool; max_workers only applies when it is first created"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=max_workers)
+    return _hash_pool
+
+
+class WorkerImportRow(WorkerCreate):
+    # Imported workers may rely on their skills alone
+    category_id: Optional[int] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    error: str
+
+
+class ImportReport(BaseModel):
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+class WorkerImportService:
+    """Streams worker rows from CSV or JSONL and inserts them in batches.
+
+    Each batch is validated, its passwords are hashed in a process pool
+    shared by all imports (so requests don't pay for starting one), and
+    workers, services and verification tokens are written with one
+    executemany INSERT per table. Bad rows are reported and skipped; a
+    batch that fails as a whole is retried row by row in savepoints so one
+    bad row never aborts the import.
+    """
+
+    @staticmethod
+    def iter_rows(lines: Iterable[str], file_format: str) -> Iterator[Tuple[int, dict]]:
+        """Yield (row number, raw dict) without reading the whole file"""
+        if file_format == "csv":
+            for number, record in enumerate(csv.DictReader(lines), start=2):
+                record = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in record.items() if k}
+                record = {k: v for k, v in record.items() if v not in ("", None)}
+                # Skills are ";" or "|" separated inside a CSV cell
+                if "skills" in record:
+                    record["skills"] = [s.strip() for s in record["skills"].replace("|", ";").split(";") if s.strip()]
+                yield number, record
+        elif file_format == "jsonl":
+            for number, line in enumerate(lines, start=1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield number, {"__error__": f"Invalid JSON: {e.msg}"}
+        else:
+            raise ValueError(f"Unsupported import format: {file_format}")
+
+    @staticmethod
+    def import_workers(
+        db: Session,
+        lines: Iterable[str],
+        file_format: str,
+        batch_size: int = 500,
+        activate: bool = False,
+        hash_workers: Optional[int] = None,
+    ) -> Tuple[ImportReport, List[Tuple[str, str]]]:
+        """Import workers and return the report plus (email, token) pairs to notify"""
+        report = ImportReport()
+        pending_emails: List[Tuple[str, str]] = []
+        batch: List[Tuple[int, dict]] = []
+        pool = get_hash_pool(hash_workers)
+        for number, record in WorkerImportService.iter_rows(lines, file_format):
+            report.total += 1
+            batch.append((number, record))
+            if len(batch) >= batch_size:
+                WorkerImportService._import_batch(db, batch, activate, pool, report, pending_emails)
+                batch = []
+        if batch:
+            WorkerImportService._import_batch(db, batch, activate, pool, report, pending_emails)
+        report.failed = len(report.errors)
+        return report, pending_emails
+
+    @staticmethod
+    def _import_batch(
+        db: Session,
+        batch: List[Tuple[int, dict]],
+        activate: bool,
+        pool: ProcessPoolExecutor,
+        report: ImportReport,
+        pending_emails: List[Tuple[str, str]],
+    ) -> None:
+        # Validate rows and drop duplicate emails within the batch
+        valid: List[Tuple[int, WorkerImportRow]] = []
+        seen = set()
+        for number, record in batch:
+            if not isinstance(record, dict):
+                report.errors.append(ImportRowError(row=number, error="Row must be an object"))
+                continue
+            email = record.get("email")
+            if "__error__" in record:
+                report.errors.append(ImportRowError(row=number, email=email, error=record["__error__"]))
+                continue
+            try:
+                row = WorkerImportRow(**record)
+            except ValidationError as e:
+                report.errors.append(ImportRowError(row=number, email=email, error=_format_validation_error(e)))
+                continue
+            if row.email.lower() in seen:
+                report.errors.append(ImportRowError(row=number, email=row.email, error="Duplicate email in file"))
+                continue
+            seen.add(row.email.lower())
+            valid.append((number, row))
+
+        # One query for emails that are already registered, in any letter case
+        existing = {
+            email.lower() for (email,) in db.query(Worker.email).filter(
+                func.lower(Worker.email).in_([r.email.lower() for _, r in valid])
+            )
+        } if valid else set()
+        rows = []
+        for number, row in valid:
+            if row.email.lower() in existing:
+                report.errors.append(ImportRowError(row=number, email=row.email, error="Email already registered"))
+            else:
+                rows.append((number, row))
+        if not rows:
+            return
+
+        hashes = list(pool.map(get_password_hash, [row.password for _, row in rows], chunksize=16))
+        prepared = [
+            (number, row, WorkerImportService._worker_values(row, hashed, activate))
+            for (number, row), hashed in zip(rows, hashes)
+        ]
+        try:
+            created, tokens = WorkerImportService._insert_rows(db, prepared, activate)
+            db.commit()
+        except Exception:
+            db.rollback()
+            created, tokens = 0, []
+            for item in prepared:
+                savepoint = db.begin_nested()
+                try:
+                    row_created, row_tokens = WorkerImportService._insert_rows(db, [item], activate)
+                    savepoint.commit()
+                except Exception as e:
+                    savepoint.rollback()
+                    report.errors.append(ImportRowError(row=item[0], email=item[1].email, error=str(e.__cause__ or e)))
+                    continue
+                created += row_created
+                tokens.extend(row_tokens)
+            db.commit()
+        report.created += created
+        pending_emails.extend(tokens)
+
+    @staticmethod
+    def _worker_values(row: WorkerImportRow, hashed_password: str, activate: bool) -> Dict:
+        return {
+            "email": row.email,
+            "full_name": row.full_name,
+            "hashed_password": hashed_password,
+            "phone_number": row.phone_number,
+            "address": row.address,
+            "bio": row.bio,
+            "skills": row.skills,
+            "hourly_rate": row.hourly_rate,
+            "experience_years": row.experience_years,
+            "is_available": True,
+            "rating": 0.0,
+            "total_reviews": 0,
+            "is_verified": activate,
+            "is_active": activate,
+        }
+
+    @staticmethod
+    def _insert_rows(
+        db: Session, prepared: List[Tuple[int, WorkerImportRow, Dict]], activate: bool
+    ) -> Tuple[int, List[Tuple[str, str]]]:
+        """Insert workers, their services and tokens; return the count and (email, token) pairs"""
+        inserted = db.execute(
+            insert(Worker).returning(Worker.id, Worker.email),
+            [values for _, _, values in prepared]
+        ).all()
+        ids_by_email = {email: worker_id for worker_id, email in inserted}
+
+        services = []
+        for _, row, values in prepared:
+            worker_id = ids_by_email[values["email"]]
+            category = category_registry.get(db, row.category_id) if row.category_id else None
+            if category:
+                titles = {category.id: category.name}
+            else:
+                titles = WorkerService.skills_by_category(db, row.skills)
+            for category_id, name in titles.items():
+                services.append({
+                    "title": f"Professional {name}",
+                    "description": f"Professional {name} service by {row.full_name}",
+                    "category_id": category_id,
+                    "worker_id": worker_id,
+                    "hourly_rate": row.hourly_rate or 20.0,
+                    "minimum_hours": 1,
+                    "is_available": True,
+                })
+        if services:
+            db.execute(insert(Service), services)
+
+        if activate:
+            return len(inserted), []
+        expires_at = datetime.utcnow() + timedelta(hours=24)
+        tokens = [
+            {"user_id": worker_id, "user_type": "worker", "token": str(uuid.uuid4()), "expires_at": expires_at}
+            for worker_id in ids_by_email.values()
+        ]
+        db.execute(insert(EmailVerificationToken), tokens)
+        emails_by_id = {worker_id: email for email, worker_id in ids_by_email.items()}
+        return len(inserted), [(emails_by_id[t["user_id"]], t["token"]) for t in tokens]
+
+    @staticmethod
+    async def send_verification_emails(pending_emails: List[Tuple[str, str]]) -> None:
+        from app.services.email_service import email_service
+        limit = asyncio.Semaphore(EMAIL_CONCURRENCY)
+
+        async def send(email: str, token: str) -> None:
+            async with limit:
+                await email_service.send_verification_email(email, token, "worker")
+
+        await asyncio.gather(*(send(email, token) for email, token in pending_emails))
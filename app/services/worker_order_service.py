@@ -0,0 +1,134 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.notification import Notification
+from app.models.service import Service
+from app.models.worker import WorkerOrder
+from app.schemas.worker import WorkerOrderCreate
+
+# Most orders one batch request may place
+MAX_BATCH = 100
+
+
+class WorkerOrderService:
+    """Worker-to-worker (subcontracting) orders.
+
+    A batch of orders is validated with one lookup of the services involved
+    and written in one flush, and each provider gets a single notification
+    covering every order placed with them. Accepting is a conditional
+    ``UPDATE ... WHERE status = 'pending'`` scoped to the provider's own
+    services, so an order can only be accepted once.
+    """
+
+    @staticmethod
+    def query(db: Session):
+        """WorkerOrder columns plus the service title and the worker who provides it"""
+        return db.query(
+            WorkerOrder.id,
+            WorkerOrder.worker_id,
+            WorkerOrder.service_id,
+            WorkerOrder.status,
+            WorkerOrder.description,
+            WorkerOrder.scheduled_date,
+            WorkerOrder.created_at,
+            WorkerOrder.updated_at,
+            Service.title.label("service_title"),
+            Service.worker_id.label("provider_id"),
+        ).join(Service, Service.id == WorkerOrder.service_id)
+
+    @staticmethod
+    def create_many(db: Session, worker_id: int, items: List[WorkerOrderCreate]) -> List[int]:
+        """Place several orders for worker_id; all of them are created or none. Returns their ids"""
+        if not items:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No orders given")
+        if len(items) > MAX_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BATCH} orders can be placed at once"
+            )
+
+        services: Dict[int, Service] = {
+            service.id: service
+            for service in db.query(Service).filter(Service.id.in_({item.service_id for item in items}))
+        }
+        for item in items:
+            service = services.get(item.service_id)
+            if service is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Service {item.service_id} not found")
+            if not service.is_available:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Service {item.service_id} is not available"
+                )
+            if service.worker_id == worker_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="You cannot order your own service"
+                )
+
+        orders = [
+            WorkerOrder(
+                worker_id=worker_id,
+                service_id=item.service_id,
+                status="pending",
+                description=item.description,
+                scheduled_date=item.scheduled_date,
+            )
+            for item in items
+        ]
+        db.add_all(orders)
+        db.flush()
+
+        # One notification per provider, however many orders they received
+        received: Dict[int, List[WorkerOrder]] = defaultdict(list)
+        for order in orders:
+            received[services[order.service_id].worker_id].append(order)
+        notifications = []
+        for provider_id, provider_orders in received.items():
+            ids = ", ".join(str(order.id) for order in provider_orders)
+            if len(provider_orders) == 1:
+                title = "New Worker Order"
+                message = f"Another worker has ordered your service (order ID: {ids})."
+            else:
+                title = "New Worker Orders"
+                message = f"Another worker has placed {len(provider_orders)} orders for your services (order IDs: {ids})."
+            notifications.append(Notification(
+                worker_id=provider_id, type="worker_order_received", title=title, message=message
+            ))
+        db.add_all(notifications)
+        return [order.id for order in orders]
+
+    @staticmethod
+    def accept(db: Session, order_id: int, provider_id: int) -> None:
+        """Accept a pending order for one of provider_id's services (call before commit)"""
+        own_services = db.query(Service.id).filter(Service.worker_id == provider_id)
+        accepted = db.execute(
+            update(WorkerOrder)
+            .where(
+                WorkerOrder.id == order_id,
+                WorkerOrder.service_id.in_(own_services.scalar_subquery()),
+                WorkerOrder.status == "pending"
+            )
+            .values(status="accepted", updated_at=datetime.utcnow())
+            .returning(WorkerOrder.worker_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if accepted is None:
+            order_status = db.query(WorkerOrder.status).join(Service, Service.id == WorkerOrder.service_id).filter(
+                WorkerOrder.id == order_id, Service.worker_id == provider_id
+            ).scalar()
+            if order_status is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Worker order not found")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Only pending orders can be accepted (order is {order_status})"
+            )
+        db.add(Notification(
+            worker_id=accepted.worker_id,
+            type="worker_order_accepted",
+            title="Worker Order Accepted",
+            message=f"Your worker order (ID: {order_id}) has been accepted."
+        ))
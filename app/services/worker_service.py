@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from app.models import Worker, Service, Category
+from app.models import Worker, Service
 from app.schemas.worker import WorkerCreate
+from app.services.category_registry import category_registry
+from app.services.skill_classifier import skill_classifier
 from typing import List, Dict
 
 class WorkerService:
@@ -31,8 +33,7 @@ class WorkerService:
         # If category_id is provided, create a service for that category
         if worker_data.get('category_id'):
             category_id = worker_data['category_id']
-            from app.models.category import Category
-            category = db.query(Category).filter(Category.id == category_id).first()
+            category = category_registry.get(db, category_id)
             if category:
                 service = Service(
                     title=f"Professional {category.name}",
@@ -53,85 +54,46 @@ class WorkerService:
         db.refresh(worker)
         return worker
     
+    @staticmethod
+    def skills_by_category(db: Session, skills: List[str]) -> Dict[int, str]:
+        """Map each skill to its best category, keeping the first skill per category"""
+        result: Dict[int, str] = {}
+        for skill, category_id in skill_classifier.classify_many(db, skills):
+            if category_id is not None and category_id not in result:
+                result[category_id] = skill
+        return result
+    
     @staticmethod
     def _create_services_from_skills(db: Session, worker: Worker, skills: List[str]) -> None:
         """Create services for a worker based on their skills"""
         
-        # Get all categories
-        categories = {cat.name.lower(): cat.id for cat in db.query(Category).all()}
+        skills_by_category = WorkerService.skills_by_category(db, skills)
+        if not skills_by_category:
+            return
         
-        # Skill to category mapping
-        skill_category_mapping = {
-            'plumbing': 'plumber',
-            'pipe': 'plumber',
-            'water': 'plumber',
-            'clean': 'cleaner',
-            'cleaning': 'cleaner',
-            'house': 'cleaner',
-            'electrical': 'electrician',
-            'electric': 'electrician',
-            'wiring': 'electrician',
-            'child': 'babysitting',
-            'babysit': 'babysitting',
-            'care': 'babysitting',
-            'ac': 'ac repair',
-            'air': 'ac repair',
-            'cooling': 'ac repair',
-            'tutor': 'tutoring',
-            'math': 'tutoring',
-            'science': 'tutoring',
-            'english': 'tutoring',
-            'homework': 'tutoring',
-            'medical': 'physician',
-            'physician': 'physician',
-            'doctor': 'physician',
-            'carpent': 'carpenter',
-            'wood': 'carpenter',
-            'handyman': 'carpenter',
-            'garden': 'gardener',
-            'landscape': 'gardener',
-            'cook': 'cook',
-            'chef': 'cook',
-            'food': 'cook',
-            'drive': 'driver',
-            'transport': 'driver',
-            'security': 'security',
-            'guard': 'security'
+        # Check which of these categories the worker already offers, in one query
+        existing_categories = {
+            category_id for (category_id,) in db.query(Service.category_id).filter(
+                Service.worker_id == worker.id,
+                Service.category_id.in_(skills_by_category.keys())
+            )
         }
         
         created_services = []
-        
-        for skill in skills:
-            skill_lower = skill.lower()
-            category_name = None
-            
-            # Find matching category
-            for keyword, category in skill_category_mapping.items():
-                if keyword in skill_lower:
-                    category_name = category
-                    break
-            
-            if category_name and category_name in categories:
-                category_id = categories[category_name]
-                
-                # Check if service already exists for this worker and category
-                existing_service = db.query(Service).filter(
-                    Service.worker_id == worker.id,
-                    Service.category_id == category_id
-                ).first()
-                
-                if not existing_service:
-                    service = Service(
-                        title=f"Professional {skill}",
-                        description=f"Professional {skill} service by {worker.full_name}",
-                        category_id=category_id,
-                        worker_id=worker.id,
-                        hourly_rate=worker.hourly_rate or 20.0,
-                        minimum_hours=1,
-                        is_available=worker.is_available
-                    )
-                    db.add(service)
-                    created_services.append(service)
+        for category_id, skill in skills_by_category.items():
+            if category_id in existing_categories:
+                continue
+            service = Service(
+                title=f"Professional {skill}",
+                description=f"Professional {skill} service by {worker.full_name}",
+                category_id=category_id,
+                worker_id=worker.id,
+                hourly_rate=worker.hourly_rate or 20.0,
+                minimum_hours=1,
+                is_available=worker.is_available
+            )
+            db.add(service)
+            created_services.append(service)
         
         if created_services:
             db.flush()  # Flush to get service IDs
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the serverless entry point.
+
+Each run starts a fresh interpreter, imports the entry module (api.index by
+default) and then serves one request (--path, /health by default) through
+the ASGI app with startup events, which is what a cold serverless
+invocation pays before its first response. Prints p50/max for import and first-response time and the
+slowest modules from ``python -X importtime``.
+
+    python benchmarks/import_bench.py --runs 10 --module api.index --path /api/v1/categories/
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+start = time.perf_counter()
+import importlib
+module = importlib.import_module({module!r})
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(module.app) as client:
+    assert client.get({path!r}).status_code < 500
+served = time.perf_counter()
+print(f"{{(imported - start) * 1000:.1f}} {{(served - start) * 1000:.1f}}")
+"""
+
+IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once(module: str, path: str, env: dict) -> tuple:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, path=path)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    imported, served = out.split()
+    return float(imported), float(served)
+
+
+def slowest_imports(module: str, env: dict, top: int) -> list:
+    """(cumulative ms, self ms, module) for the top-level packages that took longest"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # Only modules imported directly by the entry point or the app itself
+            if len(indent) <= 3 or name.startswith("app."):
+                rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="api.index")
+    parser.add_argument("--path", default="/health", help="request served after the import")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SCHEDULER_ENABLED", "false")
+
+    run_once(args.module, args.path, env)  # warm the bytecode cache so every run measures the same thing
+    results = [run_once(args.module, args.path, env) for _ in range(args.runs)]
+    imports = [r[0] for r in results]
+    served = [r[1] for r in results]
+    print(f"{args.module}: {args.runs} cold starts")
+    print(f"  import          p50 {statistics.median(imports):8.1f} ms   max {max(imports):8.1f} ms")
+    print(f"  first response  p50 {statistics.median(served):8.1f} ms   max {max(served):8.1f} ms")
+    print()
+    print(f"  {'cumulative':>10}  {'self':>8}  module")
+    for cumulative, self_ms, name in slowest_imports(args.module, env, args.top):
+        print(f"  {cumulative:8.1f}ms  {self_ms:6.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
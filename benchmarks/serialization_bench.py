@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the order and chat list endpoints.
+
+Compares FastAPI's default response path (response_model validation +
+jsonable_encoder + json.dumps) against FastJSONResponse (orjson) and the
+trusted TypeAdapter.dump_json path, and prints p50/p99 per strategy.
+
+    python benchmarks/serialization_bench.py --rows 200 --iterations 300
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.core.responses import FastJSONResponse, TrustedJSONResponse
+from app.schemas.user import UserResponse
+from app.schemas.worker import WorkerResponse
+from app.schemas.order import OrderSummary
+from app.schemas.chat import ChatListResponse, MessageResponse
+
+
+def make_user(i: int) -> UserResponse:
+    return UserResponse(
+        id=i, email=f"user{i}@example.com", full_name=f"User {i}", phone_number="+1234567890",
+        address="123 Main St, City, State", is_active=True, is_verified=True, is_admin=False,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def make_worker(i: int) -> WorkerResponse:
+    return WorkerResponse(
+        id=i, email=f"worker{i}@example.com", full_name=f"Worker {i}", bio="Experienced professional",
+        skills=["Plumbing", "Pipe Repair", "Installation"], hourly_rate=45.0, experience_years=10,
+        is_available=True, rating=4.5, total_reviews=12, is_verified=True, is_active=True,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def make_orders(rows: int) -> List[OrderSummary]:
+    start = datetime(2025, 6, 1, 9, 0)
+    return [
+        OrderSummary(
+            id=i, user_id=i % 50, worker_id=i % 10, service_id=i % 30, description="Fix the kitchen sink",
+            hours=2, scheduled_date=start + timedelta(hours=i), payment_method="pay_in_person",
+            total_amount=90.0, status="pending", created_at=start, service_title="Professional Plumbing",
+            worker_name=f"Worker {i % 10}", user_name=f"User {i % 50}",
+        )
+        for i in range(rows)
+    ]
+
+
+def make_chats(rows: int) -> List[ChatListResponse]:
+    now = datetime(2025, 6, 1, 9, 0, tzinfo=timezone.utc)
+    return [
+        ChatListResponse(
+            id=i, user_id=i, worker_id=i % 10, is_active=True, created_at=now,
+            user=make_user(i), worker=make_worker(i % 10),
+            last_message=MessageResponse(
+                id=i, chat_id=i, sender_type="worker", sender_id=i % 10,
+                content="See you tomorrow at 9", is_read=False, created_at=now,
+            ),
+            unread_count=i % 3,
+        )
+        for i in range(rows)
+    ]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_strategy(fn, iterations: int) -> List[float]:
+    fn()  # warm up caches and adapters
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(name: str, items, type_, iterations: int) -> None:
+    field = create_model_field(name="Response", type_=type_, mode="serialization")
+    # serialize_response is a coroutine; drive it on one loop made up front so
+    # loop setup and teardown stay out of the timings, as with the trusted path
+    loop = asyncio.new_event_loop()
+
+    def default_path():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+        return JSONResponse(content).body
+
+    def orjson_path():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+        return FastJSONResponse(content).body
+
+    def trusted_path():
+        return TrustedJSONResponse(items, type_).body
+
+    print(f"\n{name} ({len(items)} rows, {iterations} iterations)")
+    print(f"  {'strategy':<28}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>10}")
+    for label, fn in [
+        ("response_model + json", default_path),
+        ("response_model + orjson", orjson_path),
+        ("trusted dump_json", trusted_path),
+    ]:
+        samples = time_strategy(fn, iterations)
+        print(f"  {label:<28}{statistics.median(samples):>10.3f}{percentile(samples, 99):>10.3f}{len(fn()):>10}")
+    loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    run("Order list", make_orders(args.rows), List[OrderSummary], args.iterations)
+    run("Chat list", make_chats(args.rows), List[ChatListResponse], args.iterations)
+
+
+if __name__ == "__main__":
+    main()
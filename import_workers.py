@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Bulk import workers from a CSV or JSONL file.
+
+CSV columns match WorkerCreate (email, password, full_name, hourly_rate, ...);
+separate multiple skills with ";". category_id is optional.
+
+    python import_workers.py workers.csv --batch-size 1000 --send-emails
+"""
+
+import argparse
+import asyncio
+from app.core.database import SessionLocal
+from app.services.worker_import_service import WorkerImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import workers")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--hash-workers", type=int, default=None, help="Processes used for password hashing")
+    parser.add_argument("--activate", action="store_true", help="Mark workers verified and active, skipping emails")
+    parser.add_argument("--send-emails", action="store_true", help="Send verification emails after the import")
+    args = parser.parse_args()
+
+    file_format = args.format or ("jsonl" if args.path.lower().endswith((".jsonl", ".ndjson")) else "csv")
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as f:
+            report, pending_emails = WorkerImportService.import_workers(
+                db, f, file_format,
+                batch_size=args.batch_size,
+                activate=args.activate,
+                hash_workers=args.hash_workers,
+            )
+    finally:
+        db.close()
+
+    print(f"Rows: {report.total}  created: {report.created}  failed: {report.failed}")
+    for error in report.errors:
+        print(f"  row {error.row} ({error.email or '-'}): {error.error}")
+
+    if args.send_emails and pending_emails:
+        asyncio.run(WorkerImportService.send_verification_emails(pending_emails))
+        print(f"Sent {len(pending_emails)} verification emails")
+    elif pending_emails:
+        print(f"{len(pending_emails)} workers need verification emails (rerun with --send-emails to send them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,87 @@
-import sqlite3
 import os
-from sqlalchemy import create_engine, text
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.orm import Session
 from app.core.database import Base
-from app.models import User, Worker, Category, Service, Order, Review, Chat, Message, UserFavorite, WorkerOrder, Notification
-from app.models.user import PasswordReset, EmailVerificationToken
+from app.models import Order, OrderRollup
 from app.core.config import settings
+from app.services.analytics_service import AnalyticsService, SCHEDULED
 
-def migrate_database():
-    engine = create_engine(settings.database_url)
-    
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+# Revision matching databases created before the schema moved to Alembic
+BASELINE_REVISION = "0001"
+
+# Schema changes now go in migrations/versions. The lists below only bring
+# databases created before that up to the baseline revision.
+
+# Columns added to existing tables: (table, column, DDL type)
+ADDED_COLUMNS = [
+    ("reviews", "helpful_count", "INTEGER DEFAULT 0"),
+    ("categories", "version", "INTEGER DEFAULT 0"),
+    ("orders", "version", "INTEGER NOT NULL DEFAULT 1"),
+]
+
+# Tables created by revisions after the baseline, which those revisions create and fill
+POST_BASELINE_TABLES = {"category_versions", "review_votes"}
+
+# Indexes added to existing tables: (index name, table, columns)
+ADDED_INDEXES = [
+    ("ix_reviews_worker_id_created_at", "reviews", "worker_id, created_at"),
+    ("ix_orders_worker_id_status_created_at", "orders", "worker_id, status, created_at"),
+    ("ix_worker_orders_worker_id_status", "worker_orders", "worker_id, status"),
+    ("ix_worker_orders_service_id", "worker_orders", "service_id"),
+]
+
+
+def upgrade_legacy_schema(engine) -> None:
+    """Bring a database made by create_all and the old migrate_db.py up to the baseline"""
     with engine.connect() as connection:
-        # Check if password_resets table exists
-        result = connection.execute(text("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='password_resets'
-        """))
-        if not result.fetchone():
-            connection.execute(text("""
-                CREATE TABLE password_resets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email VARCHAR NOT NULL,
-                    reset_code VARCHAR NOT NULL,
-                    user_type VARCHAR NOT NULL,
-                    is_used BOOLEAN DEFAULT FALSE,
-                    expires_at DATETIME NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            connection.execute(text("""
-                CREATE INDEX idx_password_resets_email 
-                ON password_resets(email)
-            """))
-            print("Created password_resets table")
-        # Check if verification_tokens table exists
-        result = connection.execute(text("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='verification_tokens'
-        """))
-        if not result.fetchone():
-            connection.execute(text("""
-                CREATE TABLE verification_tokens (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    user_type VARCHAR NOT NULL,
-                    token VARCHAR UNIQUE NOT NULL,
-                    is_used BOOLEAN DEFAULT FALSE,
-                    expires_at DATETIME NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            print("Created verification_tokens table")
+        existing_tables = set(inspect(connection).get_table_names())
+        missing = [
+            table for name, table in Base.metadata.tables.items()
+            if name not in existing_tables and name not in POST_BASELINE_TABLES
+        ]
+        if missing:
+            Base.metadata.create_all(bind=connection, tables=missing)
+            print(f"Created tables: {', '.join(table.name for table in missing)}")
+        # Add missing columns to existing tables
+        inspector = inspect(connection)
+        for table, column, ddl_type in ADDED_COLUMNS:
+            existing_columns = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing_columns:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+                print(f"Added {table}.{column}")
+        # Create missing indexes
+        for index_name, table, columns in ADDED_INDEXES:
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"))
         connection.commit()
-        print("Database migration completed successfully!")
+
+
+def migrate_database():
+    engine = create_engine(settings.database_url)
+    config = Config(ALEMBIC_INI)
+
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        upgrade_legacy_schema(engine)
+        command.stamp(config, BASELINE_REVISION)
+        print(f"Stamped existing database at revision {BASELINE_REVISION}")
+    command.upgrade(config, "head")
+
+    # Fill the analytics rollups the first time they are created, and again
+    # if they predate the scheduled_day rows behind worker utilization
+    with Session(engine) as session:
+        missing = not session.query(OrderRollup.id).first() and session.query(Order.id).first()
+        missing = missing or (
+            not session.query(OrderRollup.id).filter(OrderRollup.granularity == SCHEDULED).first()
+            and session.query(Order.id).filter(Order.scheduled_date != None).first()
+        )
+        if missing:
+            scanned, written = AnalyticsService.backfill(session)
+            print(f"Backfilled {written} order rollup rows from {scanned} orders")
+    print("Database migration completed successfully!")
 
 if __name__ == "__main__":
     migrate_database() 
\ No newline at end of file
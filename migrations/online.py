@@ -0,0 +1,64 @@
+"""Helpers for migrations that must not block traffic.
+
+A plain CREATE INDEX on Postgres holds a lock that blocks every write to
+the table until the build finishes. These helpers build and drop indexes
+CONCURRENTLY instead, outside the migration's transaction as Postgres
+requires. Other databases (SQLite in development) get the plain statement.
+"""
+from typing import List
+from alembic import context, op
+from sqlalchemy import text
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A failed or interrupted concurrent build leaves an INVALID index
+    # behind, which IF NOT EXISTS would then mistake for a finished one
+    if context.is_offline_mode():
+        return
+    invalid = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def create_index_online(name: str, table: str, columns: List[str], unique: bool = False) -> None:
+    """Create an index if it doesn't exist, without blocking writes on Postgres"""
+    if not _is_postgresql():
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        _drop_invalid_index(name)
+        op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def drop_index_online(name: str, table: str) -> None:
+    """Drop an index if it exists, without blocking writes on Postgres"""
+    if not _is_postgresql():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def set_not_null_online(table: str, column: str) -> None:
+    """Make a column NOT NULL without blocking writes on Postgres while rows are checked.
+
+    SET NOT NULL alone scans the whole table under an exclusive lock. A
+    validated CHECK constraint lets Postgres skip that scan, and validating
+    it only takes a lock that allows writes.
+    """
+    if not _is_postgresql():
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, nullable=False)
+        return
+    constraint = f"ck_{table}_{column}_not_null"
+    op.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID"))
+    op.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}"))
+    op.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+    op.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}"))
@@ -0,0 +1,49 @@
+"""Hot-path indexes
+
+Composite indexes for the busiest list queries (a worker's orders by
+status and date, a user's orders, chat history, notification feeds,
+services by category) and a unique index making a favorite a single row
+per user and worker. Built with CREATE INDEX CONCURRENTLY on Postgres.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 16:45:12.481207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ('ix_orders_worker_id_status_scheduled_date', 'orders', ['worker_id', 'status', 'scheduled_date'], False),
+    ('ix_orders_user_id_created_at', 'orders', ['user_id', 'created_at'], False),
+    ('ix_messages_chat_id_created_at', 'messages', ['chat_id', 'created_at'], False),
+    ('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'], False),
+    ('ix_services_category_id_is_available', 'services', ['category_id', 'is_available'], False),
+    ('ux_user_favorites_user_id_worker_id', 'user_favorites', ['user_id', 'worker_id'], True),
+]
+
+
+def upgrade() -> None:
+    # Keep the oldest of any duplicate favorites so the unique index can be built
+    op.execute(sa.text(
+        "DELETE FROM user_favorites WHERE id NOT IN ("
+        "SELECT MIN(id) FROM user_favorites GROUP BY user_id, worker_id)"
+    ))
+    for name, table, columns, unique in INDEXES:
+        create_index_online(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        drop_index_online(name, table)
@@ -0,0 +1,29 @@
+"""Review helpfulness index
+
+Backs the keyset pagination of a worker's reviews sorted by
+helpful_count, which otherwise scans and sorts all of their reviews for
+every page. Built with CREATE INDEX CONCURRENTLY on Postgres.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 17:05:48.213574
+
+"""
+from typing import Sequence, Union
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online('ix_reviews_worker_id_helpful_count_id', 'reviews', ['worker_id', 'helpful_count', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_reviews_worker_id_helpful_count_id', 'reviews')
@@ -0,0 +1,40 @@
+"""Category version counter
+
+A single-row counter for Category.version. Versions used to be computed
+as max(version) + 1, which two concurrent writers could both get; the
+counter is incremented in place instead. It starts at the highest
+version already handed out.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 17:22:09.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'category_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(sa.text(
+        "INSERT INTO category_versions (id, version) "
+        "SELECT 1, COALESCE(MAX(version), 0) FROM categories"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table('category_versions')
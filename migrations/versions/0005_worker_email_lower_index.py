@@ -0,0 +1,30 @@
+"""Worker email lower() index
+
+Lets the bulk import look up already registered emails case-insensitively
+without scanning the workers table. Built with CREATE INDEX CONCURRENTLY
+on Postgres.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 17:41:27.804519
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online('ix_workers_email_lower', 'workers', [sa.text('lower(email)')])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_workers_email_lower', 'workers')
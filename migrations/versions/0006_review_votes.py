@@ -0,0 +1,51 @@
+"""Review votes
+
+Records which user marked which review as helpful, so each user counts
+once per review. reviews.helpful_count becomes NOT NULL with a default
+of 0; a NULL sorted outside the keyset anchor of the helpful sort and
+dropped the review from the paginated list.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 18:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from migrations.online import set_not_null_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_votes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('review_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_review_votes_id', 'review_votes', ['id'], unique=False)
+    op.create_index('ux_review_votes_review_id_user_id', 'review_votes', ['review_id', 'user_id'], unique=True)
+
+    with op.batch_alter_table('reviews') as batch:
+        batch.alter_column('helpful_count', server_default='0')
+    op.execute(sa.text("UPDATE reviews SET helpful_count = 0 WHERE helpful_count IS NULL"))
+    set_not_null_online('reviews', 'helpful_count')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reviews') as batch:
+        batch.alter_column('helpful_count', nullable=True, server_default=None)
+    op.drop_index('ux_review_votes_review_id_user_id', table_name='review_votes')
+    op.drop_index('ix_review_votes_id', table_name='review_votes')
+    op.drop_table('review_votes')
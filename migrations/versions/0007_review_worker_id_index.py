@@ -0,0 +1,29 @@
+"""Review worker/id index
+
+Backs the keyset pagination of a worker's most recent reviews, which is
+keyed on id rather than the nullable created_at. Built with CREATE INDEX
+CONCURRENTLY on Postgres.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 18:20:12.402913
+
+"""
+from typing import Sequence, Union
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online('ix_reviews_worker_id_id', 'reviews', ['worker_id', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_reviews_worker_id_id', 'reviews')
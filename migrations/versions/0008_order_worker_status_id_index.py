@@ -0,0 +1,29 @@
+"""Order worker/status/id index
+
+Backs the keyset pagination of the worker inbox, which is keyed on id
+rather than the nullable created_at. Built with CREATE INDEX
+CONCURRENTLY on Postgres.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 18:41:55.730126
+
+"""
+from typing import Sequence, Union
+
+from migrations.online import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online('ix_orders_worker_id_status_id', 'orders', ['worker_id', 'status', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_online('ix_orders_worker_id_status_id', 'orders')
@@ -0,0 +1,56 @@
+"""Rows written by older versions of the app must still serialize.
+
+Workers registered before skills and rates were required have NULL in
+those columns (11 of the 32 in the original helpmate.db).
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models import Worker
+from app.schemas.worker import WorkerResponse
+from app.services.export_service import ExportService
+from app.services.projection_service import ProjectionService
+
+LEGACY_WORKER = {
+    "id": 1, "email": "legacy@example.com", "full_name": "Legacy Worker", "hashed_password": "x",
+    "skills": None, "hourly_rate": None, "experience_years": None, "bio": None,
+    "is_available": True, "rating": 0.0, "total_reviews": 0, "is_verified": False, "is_active": True,
+    "created_at": datetime(2024, 5, 1, 12, 0),
+}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Worker.__table__.insert(), [LEGACY_WORKER])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_worker_response_from_legacy_row(db):
+    worker = WorkerResponse.model_validate(db.query(Worker).one())
+    assert worker.skills == []
+    assert worker.hourly_rate is None
+
+
+def test_worker_projection_from_legacy_row(db):
+    workers = ProjectionService.load_by_ids(db, Worker, WorkerResponse, [1])
+    assert workers[1].skills == []
+    assert workers[1].hourly_rate is None
+
+
+def test_worker_export_from_legacy_row(db):
+    query = db.query(*ProjectionService.columns_for(Worker, WorkerResponse)).order_by(Worker.id)
+    row = json.loads(b"".join(ExportService.ndjson_lines(query, WorkerResponse)))
+    assert row["skills"] == [] and row["hourly_rate"] is None
+    header, line = "".join(ExportService.csv_lines(query, WorkerResponse)).splitlines()
+    assert dict(zip(header.split(","), line.split(",")))["hourly_rate"] == ""